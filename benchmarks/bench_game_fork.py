@@ -0,0 +1,56 @@
+import argparse
+import numpy
+import time
+
+from minesweeper_game.game_interface import CellState, GameState, Mode
+from minesweeper_game.game_field import MinesweeperGame
+
+
+parser = argparse.ArgumentParser(description='Measure the time to fork a game and to open a cell and undo the move.')
+parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode.',
+                    default='expert', choices=['classic', 'easy', 'medium', 'expert'])
+parser.add_argument('-n', '--number-of-games', help='The number of games to measure.',
+                    default=100, type=int)
+parser.add_argument('-s', '--seed', help='The seed of the games.',
+                    default=0, type=int)
+
+args = parser.parse_args()
+
+game_mode = {'classic': Mode.CLASSIC, 'easy': Mode.EASY, 'medium': Mode.MEDIUM, 'expert': Mode.EXPERT}[args.game_mode]
+rng = numpy.random.default_rng(args.seed)
+
+fork_time = 0.
+fork_count = 0
+open_undo_time = 0.
+open_undo_count = 0
+
+for _ in range(args.number_of_games):
+    game = MinesweeperGame(game_mode, rng=rng)
+    game.open(0)
+
+    # The game is measured in the middle: a half of the cells without mines is opened.
+    safe_cells = rng.permutation(numpy.flatnonzero(game._field != CellState.MINE))
+    for idx in safe_cells[:len(safe_cells) // 2]:
+        game.open(idx)
+    if game.state() != GameState.IN_PROGRESS:
+        continue
+
+    start_time = time.perf_counter()
+    for _ in range(1000):
+        game.fork()
+    fork_time += time.perf_counter() - start_time
+    fork_count += 1000
+
+    # Only the forks log the moves, so the moves are reverted in the fork.
+    game = game.fork()
+    closed_cells = numpy.flatnonzero(game.field() == CellState.CLOSED)
+    start_time = time.perf_counter()
+    for idx in closed_cells:
+        game.open(idx)
+        game.undo()
+    open_undo_time += time.perf_counter() - start_time
+    open_undo_count += len(closed_cells)
+
+print(f'Mode: {game_mode}')
+print(f' Fork: {fork_time / fork_count * 1e6:.2f} us')
+print(f' Open and undo: {open_undo_time / open_undo_count * 1e6:.2f} us')
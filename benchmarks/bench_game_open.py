@@ -0,0 +1,46 @@
+import argparse
+import numpy
+import time
+
+from minesweeper_game.game_interface import CellState, Mode
+from minesweeper_game.game_field import MinesweeperGame
+
+
+def play(games, moves, open_cells):
+    start_time = time.perf_counter()
+    for game, game_moves in zip(games, moves):
+        for idx in game_moves:
+            open_cells(game, idx)
+    return time.perf_counter() - start_time
+
+
+parser = argparse.ArgumentParser(description='Compare the time to open the cells of a move using the flood fill and '
+                                             'the labelled empty regions.')
+parser.add_argument('-n', '--number-of-games', help='The number of games played in every mode.',
+                    default=200, type=int)
+parser.add_argument('-s', '--seed', help='The seed of the games.',
+                    default=0, type=int)
+
+args = parser.parse_args()
+
+rng = numpy.random.default_rng(args.seed)
+
+print('Mode, Moves, Flood Fill (us/move), Labelled Regions (us/move), Speedup')
+for mode in (Mode.MEDIUM, Mode.EXPERT):
+    games = []
+    moves = []
+    for _ in range(args.number_of_games):
+        game = MinesweeperGame(mode, rng=rng)
+        game._create_field(first_opened_cell_idx=0)
+        games.append(game)
+        # Every game is played until the win by opening the cells without mines in random order.
+        moves.append(rng.permutation(numpy.flatnonzero(game._field != CellState.MINE)))
+
+    def new_games():
+        return [MinesweeperGame.from_field(mode, played_game._field) for played_game in games]
+
+    moves_count = sum(len(game_moves) for game_moves in moves)
+    flood_time = play(new_games(), moves, MinesweeperGame._flood_open_cells)
+    regions_time = play(new_games(), moves, MinesweeperGame._open_cells)
+    print(f'{mode}, {moves_count}, {flood_time / moves_count * 1e6:.2f}, {regions_time / moves_count * 1e6:.2f}, '
+          f'{flood_time / regions_time:.2f}')
@@ -0,0 +1,59 @@
+import argparse
+import subprocess
+import sys
+
+# Every target is the command line arguments of the Python interpreter, the lightweight targets must not import torch.
+TARGETS = [
+    ('import minesweeper_game', ['-c', 'import minesweeper_game'], True),
+    ('import minesweeper_cnn_solver', ['-c', 'import minesweeper_cnn_solver'], True),
+    ('vectorizer and options', ['-c', 'from minesweeper_cnn_solver import MinesweeperFieldVectorizer, '
+                                      'InferenceBackend, InferencePrecision'], True),
+    ('play_minesweeper.py --help', ['play_minesweeper.py', '--help'], True),
+    ('MinesweeperSolver', ['-c', 'from minesweeper_cnn_solver import MinesweeperSolver'], False),
+]
+
+
+def import_time(arguments):
+    """
+    Returns the total time of the imports in seconds reported by -X importtime and the names of the imported modules.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, capture_output=True, text=True,
+                            check=True)
+    total_time = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_time, module = line[len('import time:'):].split('|')
+        modules.add(module.strip())
+        # The top level imports are not indented, their cumulative times include the nested imports.
+        if not module[1:].startswith(' '):
+            total_time += int(cumulative_time) * 1e-6
+    return total_time, modules
+
+
+parser = argparse.ArgumentParser(description='Measure the import time of the packages and the startup of the play '
+                                             'script with -X importtime.')
+parser.add_argument('-n', '--repeats', help='The number of runs of every target, the minimum time is reported.',
+                    default=5, type=int)
+parser.add_argument('--max-time', help='Exit with an error if the import time of any lightweight target exceeds this '
+                                       'time in milliseconds or it imports torch.',
+                    default=None, type=float)
+
+args = parser.parse_args()
+
+failed = False
+print('Target, Import Time (ms), Imports Torch')
+for name, arguments, lightweight in TARGETS:
+    times = []
+    for _ in range(args.repeats):
+        total_time, modules = import_time(arguments)
+        times.append(total_time)
+    imports_torch = 'torch' in modules
+    print(f'{name}, {min(times) * 1e3:.1f}, {imports_torch}')
+
+    if lightweight and args.max_time is not None and (imports_torch or min(times) * 1e3 > args.max_time):
+        failed = True
+
+if failed:
+    sys.exit('The import time of a lightweight target regressed.')
@@ -0,0 +1,49 @@
+import argparse
+import numpy
+import time
+import torch
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperInferenceEngine, IncrementalInference, ModelRegistry
+from minesweeper_cnn_solver.evaluation import self_play_fields
+
+
+def measure(engine, model_inputs):
+    start_time = time.perf_counter()
+    outputs = [engine(model_input) for model_input in model_inputs]
+    return (time.perf_counter() - start_time) / len(model_inputs), outputs
+
+
+parser = argparse.ArgumentParser(description='Compare the time of a move with the full and the incremental inference '
+                                             'of the model.')
+parser.add_argument('-n', '--positions', help='The number of the positions of the self-play games in every mode.',
+                    default=500, type=int)
+parser.add_argument('--tile-size', help='The size of the tiles recomputed by the incremental inference.',
+                    default=8, type=int)
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
+
+args = parser.parse_args()
+
+if args.threads is not None:
+    torch.set_num_threads(args.threads)
+
+# The expert model is used for the custom modes, the positions are the consecutive moves of the self-play games.
+modes = [Mode.EXPERT, Mode(64, 64, 500), Mode(128, 128, 2000)]
+model = ModelRegistry().model(Mode.EXPERT)
+solver = MinesweeperSolver(model)
+
+print(f'Threads: {torch.get_num_threads()}')
+print('Mode, Full (ms/move), Incremental (ms/move), Speedup, Tiles per Move, Max Difference')
+for mode in modes:
+    fields = self_play_fields(solver, mode, args.positions, seed=0)
+    model_inputs = [torch.from_numpy(solver.vectorizer()(field))[numpy.newaxis] for field in fields]
+
+    full_time, full_outputs = measure(MinesweeperInferenceEngine(model), model_inputs)
+    incremental_inference = IncrementalInference(model, args.tile_size)
+    incremental_time, incremental_outputs = measure(incremental_inference, model_inputs)
+
+    max_difference = max(float((full_output - incremental_output).abs().max())
+                         for full_output, incremental_output in zip(full_outputs, incremental_outputs))
+    print(f'{mode}, {full_time * 1e3:.3f}, {incremental_time * 1e3:.3f}, {full_time / incremental_time:.2f}, '
+          f'{incremental_inference.computed_tiles() / len(model_inputs):.1f}, {max_difference:.1e}')
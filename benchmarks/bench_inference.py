@@ -0,0 +1,67 @@
+import argparse
+import time
+import torch
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperInferenceEngine, InferenceBackend, \
+    InferencePrecision, ModelRegistry
+from minesweeper_cnn_solver.evaluation import self_play_fields
+
+
+def measure(run, model_input, iterations):
+    for _ in range(10):
+        run(model_input)
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        run(model_input)
+    return (time.perf_counter() - start_time) / iterations
+
+
+parser = argparse.ArgumentParser(description='Compare the latency of the model inference for the inference backends '
+                                             'and precisions.')
+parser.add_argument('-n', '--iterations', help='The number of inferences to measure.',
+                    default=200, type=int)
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
+
+args = parser.parse_args()
+
+if args.threads is not None:
+    torch.set_num_threads(args.threads)
+
+modes = [Mode.CLASSIC, Mode.EASY, Mode.MEDIUM, Mode.EXPERT]
+configurations = [(backend, channels_last)
+                  for backend in (InferenceBackend.EAGER, InferenceBackend.TORCHSCRIPT, InferenceBackend.COMPILE)
+                  for channels_last in (False, True)]
+
+registry = ModelRegistry()
+
+print(f'Threads: {torch.get_num_threads()}')
+print('Mode, Backend, Channels Last, Precision, Latency (ms)')
+for mode in modes:
+    model_input = torch.rand((1, 11) + mode.shape())
+
+    # The baseline is the model run in the eager mode with the autograd.
+    model = registry.model(mode).eval()
+    print(f'{mode}, eager without inference mode, False, {InferencePrecision.FLOAT32}, '
+          f'{measure(model, model_input, args.iterations) * 1e3:.3f}')
+
+    # The engines never change the model, so all configurations share it.
+    for backend, channels_last in configurations:
+        try:
+            engine = MinesweeperInferenceEngine(model, backend, channels_last)
+            latency = f'{measure(engine, model_input, args.iterations) * 1e3:.3f}'
+        except Exception as e:
+            latency = f'n/a ({type(e).__name__})'
+        print(f'{mode}, {backend}, {channels_last}, {InferencePrecision.FLOAT32}, {latency}')
+
+    # The reduced precisions are measured with the TorchScript backend only, the int8 model is calibrated on the
+    # positions of the self-play games.
+    solver = MinesweeperSolver(model)
+    calibration_inputs = torch.from_numpy(solver.vectorizer().vectorize_batch(self_play_fields(solver, mode, 256, 0)))
+    for precision in (InferencePrecision.BFLOAT16, InferencePrecision.INT8):
+        engine = MinesweeperInferenceEngine(model, InferenceBackend.TORCHSCRIPT, precision=precision,
+                                            calibration_inputs=calibration_inputs)
+        latency = f'{measure(engine, model_input, args.iterations) * 1e3:.3f}'
+        print(f'{mode}, {InferenceBackend.TORCHSCRIPT}, False, {precision}, {latency}')
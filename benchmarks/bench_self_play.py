@@ -0,0 +1,42 @@
+import argparse
+import time
+import torch
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperSolverTrainer, ModelRegistry
+
+
+parser = argparse.ArgumentParser(description='Compare the number of the training samples collected per second by the '
+                                             'games played one by one and in lockstep.')
+parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode.',
+                    default='expert', choices=['classic', 'easy', 'medium', 'expert'])
+parser.add_argument('-n', '--samples', help='The number of samples to collect for every configuration.',
+                    default=2000, type=int)
+parser.add_argument('-p', '--parallel-games', help='The comma separated numbers of the games played in lockstep.',
+                    default='16,64,256')
+parser.add_argument('--threshold', help='Open all cells with the predicted probability of a mine below the threshold '
+                                        'after every model run.',
+                    default=None, type=float)
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
+
+args = parser.parse_args()
+
+if args.threads is not None:
+    torch.set_num_threads(args.threads)
+
+game_mode = {'classic': Mode.CLASSIC, 'easy': Mode.EASY, 'medium': Mode.MEDIUM, 'expert': Mode.EXPERT}[args.game_mode]
+solver = MinesweeperSolver(ModelRegistry().model(game_mode))
+
+print(f'Threads: {torch.get_num_threads()}')
+print('Parallel Games, Samples per Second, Games Played, Games Won')
+for parallel_games in [None] + [int(parallel_games) for parallel_games in args.parallel_games.split(',')]:
+    trainer = MinesweeperSolverTrainer(game_mode, solver, args.threshold, parallel_games)
+    start_time = time.perf_counter()
+    with torch.no_grad():
+        if parallel_games is None:
+            _, _, games_played, games_won, _ = trainer.play_games(args.samples)
+        else:
+            _, _, games_played, games_won, _ = trainer.play_games_in_lockstep(args.samples)
+    elapsed_time = time.perf_counter() - start_time
+    print(f'{parallel_games or "one by one"}, {args.samples / elapsed_time:.1f}, {games_played}, {games_won}')
@@ -0,0 +1,42 @@
+import argparse
+import os
+import time
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import ModelRegistry, SelfPlayPool
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure the number of the training samples collected per second by '
+                                                 'the pool of the self-play workers by the number of workers.')
+    parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode.',
+                        default='expert', choices=['classic', 'easy', 'medium', 'expert'])
+    parser.add_argument('-n', '--samples', help='The number of samples to collect for every number of workers.',
+                        default=4000, type=int)
+    parser.add_argument('-w', '--workers', help='The comma separated numbers of the workers.',
+                        default='1,2,4')
+    parser.add_argument('-p', '--parallel-games', help='The number of the games played in lockstep by every worker.',
+                        default=16, type=int)
+    parser.add_argument('--threshold', help='Open all cells with the predicted probability of a mine below the '
+                                            'threshold after every model run.',
+                        default=None, type=float)
+
+    args = parser.parse_args()
+
+    game_mode = {'classic': Mode.CLASSIC, 'easy': Mode.EASY, 'medium': Mode.MEDIUM,
+                 'expert': Mode.EXPERT}[args.game_mode]
+    model = ModelRegistry().model(game_mode)
+
+    print(f'CPUs: {os.cpu_count()}')
+    print('Workers, Samples per Second, Speedup, Games Played, Games Won')
+    base_rate = None
+    for workers in [int(workers) for workers in args.workers.split(',')]:
+        with SelfPlayPool(game_mode, model, workers, args.threshold, args.parallel_games, seed=0) as pool:
+            # The first games wait for the workers to start, so they are not measured.
+            pool.play(workers)
+            start_time = time.perf_counter()
+            _, _, games_played, games_won, _ = pool.play(args.samples)
+            rate = args.samples / (time.perf_counter() - start_time)
+
+        base_rate = base_rate or rate
+        print(f'{workers}, {rate:.1f}, {rate / base_rate:.2f}, {games_played}, {games_won}')
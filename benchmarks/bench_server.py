@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import numpy
+import time
+import torch
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import GameState, Mode
+from minesweeper_cnn_solver import MinesweeperSolver, InferenceServer, ModelRegistry
+from minesweeper_cnn_solver.inference_server import InferenceClient
+
+
+async def play_games(host, port, modes, requests, latencies, rng):
+    # Every client plays the games one after another through its own connection until the requests are exhausted.
+    client = await InferenceClient.connect(host, port)
+    while requests[0] > 0:
+        mode = modes[rng.integers(len(modes))]
+        game = MinesweeperGame(mode, rng=rng)
+        cell_idx = numpy.ravel_multi_index((mode.height() // 2, mode.width() // 2), mode.shape())
+        while requests[0] > 0 and game.open(cell_idx) == GameState.IN_PROGRESS:
+            requests[0] -= 1
+            start_time = time.perf_counter()
+            cell_idx = await client.solve(game.field())
+            latencies.append(time.perf_counter() - start_time)
+    await client.close()
+
+
+async def load_test(solver, modes, clients, max_batch_size, max_wait_time, mixed_shapes, requests, host, port):
+    """
+    Returns the throughput (requests per second), the latencies of all requests and the counter of the batch sizes.
+    The server is started in the same process unless the port is specified.
+    """
+    server = None
+    if port is None:
+        server = InferenceServer(solver, max_batch_size, max_wait_time, mixed_shapes)
+        tcp_server = await server.start_server(host)
+        port = tcp_server.sockets[0].getsockname()[1]
+
+    latencies = []
+    remaining_requests = [requests]
+    start_time = time.perf_counter()
+    await asyncio.gather(*(play_games(host, port, modes, remaining_requests, latencies,
+                                      numpy.random.default_rng(client_idx)) for client_idx in range(clients)))
+    elapsed_time = time.perf_counter() - start_time
+
+    if server is None:
+        return len(latencies) / elapsed_time, latencies, None
+
+    tcp_server.close()
+    await tcp_server.wait_closed()
+    await server.close()
+    return len(latencies) / elapsed_time, latencies, server.batch_sizes()
+
+
+parser = argparse.ArgumentParser(description='Measure the throughput and the latency of the inference server for the '
+                                             'concurrent games played through its TCP endpoint.')
+parser.add_argument('-g', '--game-modes', help='The comma separated game modes of the games, every game selects one '
+                                               'of them at random.',
+                    default='expert')
+parser.add_argument('-c', '--clients', help='The comma separated numbers of concurrent clients.',
+                    default='1,4,16,64')
+parser.add_argument('-b', '--max-batch-sizes', help='The comma separated maximum batch sizes of the server.',
+                    default='1,32')
+parser.add_argument('-w', '--max-wait-time', help='The maximum time in milliseconds that a request waits for the '
+                                                  'batch to be filled.',
+                    default=2.0, type=float)
+parser.add_argument('--mixed-shapes', help='Pad the fields of different shapes into one batch.',
+                    action='store_true')
+parser.add_argument('-n', '--requests', help='The number of requests for every configuration.',
+                    default=2000, type=int)
+parser.add_argument('--host', help='The host of the server.',
+                    default='127.0.0.1')
+parser.add_argument('--port', help='The port of the running server, the server is started in the process by default.',
+                    default=None, type=int)
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
+
+args = parser.parse_args()
+
+if args.threads is not None:
+    torch.set_num_threads(args.threads)
+
+game_modes = {'classic': Mode.CLASSIC, 'easy': Mode.EASY, 'medium': Mode.MEDIUM, 'expert': Mode.EXPERT}
+modes = [game_modes[mode] for mode in args.game_modes.split(',')]
+solver = MinesweeperSolver(ModelRegistry().model(modes[0]))
+
+print(f'Threads: {torch.get_num_threads()}')
+print('Clients, Max Batch Size, Throughput (requests/s), Latency p50 (ms), Latency p99 (ms), Mean Batch Size')
+for max_batch_size in [int(max_batch_size) for max_batch_size in args.max_batch_sizes.split(',')]:
+    for clients in [int(clients) for clients in args.clients.split(',')]:
+        throughput, latencies, batch_sizes = asyncio.run(load_test(solver, modes, clients, max_batch_size,
+                                                                   args.max_wait_time / 1000, args.mixed_shapes,
+                                                                   args.requests, args.host, args.port))
+        mean_batch_size = 'n/a' if batch_sizes is None else \
+            f'{sum(size * count for size, count in batch_sizes.items()) / sum(batch_sizes.values()):.1f}'
+        print(f'{clients}, {max_batch_size}, {throughput:.1f}, {numpy.percentile(latencies, 50) * 1e3:.2f}, '
+              f'{numpy.percentile(latencies, 99) * 1e3:.2f}, {mean_batch_size}')
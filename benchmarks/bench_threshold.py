@@ -0,0 +1,26 @@
+import argparse
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import MinesweeperSolver, ModelRegistry
+from minesweeper_cnn_solver.evaluation import threshold_sweep
+
+
+parser = argparse.ArgumentParser(description='Measure the win rate and the number of model runs per game when all '
+                                             'cells below the threshold are opened after every model run.')
+parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode.',
+                    default='easy', choices=['classic', 'easy', 'medium', 'expert'])
+parser.add_argument('-n', '--number-of-games', help='The number of games to play for every threshold.',
+                    default=500, type=int)
+parser.add_argument('-t', '--thresholds', help='The comma separated thresholds, 0 opens one cell per model run.',
+                    default='0,0.001,0.01,0.02,0.05,0.1,0.2')
+
+args = parser.parse_args()
+
+game_mode = {'classic': Mode.CLASSIC, 'easy': Mode.EASY, 'medium': Mode.MEDIUM, 'expert': Mode.EXPERT}[args.game_mode]
+solver = MinesweeperSolver(ModelRegistry().model(game_mode))
+thresholds = [float(threshold) for threshold in args.thresholds.split(',')]
+
+print(f'Mode: {game_mode}')
+print('Threshold, Win Rate, Model Runs per Game')
+for threshold, win_rate, solver_calls in threshold_sweep(solver, game_mode, range(args.number_of_games), thresholds):
+    print(f'{threshold}, {win_rate:.3f}, {solver_calls:.2f}')
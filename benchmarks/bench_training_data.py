@@ -0,0 +1,60 @@
+import argparse
+import numpy
+import time
+import torch
+import torch.utils.data
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_cnn_solver import MinesweeperFieldVectorizer, ReplayBuffer
+from minesweeper_cnn_solver.evaluation import self_play_fields
+from minesweeper_cnn_solver.solver import MinesweeperSolver
+from minesweeper_cnn_solver.trainer import MinesweeperSolverDataSet, _minibatch
+
+
+class PerSampleDataSet(torch.utils.data.Dataset):
+    # The data set without __getitems__, so every sample is vectorized alone and the samples are collated.
+    def __init__(self, data_set):
+        self._data_set = data_set
+
+    def __len__(self):
+        return len(self._data_set)
+
+    def __getitem__(self, idx):
+        return self._data_set[idx]
+
+
+def measure(loader):
+    start_time = time.perf_counter()
+    batches = sum(1 for _ in loader)
+    return (time.perf_counter() - start_time) / batches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the time to prepare a training minibatch by the samples and '
+                                                 'by the whole minibatches with and without the data workers.')
+    parser.add_argument('-n', '--samples', help='The number of samples in the replay buffer.',
+                        default=1000, type=int)
+    parser.add_argument('-s', '--batch-size', help='The number of samples in one batch.',
+                        default=200, type=int)
+    parser.add_argument('-b', '--batches', help='The number of the measured batches.',
+                        default=100, type=int)
+    parser.add_argument('-d', '--data-workers', help='The comma separated numbers of the data workers.',
+                        default='0,2')
+
+    args = parser.parse_args()
+
+    # The samples are the positions of the self-play games of the expert mode, the targets do not matter.
+    fields = numpy.stack(self_play_fields(MinesweeperSolver(), Mode.EXPERT, args.samples, seed=0))
+    replay_buffer = ReplayBuffer(args.samples, Mode.EXPERT.shape(), numpy.random.default_rng(0))
+    replay_buffer.add(fields, numpy.random.default_rng(0).random(fields.shape))
+    data_set = MinesweeperSolverDataSet(replay_buffer, MinesweeperFieldVectorizer())
+
+    print('Data Path, Data Workers, Time per Batch (ms)')
+    for data_workers in [int(data_workers) for data_workers in args.data_workers.split(',')]:
+        batches_idx = list(replay_buffer.batches_idx(args.batch_size, args.batches))
+        per_sample_time = measure(torch.utils.data.DataLoader(PerSampleDataSet(data_set), batch_sampler=batches_idx,
+                                                              num_workers=data_workers))
+        minibatch_time = measure(torch.utils.data.DataLoader(data_set, batch_sampler=batches_idx,
+                                                             collate_fn=_minibatch, num_workers=data_workers))
+        print(f'samples, {data_workers}, {per_sample_time * 1e3:.3f}')
+        print(f'minibatch, {data_workers}, {minibatch_time * 1e3:.3f}')
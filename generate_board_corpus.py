@@ -0,0 +1,39 @@
+import argparse
+import numpy
+
+from minesweeper_game.game_interface import Mode
+from minesweeper_game import MinesweeperBoardCorpus
+
+parser = argparse.ArgumentParser(description='Generate the corpus of Minesweeper fields to evaluate models.')
+parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode of the fields.',
+                    default='classic', choices=['classic', 'easy', 'medium', 'expert', 'custom'])
+parser.add_argument('-c', '--custom-mode', help='The configuration of the custom game mode in the following format:'
+                                                ' {field width}x{field height}x{number of mines}, e.g.: 8x8x8.',
+                    default=None)
+parser.add_argument('-n', '--number-of-boards', help='The number of fields in the corpus.',
+                    default=100000, type=int)
+parser.add_argument('-s', '--seed', help='The seed to generate the fields.',
+                    default=None, type=int)
+parser.add_argument('-o', '--output', help='The directory to keep the corpus.',
+                    required=True)
+
+args = parser.parse_args()
+
+if args.game_mode == 'classic':
+    selected_game_mode = Mode.CLASSIC
+elif args.game_mode == 'easy':
+    selected_game_mode = Mode.EASY
+elif args.game_mode == 'medium':
+    selected_game_mode = Mode.MEDIUM
+elif args.game_mode == 'expert':
+    selected_game_mode = Mode.EXPERT
+else:
+    if not args.custom_mode:
+        raise ValueError('--custom-mode option must be specified.')
+
+    mode_options = [int(x) for x in args.custom_mode.split('x')]
+    selected_game_mode = Mode(*mode_options)
+
+corpus = MinesweeperBoardCorpus.generate(args.output, selected_game_mode, args.number_of_boards,
+                                         numpy.random.default_rng(args.seed))
+print(f'{len(corpus)} {corpus.mode()} fields are saved to {args.output}')
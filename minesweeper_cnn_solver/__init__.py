@@ -1,4 +1,37 @@
-from .solver import MinesweeperSolver
-from .model import MinesweeperSolverModel
-from .vectorizer import MinesweeperFieldVectorizer
-from .trainer import MinesweeperSolverTrainer
+import importlib
+
+# The names of the package are imported from their modules on first access, so importing the package does not import
+# torch. Only the modules that are used import it, e.g. the vectorizer and the inference options do not.
+_NAME_MODULES = {
+    'MinesweeperSolver': 'solver',
+    'HybridSolver': 'hybrid_solver',
+    'MinesweeperSolverModel': 'model',
+    'ModelRegistry': 'model_registry',
+    'MinesweeperFieldVectorizer': 'vectorizer',
+    'MinesweeperSolverTrainer': 'trainer',
+    'SelfPlayPool': 'self_play_pool',
+    'ReplayBuffer': 'replay_buffer',
+    'DihedralTransform': 'augmentation',
+    'MinesweeperInferenceEngine': 'inference_engine',
+    'InferenceBackend': 'inference_options',
+    'InferencePrecision': 'inference_options',
+    'IncrementalInference': 'incremental_inference',
+    'PaddedBatchInference': 'padded_batch',
+    'InferenceServer': 'inference_server',
+}
+
+__all__ = list(_NAME_MODULES)
+
+
+def __getattr__(name):
+    module_name = _NAME_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
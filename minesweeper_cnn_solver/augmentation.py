@@ -0,0 +1,40 @@
+import numpy
+
+
+class DihedralTransform:
+    """
+    This is one of the rotations and reflections of the field, i.e. of the symmetries of the rectangle or the square.
+    The game does not change under them: the transformed field and the transformed mines are the field and the mines of
+    another game. The transform is applied to the last two axes of the batch of fields or targets and returns the view
+    of it.
+    """
+    def __init__(self, transpose, flip_rows, flip_columns):
+        self._transpose = transpose
+        self._flip_rows = flip_rows
+        self._flip_columns = flip_columns
+
+    def __call__(self, fields):
+        if self._transpose:
+            fields = numpy.swapaxes(fields, -2, -1)
+        if self._flip_rows:
+            fields = fields[..., ::-1, :]
+        if self._flip_columns:
+            fields = fields[..., ::-1]
+        return fields
+
+    def __repr__(self):
+        return f'DihedralTransform({self._transpose}, {self._flip_rows}, {self._flip_columns})'
+
+    @staticmethod
+    def transforms(shape):
+        """
+        Returns the list of the transforms which keep the shape of the field, the identity is the first of them. The
+        square fields have 8 transforms, the rectangular ones have 4, because the transposed field has another shape.
+        """
+        transposes = (False, True) if shape[0] == shape[1] else (False,)
+        return [DihedralTransform(transpose, flip_rows, flip_columns)
+                for transpose in transposes for flip_rows in (False, True) for flip_columns in (False, True)]
+
+
+# The transform which keeps the field as is, e.g. the only transform of the samples without augmentation.
+IDENTITY_TRANSFORM = DihedralTransform(False, False, False)
@@ -0,0 +1,85 @@
+import numpy
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import GameState
+
+# The games below are started from the center of the field and every game is defined by its seed, so the results of
+# different solvers are compared on the same fields.
+
+
+def _first_cell_idx(mode):
+    return numpy.ravel_multi_index((mode.height() // 2, mode.width() // 2), mode.shape())
+
+
+def play_game(solver, game, cell_idx, threshold=None):
+    """
+    Plays the game from the cell and returns its final state and the number of the solver calls. If the threshold is
+    specified, all cells returned by solver.cells_to_open are opened after every call.
+    """
+    solver_calls = 0
+    cells_idx = [cell_idx]
+    while game.open_many(cells_idx) == GameState.IN_PROGRESS:
+        if threshold is None:
+            cell_idx, _ = solver(game.field())
+            cells_idx = [cell_idx]
+        else:
+            cells_idx, _ = solver.cells_to_open(game.field(), threshold)
+        solver_calls += 1
+    return game.state(), solver_calls
+
+
+def win_rate(solver, mode, seeds):
+    games_won = 0
+    for seed in seeds:
+        game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+        state, _ = play_game(solver, game, _first_cell_idx(mode))
+        if state == GameState.WIN:
+            games_won += 1
+    return games_won / len(seeds)
+
+
+def threshold_sweep(solver, mode, seeds, thresholds):
+    """
+    Returns the list of the triples: the threshold, the win rate and the average number of the solver calls per game
+    when all cells below the threshold are opened after every call. All thresholds are checked on the same fields.
+    """
+    results = []
+    for threshold in thresholds:
+        games_won = 0
+        solver_calls = 0
+        for seed in seeds:
+            game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+            state, game_solver_calls = play_game(solver, game, _first_cell_idx(mode), threshold)
+            games_won += state == GameState.WIN
+            solver_calls += game_solver_calls
+        results.append((threshold, games_won / len(seeds), solver_calls / len(seeds)))
+    return results
+
+
+def self_play_fields(solver, mode, positions, seed=None):
+    """
+    Returns the array of fields with the shape (positions, H, W) which are seen by the solver while it plays.
+    """
+    rng = numpy.random.default_rng(seed)
+    fields = numpy.empty((positions,) + mode.shape(), dtype=numpy.int8)
+
+    position_idx = 0
+    while position_idx < positions:
+        game = MinesweeperGame(mode, rng=rng)
+        cell_idx = _first_cell_idx(mode)
+        while position_idx < positions and game.open(cell_idx) == GameState.IN_PROGRESS:
+            fields[position_idx] = game.field()
+            position_idx += 1
+            cell_idx, _ = solver(game.field())
+
+    return fields
+
+
+def compare_win_rates(reference_solver, solver, mode, seeds, max_win_rate_drop):
+    """
+    Returns the win rates of the reference solver and the solver on the same fields and whether the win rate of the
+    solver is lower than the reference one by max_win_rate_drop at most.
+    """
+    reference_win_rate = win_rate(reference_solver, mode, seeds)
+    solver_win_rate = win_rate(solver, mode, seeds)
+    return reference_win_rate, solver_win_rate, reference_win_rate - solver_win_rate <= max_win_rate_drop
@@ -0,0 +1,167 @@
+import numpy
+
+from minesweeper_game.field_generation import sum_nearby
+from minesweeper_game.game_interface import CellState
+
+from .solver import MinesweeperSolver, cells_below_threshold
+
+_NEIGHBOURHOOD_OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+# The cells that share at least one neighbour are at most 2 cells away from each other.
+_PAIR_OFFSETS = [(dy, dx) for dy in range(-2, 3) for dx in range(-2, 3) if (dy, dx) != (0, 0)]
+_PAIR_WINDOW_COLUMNS = [(dy + 2) * 5 + (dx + 2) for dy, dx in _PAIR_OFFSETS]
+
+
+def _is_adjacent(offset):
+    return max(abs(offset[0]), abs(offset[1])) <= 1
+
+
+# The element [i, j] is 1 if the j-th neighbour of a cell is not adjacent to the cell shifted by the i-th pair offset.
+_NOT_SHARED_NEIGHBOURS = numpy.array([[not _is_adjacent((dy - pair_dy, dx - pair_dx))
+                                       for dy, dx in _NEIGHBOURHOOD_OFFSETS]
+                                      for pair_dy, pair_dx in _PAIR_OFFSETS], dtype=numpy.int8)
+
+
+def _windows(cells, radius):
+    # The element [y, x, i] is the i-th element of the (2 * radius + 1) x (2 * radius + 1) window around the cell (y, x)
+    # in the row-major order, the elements outside the field are zeros.
+    window_size = 2 * radius + 1
+    windows = numpy.lib.stride_tricks.sliding_window_view(numpy.pad(cells, radius), (window_size, window_size))
+    return windows.reshape(cells.shape + (window_size * window_size,))
+
+
+def _shift(cells, offset):
+    # The element (y, x) of the result is the element (y + dy, x + dx) of the array, the elements outside the field are
+    # zeros.
+    dy, dx = offset
+    height, width = cells.shape
+    shifted = numpy.zeros_like(cells)
+    shifted[max(0, -dy):min(height, height - dy), max(0, -dx):min(width, width - dx)] = \
+        cells[max(0, dy):min(height, height + dy), max(0, dx):min(width, width + dx)]
+    return shifted
+
+
+def _apply_subset_rule(unknown_cells, unknown_count, remaining_mines, constraints):
+    # If the unknown neighbours of the cell A are a subset of the unknown neighbours of the cell B, then the unknown
+    # neighbours of B which are not adjacent to A contain (remaining mines of B - remaining mines of A) mines. They are
+    # all safe if the difference is zero and they are all mines if the difference is equal to their number. The last
+    # axis of the arrays below corresponds the offset of B from A, so all pairs of cells are checked at once.
+    unknown_outside = _windows(unknown_cells.view(numpy.int8), 1) @ _NOT_SHARED_NEIGHBOURS.T
+    difference_size = _windows(unknown_count, 2)[..., _PAIR_WINDOW_COLUMNS] - unknown_count[..., numpy.newaxis]
+    difference_mines = _windows(remaining_mines, 2)[..., _PAIR_WINDOW_COLUMNS] - remaining_mines[..., numpy.newaxis]
+    subset = (constraints[..., numpy.newaxis] & _windows(constraints, 2)[..., _PAIR_WINDOW_COLUMNS] &
+              (unknown_outside == 0) & (difference_size > 0))
+
+    safe_difference = subset & (difference_mines == 0)
+    mines_difference = subset & (difference_mines == difference_size)
+
+    safe_cells = numpy.zeros(unknown_cells.shape, dtype=bool)
+    mines = numpy.zeros(unknown_cells.shape, dtype=bool)
+    for pair_idx in numpy.flatnonzero(safe_difference.any(axis=(0, 1)) | mines_difference.any(axis=(0, 1))):
+        offset = _PAIR_OFFSETS[pair_idx]
+        for neighbour_offset in _NEIGHBOURHOOD_OFFSETS:
+            target_offset = (offset[0] + neighbour_offset[0], offset[1] + neighbour_offset[1])
+            if not _is_adjacent(target_offset):
+                safe_cells |= _shift(safe_difference[..., pair_idx], (-target_offset[0], -target_offset[1]))
+                mines |= _shift(mines_difference[..., pair_idx], (-target_offset[0], -target_offset[1]))
+
+    return safe_cells & unknown_cells, mines & unknown_cells
+
+
+def find_safe_cells_and_mines(field):
+    """
+    Returns the boolean arrays of the closed cells which are safe for sure and the closed cells which are mines for
+    sure. The single cell rule (the number of a cell is equal to the number of its neighbours which are mines for sure
+    or it is equal to the number of its closed neighbours) is applied until nothing changes, then the subset rule is
+    applied once and so on.
+    """
+    revealed_cells = field >= CellState.NO_MINES_NEARBY
+    closed_cells = field == CellState.CLOSED
+    safe_cells = numpy.zeros(field.shape, dtype=bool)
+    mines = numpy.zeros(field.shape, dtype=bool)
+
+    while True:
+        # The unknown cells are the closed cells which are not known to be safe or mines.
+        unknown_cells = closed_cells & ~safe_cells & ~mines
+        unknown_count = sum_nearby(unknown_cells)
+        remaining_mines = numpy.where(revealed_cells, field - sum_nearby(mines), 0).astype(numpy.int8)
+        constraints = revealed_cells & (unknown_count > 0)
+
+        new_safe_cells = unknown_cells & (sum_nearby(constraints & (remaining_mines == 0)) > 0)
+        new_mines = unknown_cells & (sum_nearby(constraints & (remaining_mines == unknown_count)) > 0)
+        if not new_safe_cells.any() and not new_mines.any():
+            new_safe_cells, new_mines = _apply_subset_rule(unknown_cells, unknown_count, remaining_mines, constraints)
+            if not new_safe_cells.any() and not new_mines.any():
+                return safe_cells, mines
+
+        safe_cells |= new_safe_cells
+        mines |= new_mines
+
+
+class HybridSolver:
+    """
+    This is the solver that opens the cells which are safe for sure without running the model. The model is run only if
+    there is no such cell, then the cells which are mines for sure are not selected.
+    """
+    def __init__(self, solver=None):
+        self._solver = solver if solver is not None else MinesweeperSolver()
+        self._forward_passes = 0
+        self._analyzed_field = None
+        self._safe_cells_idx = None
+        self._mines = None
+
+    def __call__(self, field):
+        """
+        Returns the index of the cell to open and the model output or None if the cell is safe for sure.
+        """
+        cells_idx, model_output = self.cells_to_open(field, 0)
+        return (int(cells_idx[0]) if len(cells_idx) else None), model_output
+
+    def cells_to_open(self, field, threshold):
+        """
+        Returns the indices of all cells which are safe for sure and None or, if there is no such cell, the cells
+        selected by the model with the threshold and the model output. The cells which are mines for sure are never
+        selected.
+        """
+        safe_cells_idx = self._pending_safe_cells(field)
+        if not len(safe_cells_idx):
+            self._analyze(field)
+            safe_cells_idx = self._safe_cells_idx
+
+        if len(safe_cells_idx):
+            return safe_cells_idx, None
+
+        self._forward_passes += 1
+        model_output = self._solver.predict(field)
+        field = numpy.where(self._mines, numpy.int8(CellState.MINE), field)
+        return cells_below_threshold(field, model_output.numpy(), threshold), model_output
+
+    def _analyze(self, field):
+        safe_cells, self._mines = find_safe_cells_and_mines(field)
+        self._safe_cells_idx = numpy.flatnonzero(safe_cells)
+        self._analyzed_field = numpy.copy(field)
+
+    def _pending_safe_cells(self, field):
+        # All cells found safe stay safe while the game goes on, so the field is not analyzed again until all of them
+        # are opened. The field is the continuation of the analyzed one if every cell opened in the analyzed field is
+        # opened in it, otherwise it is another game.
+        if self._analyzed_field is None or self._analyzed_field.shape != field.shape:
+            return []
+        if not numpy.all((self._analyzed_field == CellState.CLOSED) | (self._analyzed_field == field)):
+            return []
+        return self._safe_cells_idx[field.flat[self._safe_cells_idx] == CellState.CLOSED]
+
+    def safe_cells(self, field):
+        """
+        Returns the indices of all cells which are safe for sure.
+        """
+        safe_cells, _ = find_safe_cells_and_mines(field)
+        return numpy.flatnonzero(safe_cells)
+
+    def solver(self):
+        return self._solver
+
+    def forward_passes(self):
+        """
+        Returns the number of times the model is run.
+        """
+        return self._forward_passes
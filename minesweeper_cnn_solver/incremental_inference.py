@@ -0,0 +1,123 @@
+import torch
+import torch.nn.functional
+
+
+class IncrementalInference:
+    """
+    This is the replacement of the inference engine for the solver which plays one game at a time. Only a few cells of
+    the field change after a move, but every convolution sees the cells at most kernel_size // 2 cells away from the
+    output cell, so only the outputs within the receptive field of the changed cells change. The activations of every
+    layer are cached and only the part of them around the cells changed since the previous call is recomputed.
+
+    The layers are computed by the square tiles of tile_size x tile_size cells, every tile separately. The convolution
+    kernels select the algorithm and the order of the summation by the shape of the input, so the same tile computed
+    from the same input always gets the same values: the output of the incremental call is bit-identical to the output
+    of the full tiled pass, i.e. of the call on the empty cache. It is not bit-identical to model(x) for the whole
+    field: the output of the whole model differs from it by the rounding errors, within about 1e-6. The tiles which are
+    not changed are not recomputed, so the cost of a move is proportional to the number of the changed tiles instead of
+    the area of the field.
+    """
+    def __init__(self, model, tile_size=8):
+        layers = list(model._model)
+        self._model = model
+        self._convolutions = layers[0::2]
+        self._activations = layers[1::2]
+        self._tile_size = tile_size
+        # All activation maps are padded by the largest radius of the kernels, the padding and the cells outside the
+        # field are always zeros as the padding of the convolutions of the model.
+        self._padding = max(convolution.kernel_size[0] // 2 for convolution in self._convolutions)
+        self._field_shape = None
+        self._layer_inputs = None
+        self._output = None
+        self._computed_tiles = 0
+
+    def __call__(self, model_input):
+        if model_input.size()[0] != 1:
+            raise ValueError('The incremental inference accepts the batches with one element only.')
+
+        with torch.inference_mode():
+            model_input = model_input[0]
+            if self._field_shape != tuple(model_input.size()[1:]):
+                self._reset(model_input)
+                changed_region = (0, self._field_shape[0], 0, self._field_shape[1])
+            else:
+                changed_region = self._changed_region(model_input)
+
+            if changed_region is not None:
+                self._update(changed_region)
+
+            height, width = self._field_shape
+            return self._output[:height, :width].clone()[None]
+
+    def model(self):
+        return self._model
+
+    def computed_tiles(self):
+        """
+        Returns the number of the tiles of all layers computed since the creation.
+        """
+        return self._computed_tiles
+
+    def _reset(self, model_input):
+        height, width = self._field_shape = tuple(model_input.size()[1:])
+        tiled_height = -(-height // self._tile_size) * self._tile_size
+        tiled_width = -(-width // self._tile_size) * self._tile_size
+        self._layer_inputs = [torch.zeros(convolution.in_channels, tiled_height + 2 * self._padding,
+                                          tiled_width + 2 * self._padding, dtype=model_input.dtype)
+                              for convolution in self._convolutions]
+        self._output = torch.zeros(tiled_height, tiled_width, dtype=model_input.dtype)
+        self._field_input()[:] = model_input
+
+    def _field_input(self):
+        height, width = self._field_shape
+        return self._layer_inputs[0][:, self._padding:self._padding + height, self._padding:self._padding + width]
+
+    def _changed_region(self, model_input):
+        # Returns the bounding box of the cells changed since the previous call as (top, bottom, left, right) or None if
+        # nothing is changed. The changed cells are copied into the cached input.
+        field_input = self._field_input()
+        changed_cells = (model_input != field_input).any(dim=0)
+        changed_rows = torch.nonzero(changed_cells.any(dim=1))
+        if not len(changed_rows):
+            return None
+        changed_columns = torch.nonzero(changed_cells.any(dim=0))
+
+        top, bottom = int(changed_rows[0]), int(changed_rows[-1]) + 1
+        left, right = int(changed_columns[0]), int(changed_columns[-1]) + 1
+        field_input[:, top:bottom, left:right] = model_input[:, top:bottom, left:right]
+        return top, bottom, left, right
+
+    def _update(self, changed_region):
+        height, width = self._field_shape
+        top, bottom, left, right = changed_region
+        for layer_idx, (convolution, activation) in enumerate(zip(self._convolutions, self._activations)):
+            radius = convolution.kernel_size[0] // 2
+            # The outputs of the layer change within the radius of the kernel around the changed inputs.
+            top, bottom = max(0, top - radius), min(height, bottom + radius)
+            left, right = max(0, left - radius), min(width, right + radius)
+
+            layer_input = self._layer_inputs[layer_idx]
+            is_last_layer = layer_idx + 1 == len(self._convolutions)
+            for tile_top in range(top // self._tile_size * self._tile_size, bottom, self._tile_size):
+                for tile_left in range(left // self._tile_size * self._tile_size, right, self._tile_size):
+                    input_top = tile_top + self._padding - radius
+                    input_left = tile_left + self._padding - radius
+                    tile_input = layer_input[:, input_top:input_top + self._tile_size + 2 * radius,
+                                             input_left:input_left + self._tile_size + 2 * radius]
+                    tile_output = activation(torch.nn.functional.conv2d(tile_input[None], convolution.weight,
+                                                                        convolution.bias))[0]
+                    self._computed_tiles += 1
+
+                    # The cells of the tile outside the field are not written, so they stay zeros as the padding of the
+                    # next layer.
+                    tile_height = min(self._tile_size, height - tile_top)
+                    tile_width = min(self._tile_size, width - tile_left)
+                    if is_last_layer:
+                        self._output[tile_top:tile_top + tile_height, tile_left:tile_left + tile_width] = \
+                            tile_output[0, :tile_height, :tile_width]
+                    else:
+                        output_top = tile_top + self._padding
+                        output_left = tile_left + self._padding
+                        self._layer_inputs[layer_idx + 1][:, output_top:output_top + tile_height,
+                                                          output_left:output_left + tile_width] = \
+                            tile_output[:, :tile_height, :tile_width]
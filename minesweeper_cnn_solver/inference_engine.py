@@ -0,0 +1,115 @@
+import copy
+import torch
+import zipfile
+
+from .inference_options import InferenceBackend, InferencePrecision
+from .model import MinesweeperSolverModel
+from .quantization import BFloat16MinesweeperSolverModel, quantize_model
+
+
+class MinesweeperInferenceEngine:
+    """
+    This is a wrapper for the model to run the inference only. The engine runs the model under torch.inference_mode
+    using one of the backends:
+    * InferenceBackend.EAGER runs the model as is, so the engine reflects any change of the model weights unless the
+      memory format is channels last;
+    * InferenceBackend.TORCHSCRIPT runs the frozen TorchScript module, the weights are copied into it;
+    * InferenceBackend.COMPILE runs the copy of the model compiled by torch.compile.
+
+    The precision of the engine is one of the following:
+    * InferencePrecision.FLOAT32 runs the model itself;
+    * InferencePrecision.BFLOAT16 runs the bfloat16 copy of the model;
+    * InferencePrecision.INT8 runs the int8 copy of the model, the activations are calibrated on calibration_inputs.
+    The reduced-precision copies do not reflect the changes of the model weights, whatever the backend is. The weights
+    of the channels last engine are converted in the copy of the model, so the model of the caller is never changed.
+    The number of threads is the setting of the process, it is set by the caller with torch.set_num_threads.
+    """
+    def __init__(self, model, backend=InferenceBackend.EAGER, channels_last=False, precision=InferencePrecision.FLOAT32,
+                 calibration_inputs=None):
+        self._model = model
+        self._backend = backend
+        self._precision = precision
+        self._memory_format = torch.channels_last if channels_last else torch.contiguous_format
+
+        if precision == InferencePrecision.FLOAT32:
+            # Only the eager engine with the default memory format runs the model itself.
+            module = model if backend == InferenceBackend.EAGER and not channels_last else copy.deepcopy(model)
+        elif precision == InferencePrecision.BFLOAT16:
+            module = BFloat16MinesweeperSolverModel(model)
+        elif precision == InferencePrecision.INT8:
+            if calibration_inputs is None:
+                raise ValueError('The calibration inputs must be specified for int8 precision.')
+            module = quantize_model(model, calibration_inputs)
+        else:
+            raise ValueError('Unexpected inference precision is specified.')
+
+        if module is not model:
+            module.eval()
+            if channels_last:
+                module.to(memory_format=torch.channels_last)
+
+        if backend == InferenceBackend.EAGER:
+            self._module = module
+        elif backend == InferenceBackend.TORCHSCRIPT:
+            self._module = torch.jit.freeze(torch.jit.script(module))
+        elif backend == InferenceBackend.COMPILE:
+            self._module = torch.compile(module)
+        else:
+            raise ValueError('Unexpected inference backend is specified.')
+
+    def __call__(self, model_input):
+        with torch.inference_mode():
+            return self._module(model_input.contiguous(memory_format=self._memory_format))
+
+    def model(self):
+        """
+        Returns the model or None if the engine is loaded from the pre-optimized file.
+        """
+        return self._model
+
+    def backend(self):
+        return self._backend
+
+    def precision(self):
+        """
+        Returns the precision of the engine or None if the engine is loaded from the pre-optimized file.
+        """
+        return self._precision
+
+    def save(self, path):
+        """
+        Saves the pre-optimized TorchScript module which can be loaded by fromfile without the model.
+        """
+        if self._backend != InferenceBackend.TORCHSCRIPT:
+            raise RuntimeError('Only the engine with TorchScript backend can be saved.')
+        torch.jit.save(self._module, path)
+
+    @staticmethod
+    def is_torchscript_file(path):
+        # The TorchScript archive contains the code of the module unlike the file with the model weights.
+        with zipfile.ZipFile(path) as archive:
+            return any(name.endswith('constants.pkl') for name in archive.namelist())
+
+    @staticmethod
+    def _from_module(module, channels_last):
+        # The engine of the pre-optimized module has neither the model nor the precision.
+        engine = MinesweeperInferenceEngine.__new__(MinesweeperInferenceEngine)
+        engine._model = None
+        engine._backend = InferenceBackend.TORCHSCRIPT
+        engine._precision = None
+        engine._memory_format = torch.channels_last if channels_last else torch.contiguous_format
+        engine._module = module
+        return engine
+
+    @staticmethod
+    def fromfile(path, backend=InferenceBackend.EAGER, channels_last=False, precision=InferencePrecision.FLOAT32,
+                 calibration_inputs=None, mmap=False):
+        """
+        Loads the engine from the pre-optimized TorchScript module or the model weights. The backend and the precision
+        are ignored for the pre-optimized module. If mmap is set, the model weights are memory-mapped from the file.
+        """
+        if not MinesweeperInferenceEngine.is_torchscript_file(path):
+            return MinesweeperInferenceEngine(MinesweeperSolverModel.fromfile(path, mmap), backend, channels_last,
+                                              precision, calibration_inputs)
+
+        return MinesweeperInferenceEngine._from_module(torch.jit.load(path), channels_last)
@@ -0,0 +1,14 @@
+# The options of the inference are kept apart from the engine, so the command line scripts can list them without
+# importing torch.
+
+
+class InferenceBackend:
+    EAGER = 'eager'
+    TORCHSCRIPT = 'torchscript'
+    COMPILE = 'compile'
+
+
+class InferencePrecision:
+    FLOAT32 = 'float32'
+    BFLOAT16 = 'bfloat16'
+    INT8 = 'int8'
@@ -0,0 +1,200 @@
+import asyncio
+import collections
+import concurrent.futures
+import json
+import numpy
+import torch
+
+from minesweeper_game.game_interface import CellState
+
+from .inference_options import InferencePrecision
+from .solver import MinesweeperSolver
+
+
+def _checked_field(field):
+    # The field is checked before it is queued, so an invalid field fails its own request instead of the whole batch.
+    if not isinstance(field, numpy.ndarray) or field.ndim != 2 or field.size == 0:
+        raise ValueError('The field must be a non-empty two-dimensional array.')
+    if not numpy.issubdtype(field.dtype, numpy.integer) or \
+            field.min() < CellState.MINE or field.max() > CellState.EIGHT_MINES_NEARBY:
+        raise ValueError(f'The cell states must be the integers from {int(CellState.MINE)} to '
+                         f'{int(CellState.EIGHT_MINES_NEARBY)}.')
+    return field.astype(numpy.int8, copy=False)
+
+
+class _BatchQueue:
+    def __init__(self):
+        self.requests = []
+        # The requests of the batch which is computed by the model.
+        self.batch = []
+        self.not_empty = asyncio.Event()
+        self.worker = None
+
+
+class InferenceServer:
+    """
+    This is the service which runs the model for many concurrent games. The concurrent requests are collected into one
+    batch until the batch has max_batch_size fields or the first request of the batch waits for max_wait_time seconds,
+    then the model is run for the whole batch at once. The fields of different shapes cannot be stacked, so every shape
+    has its own queue of requests unless mixed_shapes is set: then all fields share one queue and they are padded to
+    one shape. The padded batches are run by the eager float32 model of the solver, not by the TorchScript or compile
+    backend of its engine, so mixed_shapes requires the float32 model weights and the other precisions are refused.
+
+    The model is run in the separate thread, so the server keeps accepting the requests for the next batch while the
+    current one is computed.
+    """
+    def __init__(self, solver=None, max_batch_size=32, max_wait_time=0.002, mixed_shapes=False):
+        self._solver = solver if solver is not None else MinesweeperSolver()
+        if mixed_shapes and (self._solver.model() is None or
+                             self._solver.engine().precision() != InferencePrecision.FLOAT32):
+            raise ValueError('The fields of different shapes can be solved by the float32 model weights only.')
+        self._max_batch_size = max_batch_size
+        self._max_wait_time = max_wait_time
+        self._mixed_shapes = mixed_shapes
+        self._queues = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._batch_sizes = collections.Counter()
+
+    async def solve(self, field):
+        """
+        Returns the index of the closed cell with the smallest predicted probability of a mine (or None if there is no
+        closed cell) and the model output for the field. Raises ValueError if the field is not a valid field, the error
+        of the model is raised for every request of its batch.
+        """
+        field = _checked_field(field)
+        queue_key = None if self._mixed_shapes else field.shape
+        queue = self._queues.get(queue_key)
+        if queue is None:
+            queue = self._queues[queue_key] = _BatchQueue()
+            queue.worker = asyncio.get_running_loop().create_task(self._process_batches(queue))
+
+        future = asyncio.get_running_loop().create_future()
+        queue.requests.append((field, future))
+        queue.not_empty.set()
+        return await future
+
+    async def _process_batches(self, queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            await queue.not_empty.wait()
+            deadline = loop.time() + self._max_wait_time
+            while len(queue.requests) < self._max_batch_size and loop.time() < deadline:
+                queue.not_empty.clear()
+                try:
+                    await asyncio.wait_for(queue.not_empty.wait(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+
+            requests = queue.batch = queue.requests[:self._max_batch_size]
+            del queue.requests[:self._max_batch_size]
+            if queue.requests:
+                queue.not_empty.set()
+            else:
+                queue.not_empty.clear()
+
+            fields = [field for field, _ in requests]
+            try:
+                cells_idx, model_outputs = await loop.run_in_executor(self._executor, self._predict, fields)
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                queue.batch = []
+                continue
+
+            self._batch_sizes[len(requests)] += 1
+            for (_, future), cell_idx, model_output in zip(requests, cells_idx, model_outputs):
+                if not future.done():
+                    future.set_result((cell_idx, model_output))
+            queue.batch = []
+
+    def _predict(self, fields):
+        if self._mixed_shapes:
+            cells_idx, model_outputs = self._solver.solve_batch(fields)
+            return cells_idx, [model_output.numpy() for model_output in model_outputs]
+
+        # The batch is vectorized into a new array instead of the buffer of the solver, because the batches of
+        # different shapes have different sizes.
+        fields = numpy.stack(fields)
+        model_input = torch.from_numpy(self._solver.vectorizer().vectorize_batch(fields))
+        model_outputs = self._solver.engine()(model_input)
+        cells_idx = self._solver.cells_idx(fields, model_outputs)
+        cells_idx = [int(cell_idx) if cell_idx >= 0 else None for cell_idx in cells_idx]
+        return cells_idx, model_outputs.numpy()
+
+    async def start_server(self, host='127.0.0.1', port=0):
+        """
+        Starts the TCP endpoint: every request is the line with the JSON object {"field": [[...], ...]} and every
+        response is the line with the JSON object {"cell_idx": ...} or {"error": ...}. The requests of one connection
+        are answered in order. Returns the asyncio server.
+        """
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict) or 'field' not in request:
+                        raise ValueError('The request must contain the field.')
+                    cell_idx, _ = await self.solve(numpy.array(request['field']))
+                    response = {'cell_idx': cell_idx}
+                except Exception as e:
+                    # Every failed request is answered by the error, so the connection stays usable.
+                    response = {'error': str(e)}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        """
+        Stops the workers of the queues. The requests which are still queued or computed are failed by RuntimeError,
+        so none of them waits forever.
+        """
+        for queue in self._queues.values():
+            queue.worker.cancel()
+        await asyncio.gather(*(queue.worker for queue in self._queues.values()), return_exceptions=True)
+        for queue in self._queues.values():
+            for _, future in queue.batch + queue.requests:
+                if not future.done():
+                    future.set_exception(RuntimeError('The inference server is closed.'))
+        self._queues = {}
+        self._executor.shutdown()
+
+    def solver(self):
+        return self._solver
+
+    def batch_sizes(self):
+        """
+        Returns the counter of the sizes of the batches run by the model.
+        """
+        return self._batch_sizes
+
+
+class InferenceClient:
+    """
+    This is the client of the TCP endpoint of the inference server, one request at a time.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @staticmethod
+    async def connect(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return InferenceClient(reader, writer)
+
+    async def solve(self, field):
+        self._writer.write(json.dumps({'field': field.tolist()}).encode() + b'\n')
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response['cell_idx']
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
@@ -33,7 +33,11 @@ class MinesweeperSolverModel(torch.nn.Module):
         torch.save(self._model.state_dict(), path)
 
     @staticmethod
-    def fromfile(path):
+    def fromfile(path, mmap=False):
+        """
+        Loads the model weights. If mmap is set, the weights are memory-mapped from the file instead of being read into
+        memory, so the processes that load the same file share the pages of the weights.
+        """
         model = MinesweeperSolverModel()
-        model._model.load_state_dict(torch.load(path))
+        model._model.load_state_dict(torch.load(path, mmap=mmap), assign=mmap)
         return model
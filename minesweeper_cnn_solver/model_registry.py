@@ -0,0 +1,68 @@
+import collections
+import os
+
+from minesweeper_game.game_interface import Mode
+
+from .model import MinesweeperSolverModel
+
+
+def _mode_key(mode):
+    return mode.width(), mode.height(), mode.mines()
+
+
+class ModelRegistry:
+    """
+    This is the registry of the checkpoints of the models by the game modes. The checkpoints of the standard modes are
+    registered in the directory of the pretrained models, the checkpoints of other modes (including the custom ones)
+    are registered by register.
+
+    The model is loaded on the first request only and its weights are memory-mapped from the checkpoint, so the worker
+    processes forked after the loading share the pages of the weights with the parent process, and the processes which
+    load the same checkpoint share them through the page cache. At most max_loaded_models models are kept, the least
+    recently used model is released when one more model is loaded.
+    """
+    def __init__(self, directory='trained_models', max_loaded_models=8):
+        self._max_loaded_models = max_loaded_models
+        self._checkpoints = {}
+        self._models = collections.OrderedDict()
+        for mode in (Mode.CLASSIC, Mode.EASY, Mode.MEDIUM, Mode.EXPERT):
+            self.register(mode, os.path.join(directory, f'{mode}_minesweeper_model.pt'))
+
+    def register(self, mode, path):
+        """
+        Registers the checkpoint for the mode, the model loaded from the previous checkpoint of the mode is released.
+        """
+        key = _mode_key(mode)
+        self._checkpoints[key] = path
+        self._models.pop(key, None)
+
+    def __contains__(self, mode):
+        return _mode_key(mode) in self._checkpoints
+
+    def path(self, mode):
+        key = _mode_key(mode)
+        if key not in self._checkpoints:
+            raise ValueError(f'The model is not registered for {mode} mode.')
+        return self._checkpoints[key]
+
+    def model(self, mode):
+        """
+        Returns the model for the mode, the model is loaded if it is not loaded yet.
+        """
+        key = _mode_key(mode)
+        model = self._models.get(key)
+        if model is not None:
+            self._models.move_to_end(key)
+            return model
+
+        model = MinesweeperSolverModel.fromfile(self.path(mode), mmap=True)
+        self._models[key] = model
+        if len(self._models) > self._max_loaded_models:
+            self._models.popitem(last=False)
+        return model
+
+    def loaded_modes(self):
+        """
+        Returns the modes of the loaded models from the least recently used one.
+        """
+        return [Mode(*key) for key in self._models]
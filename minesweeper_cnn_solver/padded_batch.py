@@ -0,0 +1,58 @@
+import numpy
+import torch
+
+from minesweeper_game.game_interface import CellState
+
+from .vectorizer import MinesweeperFieldVectorizer
+
+
+class PaddedBatchInference:
+    """
+    This is the inference of the model for the fields of different shapes in one batch. The fields are placed into the
+    top left corner of the tensor of the largest height and width, the rest of the tensor is the padding. The
+    convolutions of the model pad every field by zeros, so the padding must stay zero after every layer, otherwise the
+    padding changes the predictions near the right and the bottom edges of the smaller fields. Every activation map is
+    multiplied by the mask of the field cells after the activation, therefore, the output for every field is the same
+    as the output of the model for the field alone (up to the rounding errors of the convolution kernels).
+
+    The mask is applied between the layers, so only the model with the layers accessible (the float model run eagerly)
+    is supported.
+    """
+    def __init__(self, model, vectorizer=None):
+        self._model = model
+        self._vectorizer = vectorizer if vectorizer is not None else MinesweeperFieldVectorizer()
+
+    def __call__(self, fields):
+        """
+        Returns the list of the model outputs for the list of fields, every output has the shape of its field.
+        """
+        padded_fields, mask = pad_fields(fields)
+        mask = torch.from_numpy(mask)
+
+        with torch.inference_mode():
+            x = torch.from_numpy(self._vectorizer.vectorize_batch(padded_fields)).mul_(mask)
+            for layer in self._model._model:
+                x = layer(x)
+                if isinstance(layer, torch.nn.ReLU):
+                    x.mul_(mask)
+
+        return [x[field_idx, 0, :field.shape[0], :field.shape[1]] for field_idx, field in enumerate(fields)]
+
+    def model(self):
+        return self._model
+
+
+def pad_fields(fields):
+    """
+    Returns the array of the fields padded to the largest height and width with the shape (N, H, W) and the mask of the
+    field cells with the shape (N, 1, H, W). The padding cells are closed.
+    """
+    height = max(field.shape[0] for field in fields)
+    width = max(field.shape[1] for field in fields)
+
+    padded_fields = numpy.full((len(fields), height, width), CellState.CLOSED, dtype=numpy.int8)
+    mask = numpy.zeros((len(fields), 1, height, width), dtype=numpy.float32)
+    for field_idx, field in enumerate(fields):
+        padded_fields[field_idx, :field.shape[0], :field.shape[1]] = field
+        mask[field_idx, 0, :field.shape[0], :field.shape[1]] = 1
+    return padded_fields, mask
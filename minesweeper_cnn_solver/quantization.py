@@ -0,0 +1,64 @@
+import copy
+import torch
+import torch.ao.quantization
+import torch.nn
+
+
+class BFloat16MinesweeperSolverModel(torch.nn.Module):
+    """
+    This is a copy of the model with bfloat16 weights. It accepts and returns float32 tensors.
+    """
+    def __init__(self, model):
+        super(BFloat16MinesweeperSolverModel, self).__init__()
+        self._model = copy.deepcopy(model).to(torch.bfloat16)
+
+    def forward(self, x):
+        return self._model(x.to(torch.bfloat16)).to(torch.float32)
+
+
+class QuantizableMinesweeperSolverModel(torch.nn.Module):
+    """
+    This is a copy of the model prepared for the eager mode post-training quantization: the input is quantized before
+    the first convolution, every convolution is fused with the following ReLU and the output of the last ReLU is
+    dequantized. The last convolution (it is cheap, because it has one output channel) and the sigmoid stay in float32:
+    the solver selects the cell with the smallest probability of a mine, so the resolution of the quantized logits is
+    lost exactly where it matters.
+    """
+    def __init__(self, model):
+        super(QuantizableMinesweeperSolverModel, self).__init__()
+
+        layers = copy.deepcopy(model._model)
+        features = layers[:-2]
+        for layer in features:
+            # The quantized convolutions do not support 'same' padding, so it is replaced with the explicit one.
+            if isinstance(layer, torch.nn.Conv2d):
+                layer.padding = tuple(kernel_size // 2 for kernel_size in layer.kernel_size)
+
+        conv_relu_pairs = [[str(idx - 1), str(idx)] for idx, layer in enumerate(features)
+                           if isinstance(layer, torch.nn.ReLU)]
+        self._features = torch.ao.quantization.fuse_modules(features.eval(), conv_relu_pairs)
+        self._head = layers[-2:]
+        self._head.qconfig = None
+        self._quant = torch.ao.quantization.QuantStub()
+        self._dequant = torch.ao.quantization.DeQuantStub()
+
+    def forward(self, x):
+        x = self._head(self._dequant(self._features(self._quant(x))))
+        output_shape = (x.size()[0],) + x.size()[2:]
+        return x.view(output_shape)
+
+
+def quantize_model(model, calibration_inputs, calibration_batch_size=64):
+    """
+    Returns the int8 copy of the model. The quantization parameters of activations are calibrated on the vectorized
+    fields, which should be the positions of real games.
+    """
+    quantizable_model = QuantizableMinesweeperSolverModel(model).eval()
+    quantizable_model.qconfig = torch.ao.quantization.get_default_qconfig(torch.backends.quantized.engine)
+    prepared_model = torch.ao.quantization.prepare(quantizable_model)
+
+    with torch.inference_mode():
+        for calibration_batch in torch.split(calibration_inputs, calibration_batch_size):
+            prepared_model(calibration_batch)
+
+    return torch.ao.quantization.convert(prepared_model)
@@ -0,0 +1,93 @@
+import numpy
+
+
+class ReplayBuffer:
+    """
+    This is the replay memory of the training samples with the fixed capacity. The fields are stored as int8 cell
+    states and the targets as float16 probabilities in the arrays preallocated for the whole capacity, so the memory
+    does not grow with the number of the added samples. When the buffer is full, the oldest samples are replaced first.
+    """
+    def __init__(self, capacity, shape, rng=None):
+        if capacity < 1:
+            raise ValueError('The capacity must be positive.')
+
+        self._fields = numpy.empty((capacity,) + tuple(shape), dtype=numpy.int8)
+        self._targets = numpy.empty((capacity,) + tuple(shape), dtype=numpy.float16)
+        self._rng = rng if rng is not None else numpy.random.default_rng()
+        self._size = 0
+        # The position of the next sample, i.e. of the oldest one when the buffer is full.
+        self._next_idx = 0
+
+    def __len__(self):
+        return self._size
+
+    def capacity(self):
+        return len(self._fields)
+
+    def nbytes(self):
+        return self._fields.nbytes + self._targets.nbytes
+
+    def clear(self):
+        self._size = 0
+        self._next_idx = 0
+
+    def add(self, fields, targets):
+        """
+        Adds the batch of the fields and the batch of the targets, e.g. the arrays with the shape (N, H, W). Only the
+        last samples are kept if there are more of them than the capacity.
+        """
+        fields = numpy.asarray(fields)
+        targets = numpy.asarray(targets)
+        if fields.shape[1:] != self._fields.shape[1:] or targets.shape != fields.shape:
+            raise ValueError(f'The samples must have the shape {self._fields.shape[1:]}.')
+
+        fields = fields[-self.capacity():]
+        targets = targets[-self.capacity():]
+
+        # The samples are copied by at most two slices, up to the end of the arrays and from their beginning.
+        count = len(fields)
+        head_count = min(count, self.capacity() - self._next_idx)
+        self._fields[self._next_idx:self._next_idx + head_count] = fields[:head_count]
+        self._targets[self._next_idx:self._next_idx + head_count] = targets[:head_count]
+        self._fields[:count - head_count] = fields[head_count:]
+        self._targets[:count - head_count] = targets[head_count:]
+
+        self._next_idx = (self._next_idx + count) % self.capacity()
+        self._size = min(self._size + count, self.capacity())
+
+    def fields(self):
+        """
+        Returns the view of the stored fields, the indices of the minibatches refer to it.
+        """
+        return self._fields[:self._size]
+
+    def targets(self):
+        return self._targets[:self._size]
+
+    def batches_idx(self, batch_size, count, copies=1):
+        """
+        Returns the iterator of the indices of count random minibatches of batch_size samples. The samples are taken in
+        the order of a random permutation of the stored samples and the next permutation is drawn when all of them are
+        taken, so every sample is taken once before any sample is taken again. If there are several copies of every
+        sample, e.g. its transforms, all of them are permuted and the index i is the copy i // len(self) of the sample
+        i % len(self).
+        """
+        if not self._size:
+            raise RuntimeError('The replay buffer is empty.')
+
+        order = numpy.empty(0, dtype=numpy.int64)
+        for _ in range(count):
+            while len(order) < batch_size:
+                order = numpy.concatenate((order, self._rng.permutation(self._size * copies)))
+            # The samples of a minibatch are gathered in the order of the memory, the order in the batch does not
+            # matter for the training.
+            yield numpy.sort(order[:batch_size])
+            order = order[batch_size:]
+
+    def batches(self, batch_size, count):
+        """
+        Returns the iterator of count random minibatches of batch_size fields and targets taken as by batches_idx,
+        every gather returns the new contiguous arrays.
+        """
+        for batch_idx in self.batches_idx(batch_size, count):
+            yield self._fields[batch_idx], self._targets[batch_idx]
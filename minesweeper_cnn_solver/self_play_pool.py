@@ -0,0 +1,159 @@
+import numpy
+import torch
+import torch.multiprocessing
+
+from .model import MinesweeperSolverModel
+from .solver import MinesweeperSolver
+from .trainer import MinesweeperSolverTrainer
+
+
+def _self_play_worker(game_mode, weights, threshold, parallel_games, seed_sequence, threads, connection):
+    # Every worker runs its own copy of the model, the weights are copied from the shared memory before every batch of
+    # the games, so the workers play with the weights of the current training iteration.
+    torch.set_num_threads(threads)
+    model = MinesweeperSolverModel()
+    trainer = MinesweeperSolverTrainer(game_mode, MinesweeperSolver(model), threshold, parallel_games,
+                                       rng=numpy.random.default_rng(seed_sequence))
+    fields_buffer = None
+    predictions_buffer = None
+
+    while (command := connection.recv()) is not None:
+        samples, buffers = command
+        if buffers is not None:
+            fields_buffer, predictions_buffer = buffers
+
+        try:
+            model.load_state_dict(weights)
+            model.eval()
+            # The samples are written straight to the shared buffers.
+            play = trainer.play_games if parallel_games is None else trainer.play_games_in_lockstep
+            with torch.no_grad():
+                _, _, games_played, games_won, cells_revealed = play(samples, fields_buffer[:samples].numpy(),
+                                                                     predictions_buffer[:samples].numpy())
+            connection.send((int(games_played), int(games_won), int(cells_revealed)))
+        except Exception as e:
+            connection.send(e)
+
+
+class SelfPlayPool:
+    """
+    This is the pool of the worker processes which play the games to collect the training samples. Every worker keeps
+    its own copy of the model, the learner broadcasts the weights of the model through the shared memory at the start of
+    every training iteration, and the workers write the samples to the shared buffers, so neither the weights nor the
+    samples are pickled. The mines of every worker are placed by its own generator spawned from the seed.
+
+    The games are played by every worker the same way as by MinesweeperSolverTrainer with the threshold and the number
+    of parallel games, every worker runs the model with the threads_per_worker threads.
+    """
+    def __init__(self, game_mode, model, workers, threshold=None, parallel_games=None, seed=None,
+                 threads_per_worker=1):
+        if workers < 1:
+            raise ValueError('The number of workers must be positive.')
+
+        self._game_mode = game_mode
+        self._model = model
+        self._weights = {name: tensor.detach().clone().share_memory_() for name, tensor in model.state_dict().items()}
+        self._fields_buffers = None
+        self._predictions_buffers = None
+
+        # The workers are spawned, so they do not inherit the threads of the parent process.
+        context = torch.multiprocessing.get_context('spawn')
+        self._connections = []
+        self._processes = []
+        for seed_sequence in numpy.random.SeedSequence(seed).spawn(workers):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=_self_play_worker, daemon=True,
+                                      args=(game_mode, self._weights, threshold, parallel_games, seed_sequence,
+                                            threads_per_worker, worker_connection))
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def workers(self):
+        return len(self._processes)
+
+    def broadcast(self):
+        """
+        Copies the current weights of the model to the shared memory, the workers load them before the next games.
+        """
+        with torch.no_grad():
+            for name, tensor in self._model.state_dict().items():
+                self._weights[name].copy_(tensor)
+
+    def _buffers(self, samples_per_worker):
+        # The buffers are allocated for the largest number of the samples of a worker and reused while it is enough,
+        # the workers receive the new buffers with the next command only.
+        if self._fields_buffers is not None and len(self._fields_buffers[0]) >= samples_per_worker:
+            return False
+
+        shape = (samples_per_worker,) + self._game_mode.shape()
+        self._fields_buffers = [torch.empty(shape, dtype=torch.int8).share_memory_() for _ in self._processes]
+        self._predictions_buffers = [torch.empty(shape, dtype=torch.float32).share_memory_() for _ in self._processes]
+        return True
+
+    def play(self, samples, fields=None, predictions=None):
+        """
+        Broadcasts the weights of the model and plays the games in the workers until the number of the positions is
+        equal to samples. Accepts and returns the same values as MinesweeperSolverTrainer.play_games, the numbers of
+        the games and the cells are summed over the workers.
+        """
+        self.broadcast()
+        shape = (samples,) + self._game_mode.shape()
+        fields = fields if fields is not None else numpy.empty(shape, dtype=numpy.int8)
+        predictions = predictions if predictions is not None else numpy.empty(shape, dtype=numpy.float32)
+
+        worker_samples = [samples // self.workers() + (worker_idx < samples % self.workers())
+                          for worker_idx in range(self.workers())]
+        new_buffers = self._buffers(worker_samples[0])
+        for connection, count, fields_buffer, predictions_buffer in zip(
+                self._connections, worker_samples, self._fields_buffers, self._predictions_buffers):
+            connection.send((count, (fields_buffer, predictions_buffer) if new_buffers else None))
+
+        # All results are received before the error of a worker is raised, so the next commands are not mixed up with
+        # the results of this one.
+        results = [connection.recv() for connection in self._connections]
+        for result in results:
+            if isinstance(result, Exception):
+                raise RuntimeError('The self-play worker failed.') from result
+
+        games_played = 0
+        games_won = 0
+        cells_revealed = 0
+        sample_idx = 0
+        for result, count, fields_buffer, predictions_buffer in zip(
+                results, worker_samples, self._fields_buffers, self._predictions_buffers):
+            games_played += result[0]
+            games_won += result[1]
+            cells_revealed += result[2]
+            # The buffers are overwritten by the next games, so the samples are copied to the arrays.
+            fields[sample_idx:sample_idx + count] = fields_buffer[:count].numpy()
+            predictions[sample_idx:sample_idx + count] = predictions_buffer[:count].numpy()
+            sample_idx += count
+
+        return fields, predictions, games_played, games_won, cells_revealed
+
+    def close(self, timeout=10.):
+        """
+        Stops the workers. A worker which has already exited, e.g. because it crashed, cannot receive the command, and a
+        worker which does not exit in timeout seconds is terminated, so the pool is closed in any case.
+        """
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._connections = []
+        self._processes = []
@@ -1,50 +1,138 @@
 import numpy
-
-from torch.utils.data import default_collate
+import torch
 
 from minesweeper_game.game_interface import CellState
 
+from .inference_engine import MinesweeperInferenceEngine
+from .inference_options import InferencePrecision
 from .model import MinesweeperSolverModel
+from .padded_batch import PaddedBatchInference
 from .vectorizer import MinesweeperFieldVectorizer
 
 
 class MinesweeperSolver:
     """
-    This is a wrapper for the model to work with one field.
+    This is a wrapper for the model to work with one field. The precision is used if the engine is not specified, the
+    int8 precision requires the calibration fields, i.e. the positions of real games.
     """
-    def __init__(self, model=None, vectorizer=None):
-        self._model = model if model is not None else MinesweeperSolverModel()
+    def __init__(self, model=None, vectorizer=None, engine=None, precision=InferencePrecision.FLOAT32,
+                 calibration_fields=None):
+        if model is not None and engine is not None:
+            raise ValueError('Only one of model and engine can be specified.')
+
         self._vectorizer = vectorizer if vectorizer is not None else MinesweeperFieldVectorizer()
+        self._input_buffer = None
+        self._input_tensor = None
+
+        if engine is None:
+            calibration_inputs = None
+            if calibration_fields is not None:
+                calibration_inputs = torch.from_numpy(self._vectorizer.vectorize_batch(calibration_fields))
+            engine = MinesweeperInferenceEngine(model if model is not None else MinesweeperSolverModel(),
+                                                precision=precision, calibration_inputs=calibration_inputs)
+
+        self._engine = engine
+        self._model = engine.model()
+        self._padded_inference = None
+
+    def _model_input(self, fields):
+        # The fields are vectorized into the buffer which is reused while the shape of the batch stays the same. The
+        # tensor shares the memory with the buffer, so the model input is not copied.
+        input_shape = (fields.shape[0], MinesweeperFieldVectorizer.PLANES) + fields.shape[1:]
+        if self._input_buffer is None or self._input_buffer.shape != input_shape:
+            self._input_buffer = numpy.empty(input_shape, dtype=numpy.float32)
+            self._input_tensor = torch.from_numpy(self._input_buffer)
 
-        self._model.eval()
+        self._vectorizer.vectorize_into(fields, self._input_buffer)
+        return self._input_tensor
 
     def __call__(self, field):
+        model_output = self.predict(field)
+        return self._cell_idx(field, model_output), model_output
+
+    def cells_to_open(self, field, threshold):
+        """
+        Returns the indices of all closed cells with the predicted probability of a mine below the threshold in the
+        order of the probability and the model output. If there is no such cell, the cell with the smallest probability
+        is returned, so one model run opens at least one cell.
+        """
+        model_output = self.predict(field)
+        return cells_below_threshold(field, model_output.numpy(), threshold), model_output
+
+    def solve_batch(self, fields):
+        """
+        Returns the list of the indices of the cells to open and the list of the model outputs for the list of fields of
+        any shapes. All fields are run in one padded batch by the eager float32 model, not by the backend of the engine.
+        Raises RuntimeError if the engine has no model weights or runs another precision, because the predictions of
+        the padded batch would differ from the predictions of the engine.
+        """
+        if self._padded_inference is None:
+            if self._model is None or self._engine.precision() != InferencePrecision.FLOAT32:
+                raise RuntimeError('The fields of different shapes can be solved by the float32 model weights only.')
+            self._padded_inference = PaddedBatchInference(self._model, self._vectorizer)
+
+        model_outputs = self._padded_inference(fields)
+        cells_idx = [self._cell_idx(field, model_output) for field, model_output in zip(fields, model_outputs)]
+        return cells_idx, model_outputs
+
+    def predict(self, field):
+        """
+        Returns the model output for the field, i.e. the predicted probability of a mine for every cell.
+        """
         # The model always accepts batches, therefore, it is necessary to create a batch with a single element to get
         # a prediction.
-        model_input = self._vectorizer(field)
-        model_input = default_collate([model_input])
+        model_input = self._model_input(field[numpy.newaxis])
 
         # The model also returns the prediction as a batch with a single element, therefore, it necessary to change
         # the representation of it.
-        model_output = self._model(model_input)
-        model_output = model_output.view(field.shape)
+        model_output = self._engine(model_input)
+        return model_output.view(field.shape)
 
-        return self._cell_idx(field, model_output), model_output
+    def predict_batch(self, fields):
+        """
+        Returns the model outputs for the batch of fields of one shape, e.g. the array with the shape (N, H, W), the
+        whole batch is run by the engine at once.
+        """
+        return self._engine(self._model_input(fields))
 
     def model(self):
         return self._model
 
+    def engine(self):
+        return self._engine
+
     def vectorizer(self):
         return self._vectorizer
 
+    def cells_idx(self, fields, model_outputs):
+        """
+        Returns the array of the indices of the closed cells with the smallest predicted probability of a mine for the
+        batch of fields and their model outputs, e.g. of predict_batch. The first of the cells is selected if several
+        of them have the same probability, and -1 is returned for the fields without closed cells.
+        """
+        predictions = model_outputs.detach().numpy().reshape(fields.shape)
+        predictions = numpy.where(fields == CellState.CLOSED, predictions, numpy.inf)
+        predictions = predictions.reshape(fields.shape[:-2] + (-1,))
+
+        cells_idx = numpy.argmin(predictions, axis=-1)
+        return numpy.where(numpy.isfinite(numpy.min(predictions, axis=-1)), cells_idx, -1)
+
     def _cell_idx(self, field, model_prediction):
-        next_cell_prediction = None
-        next_cell_index = None
-        with numpy.nditer(model_prediction.detach().numpy(), ['multi_index']) as predictions_it:
-            for value in predictions_it:
-                if field[predictions_it.multi_index] == CellState.CLOSED:
-                    if next_cell_prediction is None or value < next_cell_prediction:
-                        next_cell_prediction = value
-                        next_cell_index = predictions_it.iterindex
-
-        return next_cell_index
+        # Selects the cell as cells_idx for the batch of the single field, but returns None if there is no closed cell.
+        cell_idx = int(self.cells_idx(field[numpy.newaxis], model_prediction)[0])
+        return cell_idx if cell_idx >= 0 else None
+
+
+def cells_below_threshold(field, probabilities, threshold):
+    """
+    Returns the indices of all closed cells of the field with the probability of a mine below the threshold in the order
+    of the probability. If there is no such cell, the closed cell with the smallest probability is returned, and no cell
+    is returned if the field has no closed cells.
+    """
+    probabilities = numpy.where(field == CellState.CLOSED, probabilities, numpy.inf).reshape(-1)
+    cells_idx = numpy.flatnonzero(probabilities < threshold)
+    if len(cells_idx):
+        return cells_idx[numpy.argsort(probabilities[cells_idx], kind='stable')]
+
+    cell_idx = numpy.argmin(probabilities)
+    return numpy.array([cell_idx]) if numpy.isfinite(probabilities[cell_idx]) else cells_idx
@@ -4,94 +4,279 @@ import torch.optim
 import torch.utils.data
 
 from minesweeper_game.game_interface import GameState, CellState
-from minesweeper_game import MinesweeperGame
+from minesweeper_game import BatchedMinesweeperGame, MinesweeperGame
+
+from .augmentation import DihedralTransform, IDENTITY_TRANSFORM
+from .replay_buffer import ReplayBuffer
+from .solver import cells_below_threshold
 
 
 class MinesweeperSolverDataSet(torch.utils.data.Dataset):
-    def __init__(self, fields, predictions, vectorizer):
-        self._fields = fields
-        self._predictions = predictions
+    """
+    This is the data set of the samples of the replay buffer. The fields are kept as the int8 cell states, the data
+    loader gets the whole minibatch by __getitems__, so all its fields are vectorized at once and the separate samples
+    are not collated.
+
+    Every sample is taken with every transform, so the data set has len(transforms) items per sample of the replay
+    buffer, the item idx is the sample idx % len(replay_buffer) with the transform idx // len(replay_buffer).
+    """
+    def __init__(self, replay_buffer, vectorizer, transforms=(IDENTITY_TRANSFORM,)):
+        self._fields = replay_buffer.fields()
+        self._targets = replay_buffer.targets()
         self._vectorizer = vectorizer
+        self._transforms = transforms
 
     def __len__(self):
-        return len(self._fields)
+        return len(self._fields) * len(self._transforms)
 
     def __getitem__(self, idx):
-        return self._vectorizer(self._fields[idx]), self._predictions[idx]
+        fields, targets = self.__getitems__([idx])
+        return fields[0], targets[0]
+
+    def __getitems__(self, idx):
+        samples_idx = numpy.remainder(idx, len(self._fields))
+        transforms_idx = numpy.floor_divide(idx, len(self._fields))
+
+        # The items of every transform are gathered at once and transformed by the view of them.
+        fields = numpy.empty((len(samples_idx),) + self._fields.shape[1:], dtype=self._fields.dtype)
+        targets = numpy.empty((len(samples_idx),) + self._targets.shape[1:], dtype=numpy.float32)
+        for transform_idx, transform in enumerate(self._transforms):
+            batch_idx = numpy.flatnonzero(transforms_idx == transform_idx)
+            if len(batch_idx):
+                fields[batch_idx] = transform(self._fields[samples_idx[batch_idx]])
+                targets[batch_idx] = transform(self._targets[samples_idx[batch_idx]])
+
+        return torch.from_numpy(self._vectorizer.vectorize_batch(fields)), torch.from_numpy(targets)
+
+
+def _minibatch(data):
+    # The minibatch is created by MinesweeperSolverDataSet.__getitems__, so it is passed as it is.
+    return data
 
 
 class MinesweeperSolverTrainer:
-    def __init__(self, game_mode, solver):
+    def __init__(self, game_mode, solver, threshold=None, parallel_games=None, workers=None, rng=None,
+                 replay_capacity=None, data_workers=0, augmentation=False):
+        """
+        If the threshold is specified, all cells with the predicted probability of a mine below it are opened after
+        every model run, otherwise one cell is opened. If the number of parallel games is specified, the games are
+        played in lockstep with one model run for all of them per move, otherwise the games are played one by one. If
+        the number of workers is specified, the games are played by the worker processes of SelfPlayPool. The mines of
+        the games are placed using rng (`numpy.random.Generator`) or the new generator created for the trainer.
+
+        The samples are kept in ReplayBuffer. If the replay capacity is specified, the samples of the previous training
+        iterations are kept in it until they are replaced by the newer ones, otherwise every training iteration uses
+        only its own samples. If the number of data workers is specified, the minibatches are prepared by the worker
+        processes of the data loader ahead of the training steps.
+
+        If the augmentation is enabled, every sample is trained with all rotations and reflections of its field which
+        keep the shape of the field (8 for the square fields and 4 for the rectangular ones), so the games are played
+        only for the corresponding part of the samples of every training iteration.
+        """
         self._game_mode = game_mode
         self._solver = solver
+        self._threshold = threshold
+        self._parallel_games = parallel_games
+        self._workers = workers
+        self._rng = rng if rng is not None else numpy.random.default_rng()
+        self._replay_capacity = replay_capacity
+        self._replay_buffer = None
+        self._data_workers = data_workers
+        self._transforms = DihedralTransform.transforms(game_mode.shape()) if augmentation \
+            else [IDENTITY_TRANSFORM]
         self._optimizer = torch.optim.Adam(self._solver.model().parameters())
         self._loss_fn = torch.nn.BCELoss()
 
+    def replay_buffer(self):
+        return self._replay_buffer
+
     def _log(self, msg):
         print(msg)
 
-    def train(self, trainer_loop_passes, epochs, batches, batch_size):
-        samples_in_epoch = batches * batch_size
+    def _first_cell_idx(self):
+        return numpy.ravel_multi_index((self._game_mode.height() // 2, self._game_mode.width() // 2),
+                                       self._game_mode.shape())
 
-        self._log('Training Iter Idx, Games Played, Games Won, Cells Revealed, Loss')
-        for trainer_loop_pass_idx in range(trainer_loop_passes):
-            games_played = 0
-            games_won = 0
-            cells_revealed = 0
-            batch_field_states = []
-            batch_predictions = []
+    def _cells_to_open(self, fields, model_outputs):
+        # Returns the array of the indices of the cells to open for every field.
+        if self._threshold is None:
+            return [numpy.array([cell_idx] if cell_idx >= 0 else [], dtype=numpy.int64)
+                    for cell_idx in self._solver.cells_idx(fields, model_outputs)]
+        return [cells_below_threshold(field, model_output.numpy(), self._threshold)
+                for field, model_output in zip(fields, model_outputs)]
+
+    @staticmethod
+    def _label(sample, field, cells_idx):
+        # The sample holds the prediction, the opened cells are labelled by their content, the cells after the mine are
+        # not opened and keep the prediction.
+        opened_cells_idx = cells_idx[field.flat[cells_idx] != CellState.CLOSED]
+        sample.flat[opened_cells_idx] = field.flat[opened_cells_idx] == CellState.MINE
+
+    def _samples_arrays(self, samples, fields, predictions):
+        if fields is None:
+            fields = numpy.empty((samples,) + self._game_mode.shape(), dtype=numpy.int8)
+        if predictions is None:
+            predictions = numpy.empty((samples,) + self._game_mode.shape(), dtype=numpy.float32)
+        return fields, predictions
 
-            samples_taken = 0
+    def play_games(self, samples, fields=None, predictions=None):
+        """
+        Plays the games one by one until the number of the positions is equal to samples. Returns the array of the
+        positions, the array of the predictions for them with the opened cells labelled, the number of games played and
+        won and the number of cells revealed. The positions and the predictions are written to the specified arrays of
+        at least samples items, e.g. the shared buffers, or to the new arrays.
+        """
+        fields, predictions = self._samples_arrays(samples, fields, predictions)
+        sample_idx = 0
+        games_played = 0
+        games_won = 0
+        cells_revealed = 0
 
-            self._solver.model().eval()
-            with torch.no_grad():
-                while samples_taken < samples_in_epoch:
-                    games_played += 1
-                    game = MinesweeperGame(self._game_mode)
+        while sample_idx < samples:
+            games_played += 1
+            game = MinesweeperGame(self._game_mode, rng=self._rng)
+            game.open(self._first_cell_idx())
 
-                    first_cell_idx = numpy.ravel_multi_index((game.mode().height() // 2, game.mode().width() // 2),
-                                                             (game.mode().height(), game.mode().width()))
-                    game.open(first_cell_idx)
+            while game.state() == GameState.IN_PROGRESS and sample_idx < samples:
+                field = fields[sample_idx]
+                field[...] = game.field()
+                model_output = self._solver.predict(field)
+                cells_idx = self._cells_to_open(field[numpy.newaxis], model_output[numpy.newaxis])[0]
+                game.open_many(cells_idx)
+                predictions[sample_idx] = model_output.numpy()
+                self._label(predictions[sample_idx], game.field(), cells_idx)
+                sample_idx += 1
 
-                    while game.state() == GameState.IN_PROGRESS and samples_taken < samples_in_epoch:
-                        batch_field_states.append(numpy.copy(game.field()))
-                        cell_idx, prediction = self._solver(game.field())
+            cells_revealed += numpy.sum(game.field() != CellState.CLOSED)
+            if game.state() == GameState.WIN:
+                games_won += 1
 
-                        sample = prediction.detach()
-                        sample[numpy.unravel_index(cell_idx, sample.shape)] = \
-                            1 if game.open(cell_idx) == GameState.GAME_OVER else 0
-                        batch_predictions.append(sample)
+        return fields, predictions, games_played, games_won, cells_revealed
 
-                        samples_taken += 1
+    def play_games_in_lockstep(self, samples, fields=None, predictions=None):
+        """
+        Plays the parallel games in lockstep until the number of the positions is equal to samples, every move of all
+        games is predicted by one model run. A finished game is replaced with a new one right away, so every model run
+        has the full batch. Accepts and returns the same values as play_games.
+        """
+        games = BatchedMinesweeperGame(self._game_mode, self._parallel_games, self._rng)
+        first_cells_idx = numpy.full(games.size(), self._first_cell_idx())
+        games.open(first_cells_idx)
+
+        fields, predictions = self._samples_arrays(samples, fields, predictions)
+        sample_idx = 0
+        games_played = 0
+        games_won = 0
+        cells_revealed = 0
+        # The game of a board is counted when it gives its first sample (or when it is over right after the first cell
+        # is opened), so the games of the boards left out of the last model runs are not counted as by play_games.
+        counted_boards = numpy.zeros(games.size(), dtype=bool)
+
+        while sample_idx < samples:
+            finished_boards = numpy.flatnonzero(games.states() != GameState.IN_PROGRESS)
+            if len(finished_boards):
+                games_won += numpy.count_nonzero(games.states()[finished_boards] == GameState.WIN)
+                cells_revealed += numpy.sum(games.fields()[finished_boards] != CellState.CLOSED)
+                games_played += numpy.count_nonzero(~counted_boards[finished_boards])
+                counted_boards[finished_boards] = False
+                games.reset(finished_boards)
+                games.open(first_cells_idx, finished_boards)
+                continue
+
+            # All games are in progress here, the last model run takes only the games for the rest of the samples.
+            boards = numpy.arange(min(games.size(), samples - sample_idx))
+            games_played += numpy.count_nonzero(~counted_boards[boards])
+            counted_boards[boards] = True
+            board_fields = fields[sample_idx:sample_idx + len(boards)]
+            board_fields[...] = games.fields()[boards]
+            model_outputs = self._solver.predict_batch(board_fields)
+            boards_cells_idx = self._cells_to_open(board_fields, model_outputs)
+
+            # Every board opens its cells one by one and stops at the mine or the win as MinesweeperGame.open_many.
+            cells_idx = numpy.zeros(games.size(), dtype=numpy.int64)
+            for cell_position in range(max(len(board_cells_idx) for board_cells_idx in boards_cells_idx)):
+                moving_boards = [board_idx for board_idx, board_cells_idx in zip(boards, boards_cells_idx)
+                                 if cell_position < len(board_cells_idx)]
+                for board_idx in moving_boards:
+                    cells_idx[board_idx] = boards_cells_idx[board_idx][cell_position]
+                games.open(cells_idx, moving_boards)
+
+            board_predictions = predictions[sample_idx:sample_idx + len(boards)]
+            board_predictions[...] = model_outputs.numpy()
+            for board_idx, board_cells_idx, board_prediction in zip(boards, boards_cells_idx, board_predictions):
+                self._label(board_prediction, games.field(board_idx), board_cells_idx)
+            sample_idx += len(boards)
+
+        games_won += numpy.count_nonzero(games.states()[counted_boards] == GameState.WIN)
+        cells_revealed += numpy.sum(games.fields()[counted_boards] != CellState.CLOSED)
+        return fields, predictions, games_played, games_won, cells_revealed
+
+    def _play(self, samples, fields, predictions):
+        self._solver.model().eval()
+        with torch.no_grad():
+            if self._parallel_games is None:
+                return self.play_games(samples, fields, predictions)
+            return self.play_games_in_lockstep(samples, fields, predictions)
+
+    def train(self, trainer_loop_passes, epochs, batches, batch_size):
+        if self._workers is None:
+            self._train(trainer_loop_passes, epochs, batches, batch_size, self._play)
+            return
+
+        # The pool module imports the trainer to play the games in the workers.
+        from .self_play_pool import SelfPlayPool
+        with SelfPlayPool(self._game_mode, self._solver.model(), self._workers, self._threshold, self._parallel_games,
+                          seed=int(self._rng.integers(2 ** 63))) as pool:
+            self._train(trainer_loop_passes, epochs, batches, batch_size, pool.play)
+
+    def samples_per_move(self):
+        """
+        Returns the number of the training samples created from the position of every move of the games.
+        """
+        return len(self._transforms)
+
+    def _train(self, trainer_loop_passes, epochs, batches, batch_size, play):
+        samples_in_epoch = batches * batch_size
+        # Every position gives the sample per transform, so the games are played for the part of the samples only.
+        positions_in_epoch = -(-samples_in_epoch // self.samples_per_move())
+        self._replay_buffer = ReplayBuffer(self._replay_capacity or positions_in_epoch, self._game_mode.shape(),
+                                           self._rng)
+        # The positions of every training iteration are written to the same arrays and copied to the replay buffer.
+        fields, predictions = self._samples_arrays(positions_in_epoch, None, None)
+
+        self._log(f'Samples per Move: {self.samples_per_move()}')
+        self._log('Training Iter Idx, Games Played, Games Won, Cells Revealed, Loss')
+        for trainer_loop_pass_idx in range(trainer_loop_passes):
+            _, _, games_played, games_won, cells_revealed = play(positions_in_epoch, fields, predictions)
 
-                    cells_revealed += numpy.sum(game.field() != CellState.CLOSED)
-                    if game.state() == GameState.WIN:
-                        games_won += 1
+            if self._replay_capacity is None:
+                self._replay_buffer.clear()
+            self._replay_buffer.add(fields, predictions)
 
-            training_set = MinesweeperSolverDataSet(batch_field_states, batch_predictions, self._solver.vectorizer())
-            training_loader = torch.utils.data.DataLoader(training_set, batch_size=batch_size)
+            training_set = MinesweeperSolverDataSet(self._replay_buffer, self._solver.vectorizer(), self._transforms)
+            batches_idx = self._replay_buffer.batches_idx(batch_size, epochs * batches, len(self._transforms))
+            training_loader = torch.utils.data.DataLoader(training_set, batch_sampler=list(batches_idx),
+                                                          collate_fn=_minibatch, num_workers=self._data_workers)
 
             running_loss = 0.
 
             self._solver.model().train()
-            for epoch_idx in range(epochs):
-                for batch_idx, data in enumerate(training_loader):
-                    # Every data instance is a field + expected prediction
-                    field, expected_prediction = data
+            for field, expected_prediction in training_loader:
+                # Every batch is the fields vectorized at once + expected predictions
 
-                    # Zero your gradients for every batch!
-                    self._optimizer.zero_grad()
+                # Zero your gradients for every batch!
+                self._optimizer.zero_grad()
 
-                    # Make predictions for this batch
-                    model_prediction = self._solver.model()(field)
+                # Make predictions for this batch
+                model_prediction = self._solver.model()(field)
 
-                    # Compute the loss and its gradients
-                    loss = self._loss_fn(model_prediction, expected_prediction)
-                    running_loss += loss.item() * field.size(0)
-                    loss.backward()
+                # Compute the loss and its gradients
+                loss = self._loss_fn(model_prediction, expected_prediction)
+                running_loss += loss.item() * field.size(0)
+                loss.backward()
 
-                    # Adjust learning weights
-                    self._optimizer.step()
+                # Adjust learning weights
+                self._optimizer.step()
 
             running_loss /= epochs * batches * batch_size
             self._log(f'{trainer_loop_pass_idx}, {games_played}, {games_won}, {cells_revealed}, {running_loss}')
@@ -0,0 +1,37 @@
+import numpy
+import unittest
+
+from minesweeper_game.field_generation import create_field_from_mines
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import CellState, Mode
+
+from ..augmentation import DihedralTransform, IDENTITY_TRANSFORM
+
+
+class TestDihedralTransform(unittest.TestCase):
+    def test_transforms(self):
+        fields = numpy.arange(2 * 5 * 5).reshape(2, 5, 5)
+        transformed_fields = [transform(fields) for transform in DihedralTransform.transforms((5, 5))]
+        self.assertEqual(len(transformed_fields), 8)
+        self.assertTrue(numpy.array_equal(transformed_fields[0], fields))
+        self.assertEqual(len({transformed_field.tobytes() for transformed_field in transformed_fields}), 8)
+        # The transforms return the views of the fields.
+        self.assertTrue(all(numpy.shares_memory(transformed_field, fields) for transformed_field in transformed_fields))
+        self.assertIs(IDENTITY_TRANSFORM(fields), fields)
+
+        transforms = DihedralTransform.transforms(Mode.EXPERT.shape())
+        self.assertEqual(len(transforms), 4)
+        self.assertTrue(all(transform(numpy.zeros(Mode.EXPERT.shape())).shape == Mode.EXPERT.shape()
+                            for transform in transforms))
+
+    def test_game_invariance(self):
+        # The transformed field is the field of the transformed mines.
+        game = MinesweeperGame(Mode.MEDIUM, rng=numpy.random.default_rng(0))
+        game.open(0)
+        mines = game._field == CellState.MINE
+        for transform in DihedralTransform.transforms(Mode.MEDIUM.shape()):
+            self.assertTrue(numpy.array_equal(transform(game._field), create_field_from_mines(transform(mines))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import numpy
+import unittest
+
+from minesweeper_game.game_interface import Mode
+
+from ..evaluation import compare_win_rates, self_play_fields, threshold_sweep, win_rate
+from ..hybrid_solver import HybridSolver
+from ..solver import MinesweeperSolver
+
+
+class TestEvaluation(unittest.TestCase):
+    def test_self_play_fields(self):
+        solver = MinesweeperSolver()
+        fields = self_play_fields(solver, Mode.EASY, 50, seed=1)
+        self.assertEqual(fields.shape, (50,) + Mode.EASY.shape())
+        self.assertTrue(numpy.array_equal(fields, self_play_fields(solver, Mode.EASY, 50, seed=1)))
+
+    def test_compare_win_rates(self):
+        solver = MinesweeperSolver()
+        seeds = range(10)
+        self.assertEqual(win_rate(solver, Mode.EASY, seeds), win_rate(solver, Mode.EASY, seeds))
+
+        reference_win_rate, solver_win_rate, passed = compare_win_rates(solver, solver, Mode.EASY, seeds, 0)
+        self.assertEqual(reference_win_rate, solver_win_rate)
+        self.assertTrue(passed)
+
+    def test_threshold_sweep(self):
+        solver = MinesweeperSolver()
+        seeds = range(10)
+        results = threshold_sweep(solver, Mode.EASY, seeds, [0, 0.5, 1])
+        self.assertEqual([threshold for threshold, _, _ in results], [0, 0.5, 1])
+        self.assertEqual(results[0][1], win_rate(solver, Mode.EASY, seeds))
+
+        # All closed cells are opened after the first model run if the threshold is 1.
+        self.assertEqual(results[2][1:], (0, 1))
+        self.assertLessEqual(results[1][2], results[0][2])
+
+        hybrid_results = threshold_sweep(HybridSolver(solver), Mode.EASY, seeds, [0])
+        self.assertEqual(hybrid_results[0][1], win_rate(HybridSolver(solver), Mode.EASY, seeds))
+
+
+if __name__ == '__main__':
+    unittest.main()
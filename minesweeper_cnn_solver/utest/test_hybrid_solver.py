@@ -0,0 +1,49 @@
+import numpy
+import unittest
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import CellState, GameState, Mode
+
+from ..hybrid_solver import HybridSolver, find_safe_cells_and_mines
+
+
+class TestHybridSolver(unittest.TestCase):
+    def test_single_cell_rule(self):
+        field = numpy.array([[-1, -1, -1],
+                             [2, 3, 2]], dtype=numpy.int8)
+        safe_cells, mines = find_safe_cells_and_mines(field)
+        self.assertFalse(safe_cells.any())
+        self.assertTrue(numpy.array_equal(mines, field == CellState.CLOSED))
+
+    def test_subset_rule(self):
+        # The closed neighbours of the left cell are the subset of the closed neighbours of the middle cell, so the
+        # top right cell is safe. The same is true for the right cell and the top left cell.
+        field = numpy.array([[-1, -1, -1],
+                             [1, 1, 1]], dtype=numpy.int8)
+        safe_cells, mines = find_safe_cells_and_mines(field)
+        self.assertTrue(numpy.array_equal(safe_cells, [[True, False, True], [False, False, False]]))
+        self.assertTrue(numpy.array_equal(mines, [[False, True, False], [False, False, False]]))
+
+    def test_play(self):
+        solver = HybridSolver()
+        moves = 0
+        for seed in range(10):
+            game = MinesweeperGame(Mode.CLASSIC, rng=numpy.random.default_rng(seed))
+            cell_idx = 0
+            while game.open(cell_idx) == GameState.IN_PROGRESS:
+                safe_cells, mines = find_safe_cells_and_mines(game.field())
+                self.assertFalse((game._field[safe_cells] == CellState.MINE).any())
+                self.assertTrue((game._field[mines] == CellState.MINE).all())
+
+                cell_idx, model_output = solver(game.field())
+                moves += 1
+                self.assertEqual(game.field().flat[cell_idx], CellState.CLOSED)
+                if model_output is None:
+                    self.assertNotEqual(game._field.flat[cell_idx], CellState.MINE)
+                    self.assertIn(cell_idx, solver.safe_cells(game.field()))
+
+        self.assertLess(solver.forward_passes(), moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+_ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _imports_torch(code):
+    # The code is run by the new interpreter, because torch may be already imported by other tests.
+    result = subprocess.run([sys.executable, '-c', code + '\nimport sys\nprint("torch" in sys.modules)'],
+                            cwd=_ROOT_DIRECTORY, capture_output=True, text=True, check=True)
+    return result.stdout.splitlines()[-1] == 'True'
+
+
+class TestImports(unittest.TestCase):
+    def test_lazy_imports(self):
+        self.assertFalse(_imports_torch('import minesweeper_cnn_solver'))
+        self.assertFalse(_imports_torch('from minesweeper_cnn_solver import MinesweeperFieldVectorizer, '
+                                        'InferenceBackend, InferencePrecision'))
+        self.assertFalse(_imports_torch('import runpy, sys\n'
+                                        'sys.argv = ["play_minesweeper.py", "--help"]\n'
+                                        'try:\n'
+                                        '    runpy.run_path("play_minesweeper.py", run_name="__main__")\n'
+                                        'except SystemExit:\n'
+                                        '    pass'))
+        self.assertTrue(_imports_torch('from minesweeper_cnn_solver import MinesweeperSolver'))
+
+    def test_public_names(self):
+        import minesweeper_cnn_solver
+        for name in minesweeper_cnn_solver.__all__:
+            self.assertIn(name, dir(minesweeper_cnn_solver))
+            self.assertEqual(getattr(minesweeper_cnn_solver, name).__name__, name)
+
+        with self.assertRaises(AttributeError):
+            minesweeper_cnn_solver.MissingName
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import numpy
+import torch
+import unittest
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import GameState, Mode
+
+from ..incremental_inference import IncrementalInference
+from ..model import MinesweeperSolverModel
+from ..solver import MinesweeperSolver
+
+
+class TestIncrementalInference(unittest.TestCase):
+    def test_play(self):
+        model = MinesweeperSolverModel()
+        incremental_inference = IncrementalInference(model, tile_size=4)
+        solver = MinesweeperSolver(engine=incremental_inference)
+        mode = Mode(13, 10, 12)
+
+        for seed in range(3):
+            game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+            cell_idx = 0
+            while game.open(cell_idx) == GameState.IN_PROGRESS:
+                cell_idx, model_output = solver(game.field())
+
+                model_input = torch.from_numpy(solver.vectorizer()(game.field()))[numpy.newaxis]
+                expected_output = IncrementalInference(model, tile_size=4)(model_input)[0]
+                self.assertTrue(torch.equal(model_output, expected_output))
+                with torch.no_grad():
+                    self.assertTrue(torch.allclose(model_output, model(model_input)[0], atol=1e-6))
+
+    def test_computed_tiles(self):
+        incremental_inference = IncrementalInference(MinesweeperSolverModel(), tile_size=4)
+        model_input = torch.rand(1, 11, 24, 24)
+        output = incremental_inference(model_input)
+        self.assertEqual(incremental_inference.computed_tiles(), 6 * 6 * 6)
+
+        self.assertTrue(torch.equal(incremental_inference(model_input), output))
+        self.assertEqual(incremental_inference.computed_tiles(), 6 * 6 * 6)
+
+        # The change of the corner cell reaches 2 x 2 cells of the first layer output, 3 x 3 cells of the second one and
+        # so on up to 6 x 6 cells of the fifth and the last layers, so 1 tile of the first three layers and 2 x 2 tiles
+        # of the rest are recomputed.
+        model_input[0, :, 0, 0] = 0
+        incremental_inference(model_input)
+        self.assertEqual(incremental_inference.computed_tiles(), 6 * 6 * 6 + 3 * 1 + 3 * 2 * 2)
+
+        with self.assertRaises(ValueError):
+            incremental_inference(torch.rand(2, 11, 9, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
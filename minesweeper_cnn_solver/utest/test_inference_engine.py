@@ -0,0 +1,56 @@
+import os
+import tempfile
+import torch
+import unittest
+
+from ..inference_engine import MinesweeperInferenceEngine, InferenceBackend
+from ..model import MinesweeperSolverModel
+
+
+class TestMinesweeperInferenceEngine(unittest.TestCase):
+    def test_backends(self):
+        model = MinesweeperSolverModel()
+        model_input = torch.rand(2, 11, 9, 9)
+        with torch.no_grad():
+            expected_output = model(model_input)
+
+        for backend in (InferenceBackend.EAGER, InferenceBackend.TORCHSCRIPT):
+            for channels_last in (False, True):
+                engine = MinesweeperInferenceEngine(model, backend, channels_last)
+                self.assertIs(engine.model(), model)
+                self.assertTrue(torch.allclose(engine(model_input), expected_output, atol=1e-6))
+
+        # The engines convert the copies of the model, so neither its mode nor the memory format of its weights change.
+        self.assertTrue(model.training)
+        self.assertTrue(all(parameter.is_contiguous() for parameter in model.parameters()))
+
+    def test_save_and_load(self):
+        model = MinesweeperSolverModel()
+        model_input = torch.rand(1, 11, 16, 30)
+        with torch.no_grad():
+            expected_output = model(model_input)
+
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = os.path.join(directory, 'model.pt')
+            model.save(model_path)
+            self.assertFalse(MinesweeperInferenceEngine.is_torchscript_file(model_path))
+
+            engine_path = os.path.join(directory, 'engine.pt')
+            MinesweeperInferenceEngine(model, InferenceBackend.TORCHSCRIPT).save(engine_path)
+            self.assertTrue(MinesweeperInferenceEngine.is_torchscript_file(engine_path))
+
+            for path in (model_path, engine_path):
+                engine = MinesweeperInferenceEngine.fromfile(path)
+                self.assertTrue(torch.allclose(engine(model_input), expected_output, atol=1e-6))
+
+            self.assertIsNone(MinesweeperInferenceEngine.fromfile(engine_path).model())
+
+            engine = MinesweeperInferenceEngine.fromfile(model_path, mmap=True)
+            self.assertTrue(torch.allclose(engine(model_input), expected_output, atol=1e-6))
+
+            with self.assertRaises(RuntimeError):
+                MinesweeperInferenceEngine(model).save(engine_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
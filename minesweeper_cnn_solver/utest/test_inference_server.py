@@ -0,0 +1,141 @@
+import asyncio
+import numpy
+import os
+import tempfile
+import unittest
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import Mode
+
+from ..inference_engine import MinesweeperInferenceEngine
+from ..inference_options import InferenceBackend, InferencePrecision
+from ..inference_server import InferenceClient, InferenceServer
+from ..solver import MinesweeperSolver
+
+
+def _fields(mode, count):
+    fields = []
+    for seed in range(count):
+        game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+        game.open(0)
+        fields.append(game.field())
+    return fields
+
+
+class TestInferenceServer(unittest.TestCase):
+    def test_solve(self):
+        solver = MinesweeperSolver()
+        fields = _fields(Mode.EASY, 6) + _fields(Mode.EXPERT, 5)
+
+        async def solve_all():
+            server = InferenceServer(solver, max_batch_size=4, max_wait_time=0.1)
+            results = await asyncio.gather(*(server.solve(field) for field in fields))
+            await server.close()
+            return server, results
+
+        server, results = asyncio.run(solve_all())
+        for field, (cell_idx, model_output) in zip(fields, results):
+            expected_cell_idx, expected_output = solver(field)
+            self.assertEqual(cell_idx, expected_cell_idx)
+            self.assertTrue(numpy.allclose(model_output, expected_output.numpy(), atol=1e-6))
+
+        # Every shape has its own queue, so the fields of different shapes are never in the same batch.
+        self.assertEqual(server.batch_sizes(), {4: 2, 2: 1, 1: 1})
+
+    def test_mixed_shapes(self):
+        solver = MinesweeperSolver()
+        fields = _fields(Mode.EASY, 3) + _fields(Mode.EXPERT, 2)
+
+        async def solve_all():
+            server = InferenceServer(solver, max_batch_size=8, max_wait_time=0.1, mixed_shapes=True)
+            results = await asyncio.gather(*(server.solve(field) for field in fields))
+            await server.close()
+            return server, results
+
+        server, results = asyncio.run(solve_all())
+        for field, (cell_idx, model_output) in zip(fields, results):
+            expected_cell_idx, expected_output = solver(field)
+            self.assertEqual(cell_idx, expected_cell_idx)
+            self.assertTrue(numpy.allclose(model_output, expected_output.numpy(), atol=1e-6))
+
+        self.assertEqual(server.batch_sizes(), {5: 1})
+
+    def test_tcp_endpoint(self):
+        solver = MinesweeperSolver()
+        fields = _fields(Mode.CLASSIC, 3)
+
+        async def solve_all():
+            server = InferenceServer(solver)
+            tcp_server = await server.start_server()
+            port = tcp_server.sockets[0].getsockname()[1]
+
+            client = await InferenceClient.connect('127.0.0.1', port)
+            cells_idx = [await client.solve(field) for field in fields]
+            with self.assertRaises(ValueError):
+                await client.solve(numpy.zeros(3, dtype=numpy.int8))
+            await client.close()
+
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            await server.close()
+            return cells_idx
+
+        cells_idx = asyncio.run(solve_all())
+        self.assertEqual(cells_idx, [solver(field)[0] for field in fields])
+
+    def test_invalid_requests(self):
+        solver = MinesweeperSolver()
+        field = _fields(Mode.CLASSIC, 1)[0]
+        invalid_fields = [numpy.zeros((1, 0), dtype=numpy.int8), numpy.full((3, 3), 200), numpy.full((3, 3), -5),
+                          numpy.zeros(3, dtype=numpy.int8), numpy.zeros((3, 3), dtype=float)]
+
+        async def solve_all():
+            server = InferenceServer(solver)
+            tcp_server = await server.start_server()
+            port = tcp_server.sockets[0].getsockname()[1]
+
+            # Every invalid request is answered by the error and the next valid request is answered as usual.
+            client = await InferenceClient.connect('127.0.0.1', port)
+            for invalid_field in invalid_fields:
+                with self.assertRaises(ValueError):
+                    await client.solve(invalid_field)
+                self.assertEqual(await client.solve(field), solver(field)[0])
+            await client.close()
+
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            await server.close()
+
+        asyncio.run(solve_all())
+
+    def test_close(self):
+        field = _fields(Mode.CLASSIC, 1)[0]
+
+        async def solve_and_close():
+            # The request waits for the batch to fill, but the server is closed before the batch is run.
+            server = InferenceServer(MinesweeperSolver(), max_wait_time=60)
+            request = asyncio.get_running_loop().create_task(server.solve(field))
+            await asyncio.sleep(0.01)
+            await server.close()
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(request, 5)
+
+        asyncio.run(solve_and_close())
+
+    def test_mixed_shapes_without_model(self):
+        with tempfile.TemporaryDirectory() as directory:
+            engine_path = os.path.join(directory, 'engine.pt')
+            MinesweeperInferenceEngine(MinesweeperSolver().model(), InferenceBackend.TORCHSCRIPT).save(engine_path)
+            solver = MinesweeperSolver(engine=MinesweeperInferenceEngine.fromfile(engine_path))
+
+        InferenceServer(solver)
+        with self.assertRaises(ValueError):
+            InferenceServer(solver, mixed_shapes=True)
+
+        # The padded batches are run by the float32 model, so they would not have the predictions of the engine.
+        with self.assertRaises(ValueError):
+            InferenceServer(MinesweeperSolver(precision=InferencePrecision.BFLOAT16), mixed_shapes=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
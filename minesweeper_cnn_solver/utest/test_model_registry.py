@@ -0,0 +1,56 @@
+import os
+import tempfile
+import torch
+import unittest
+
+from minesweeper_game.game_interface import Mode
+
+from ..model import MinesweeperSolverModel
+from ..model_registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_standard_modes(self):
+        registry = ModelRegistry('models')
+        self.assertIn(Mode.EXPERT, registry)
+        self.assertEqual(registry.path(Mode.EXPERT), os.path.join('models', 'expert_minesweeper_model.pt'))
+        self.assertNotIn(Mode(10, 10, 10), registry)
+        with self.assertRaises(ValueError):
+            registry.path(Mode(10, 10, 10))
+
+    def test_lazy_loading(self):
+        modes = [Mode(10, 10, 10), Mode(20, 10, 30), Mode(10, 20, 30)]
+        with tempfile.TemporaryDirectory() as directory:
+            registry = ModelRegistry(directory, max_loaded_models=2)
+            models = []
+            for mode_idx, mode in enumerate(modes):
+                models.append(MinesweeperSolverModel())
+                path = os.path.join(directory, f'{mode_idx}.pt')
+                models[-1].save(path)
+                registry.register(mode, path)
+            self.assertEqual(registry.loaded_modes(), [])
+
+            model = registry.model(modes[0])
+            self.assertIs(registry.model(modes[0]), model)
+            model_input = torch.rand(1, 11, 10, 10)
+            with torch.no_grad():
+                self.assertTrue(torch.equal(model(model_input), models[0](model_input)))
+
+            # The least recently used model is released when the third model is loaded.
+            registry.model(modes[1])
+            registry.model(modes[0])
+            registry.model(modes[2])
+            self.assertEqual(registry.loaded_modes(), [modes[0], modes[2]])
+            registry.model(modes[1])
+            self.assertEqual(registry.loaded_modes(), [modes[2], modes[1]])
+
+            # Registering a new checkpoint releases the model loaded from the previous one.
+            registry.register(modes[2], os.path.join(directory, '0.pt'))
+            self.assertEqual(registry.loaded_modes(), [modes[1]])
+
+            # The memory-mapped checkpoints are released before the directory is removed.
+            del model, registry
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import numpy
+import torch
+import unittest
+
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import Mode
+
+from ..inference_options import InferencePrecision
+from ..model import MinesweeperSolverModel
+from ..padded_batch import PaddedBatchInference, pad_fields
+from ..solver import MinesweeperSolver
+
+
+def _fields(modes):
+    fields = []
+    for seed, mode in enumerate(modes):
+        game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+        game.open(mode.width() * mode.height() - 1)
+        fields.append(game.field())
+    return fields
+
+
+class TestPaddedBatchInference(unittest.TestCase):
+    def test_outputs(self):
+        model = MinesweeperSolverModel()
+        solver = MinesweeperSolver(model)
+        fields = _fields([Mode.CLASSIC, Mode.EXPERT, Mode.EASY, Mode(7, 5, 4), Mode.MEDIUM])
+
+        model_outputs = PaddedBatchInference(model)(fields)
+        for field, model_output in zip(fields, model_outputs):
+            self.assertEqual(model_output.shape, field.shape)
+            _, expected_output = solver(field)
+            self.assertTrue(torch.allclose(model_output, expected_output, atol=1e-6))
+
+        # Without the mask the padding changes the outputs near the edges of the smaller fields.
+        padded_fields, _ = pad_fields(fields)
+        with torch.no_grad():
+            unmasked_output = model(torch.from_numpy(solver.vectorizer().vectorize_batch(padded_fields)))
+        self.assertFalse(torch.allclose(unmasked_output[0, :8, :8], model_outputs[0], atol=1e-6))
+
+    def test_solve_batch(self):
+        solver = MinesweeperSolver()
+        fields = _fields([Mode.EASY, Mode.CLASSIC, Mode(12, 3, 5)])
+
+        cells_idx, _ = solver.solve_batch(fields)
+        self.assertEqual(cells_idx, [solver(field)[0] for field in fields])
+
+        with self.assertRaises(RuntimeError):
+            MinesweeperSolver(precision=InferencePrecision.BFLOAT16).solve_batch(fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
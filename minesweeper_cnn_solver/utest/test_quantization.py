@@ -0,0 +1,50 @@
+import torch
+import unittest
+
+from minesweeper_game.game_interface import CellState, Mode
+
+from ..evaluation import self_play_fields
+from ..inference_engine import MinesweeperInferenceEngine
+from ..inference_options import InferenceBackend, InferencePrecision
+from ..model import MinesweeperSolverModel
+from ..solver import MinesweeperSolver
+
+
+class TestQuantization(unittest.TestCase):
+    def test_reduced_precision(self):
+        torch.manual_seed(0)
+        model = MinesweeperSolverModel()
+        solver = MinesweeperSolver(model)
+        fields = self_play_fields(solver, Mode.EASY, 64, seed=0)
+        model_input = torch.from_numpy(solver.vectorizer().vectorize_batch(fields))
+        with torch.no_grad():
+            expected_output = model(model_input)
+
+        for backend in (InferenceBackend.EAGER, InferenceBackend.TORCHSCRIPT):
+            for precision in (InferencePrecision.BFLOAT16, InferencePrecision.INT8):
+                engine = MinesweeperInferenceEngine(model, backend, precision=precision,
+                                                    calibration_inputs=model_input)
+                self.assertEqual(engine.precision(), precision)
+
+                output = engine(model_input)
+                self.assertEqual(output.dtype, torch.float32)
+                self.assertTrue(torch.allclose(output, expected_output, atol=0.02))
+
+        with torch.no_grad():
+            self.assertTrue(torch.equal(model(model_input), expected_output))
+
+        with self.assertRaises(ValueError):
+            MinesweeperInferenceEngine(model, precision=InferencePrecision.INT8)
+
+    def test_solver_precision(self):
+        model = MinesweeperSolverModel()
+        fields = self_play_fields(MinesweeperSolver(model), Mode.EASY, 16, seed=0)
+        solver = MinesweeperSolver(model, precision=InferencePrecision.INT8, calibration_fields=fields)
+        self.assertEqual(solver.engine().precision(), InferencePrecision.INT8)
+
+        cell_idx, _ = solver(fields[-1])
+        self.assertEqual(fields[-1].flat[cell_idx], CellState.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import numpy
+import unittest
+
+from ..replay_buffer import ReplayBuffer
+
+
+def _samples(first_idx, count):
+    # The sample is identified by the value of all its cells.
+    values = numpy.arange(first_idx, first_idx + count)[:, numpy.newaxis, numpy.newaxis]
+    return numpy.broadcast_to(values, (count, 2, 3)).astype(numpy.int8), \
+        numpy.broadcast_to(values / 100, (count, 2, 3))
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def check_samples(self, buffer, expected_idx):
+        fields, targets = next(buffer.batches(len(buffer), 1))
+        self.assertEqual(fields.dtype, numpy.int8)
+        self.assertEqual(targets.dtype, numpy.float16)
+        self.assertTrue(fields.flags.c_contiguous and targets.flags.c_contiguous)
+        self.assertEqual(sorted(fields[:, 0, 0]), sorted(expected_idx))
+        self.assertTrue(numpy.allclose(targets, fields / 100, atol=1e-3))
+
+    def test_fifo_eviction(self):
+        buffer = ReplayBuffer(10, (2, 3))
+        nbytes = buffer.nbytes()
+
+        buffer.add(*_samples(0, 4))
+        self.assertEqual(len(buffer), 4)
+        self.check_samples(buffer, range(4))
+
+        buffer.add(*_samples(4, 8))
+        self.assertEqual(len(buffer), 10)
+        self.check_samples(buffer, range(2, 12))
+
+        buffer.add(*_samples(12, 25))
+        self.assertEqual(len(buffer), 10)
+        self.check_samples(buffer, range(27, 37))
+        self.assertEqual(buffer.nbytes(), nbytes)
+
+        buffer.clear()
+        buffer.add(*_samples(40, 1))
+        self.check_samples(buffer, [40])
+
+        with self.assertRaises(ValueError):
+            buffer.add(numpy.zeros((1, 3, 2), dtype=numpy.int8), numpy.zeros((1, 3, 2)))
+
+    def test_batches(self):
+        buffer = ReplayBuffer(10, (2, 3), rng=numpy.random.default_rng(0))
+        with self.assertRaises(RuntimeError):
+            next(buffer.batches(4, 1))
+
+        # Every sample is taken once before any sample is taken again.
+        buffer.add(*_samples(0, 10))
+        batches = list(buffer.batches(4, 5))
+        self.assertEqual([len(fields) for fields, _ in batches], [4] * 5)
+        taken_idx = numpy.concatenate([fields[:, 0, 0] for fields, _ in batches])
+        self.assertEqual(len(set(taken_idx[:8])), 8)
+        self.assertTrue(numpy.all(numpy.bincount(taken_idx) == 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
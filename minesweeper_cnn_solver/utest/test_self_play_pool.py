@@ -0,0 +1,61 @@
+import numpy
+import torch
+import unittest
+
+from minesweeper_game.game_interface import Mode
+
+from ..model import MinesweeperSolverModel
+from ..self_play_pool import SelfPlayPool
+from ..solver import MinesweeperSolver
+from ..trainer import MinesweeperSolverTrainer
+
+
+class TestSelfPlayPool(unittest.TestCase):
+    def test_play(self):
+        model = MinesweeperSolverModel()
+        with SelfPlayPool(Mode.CLASSIC, model, workers=2, parallel_games=4, seed=7) as pool:
+            fields, predictions, games_played, games_won, cells_revealed = pool.play(41)
+
+            # Every worker plays the games of the trainer with its own generator spawned from the seed, the first
+            # worker collects the first half of the samples and one more.
+            worker_samples = []
+            for seed_sequence, samples in zip(numpy.random.SeedSequence(7).spawn(2), (21, 20)):
+                trainer = MinesweeperSolverTrainer(Mode.CLASSIC, MinesweeperSolver(model), parallel_games=4,
+                                                   rng=numpy.random.default_rng(seed_sequence))
+                with torch.no_grad():
+                    worker_samples.append(trainer.play_games_in_lockstep(samples))
+
+            self.assertEqual(len(fields), 41)
+            self.assertEqual(len(predictions), 41)
+            for field, expected_field in zip(fields, numpy.concatenate((worker_samples[0][0], worker_samples[1][0]))):
+                self.assertTrue(numpy.array_equal(field, expected_field))
+            for prediction, expected_prediction in zip(
+                    predictions, numpy.concatenate((worker_samples[0][1], worker_samples[1][1]))):
+                self.assertTrue(numpy.allclose(prediction, expected_prediction, atol=1e-6))
+            self.assertEqual(games_played, worker_samples[0][2] + worker_samples[1][2])
+            self.assertEqual(games_won, worker_samples[0][3] + worker_samples[1][3])
+            self.assertEqual(cells_revealed, worker_samples[0][4] + worker_samples[1][4])
+
+            # The new weights of the model are broadcast to the workers before the next games, only the opened mines are
+            # labelled by one.
+            with torch.no_grad():
+                model._model[-2].bias.fill_(-100)
+            _, predictions, _, _, _ = pool.play(10)
+            self.assertTrue(numpy.all((predictions < 1e-6) | (predictions == 1)))
+
+    def test_close_after_crash(self):
+        pool = SelfPlayPool(Mode.CLASSIC, MinesweeperSolverModel(), workers=2)
+        pool._processes[0].kill()
+        pool._processes[0].join()
+
+        # The command cannot be sent to the killed worker, the other worker is stopped as usual.
+        pool.close()
+        self.assertEqual(pool.workers(), 0)
+
+    def test_workers(self):
+        with self.assertRaises(ValueError):
+            SelfPlayPool(Mode.CLASSIC, MinesweeperSolverModel(), workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import numpy
+import torch
+import unittest
+
+from minesweeper_game.game_interface import CellState
+from ..solver import MinesweeperSolver, cells_below_threshold
+
+
+class TestMinesweeperSolver(unittest.TestCase):
+    def test_cell_idx(self):
+        solver = MinesweeperSolver()
+
+        sc, sn, s1 = CellState.CLOSED, CellState.NO_MINES_NEARBY, CellState.ONE_MINE_NEARBY
+        field = numpy.array([[sn, s1, sc],
+                             [s1, sc, sc],
+                             [sc, sc, sc]], dtype=numpy.int8)
+        prediction = torch.tensor([[0.0, 0.1, 0.5],
+                                   [0.1, 0.2, 0.3],
+                                   [0.2, 0.9, 0.4]])
+        self.assertEqual(solver._cell_idx(field, prediction), 4)
+
+        # The first cell is selected if several cells have the same prediction.
+        prediction[2, 0] = 0.1
+        prediction[1, 2] = 0.1
+        self.assertEqual(solver._cell_idx(field, prediction), 5)
+
+        self.assertIsNone(solver._cell_idx(numpy.zeros((3, 3), dtype=numpy.int8), prediction))
+
+    def test_batch_cell_idx(self):
+        solver = MinesweeperSolver()
+
+        fields = numpy.full((3, 4, 5), CellState.CLOSED, dtype=numpy.int8)
+        fields[1, 0, :] = CellState.NO_MINES_NEARBY
+        fields[2] = CellState.NO_MINES_NEARBY
+        predictions = torch.rand(3, 4, 5)
+        predictions[1, 0, 0] = -1.
+
+        cells_idx = solver.cells_idx(fields, predictions)
+        self.assertEqual(cells_idx.shape, (3,))
+        for field, prediction, cell_idx in zip(fields[:2], predictions[:2], cells_idx[:2]):
+            self.assertEqual(solver._cell_idx(field, prediction), cell_idx)
+
+        # The field without closed cells has no cell to open.
+        self.assertIsNone(solver._cell_idx(fields[2], predictions[2]))
+        self.assertEqual(cells_idx[2], -1)
+
+    def test_predict_batch(self):
+        solver = MinesweeperSolver()
+
+        fields = numpy.full((3, 4, 5), CellState.CLOSED, dtype=numpy.int8)
+        fields[1, :2, :] = CellState.NO_MINES_NEARBY
+        model_outputs = solver.predict_batch(fields)
+        self.assertEqual(model_outputs.shape, (3, 4, 5))
+        for field, model_output in zip(fields, model_outputs):
+            self.assertTrue(torch.allclose(solver.predict(field), model_output, atol=1e-6))
+
+    def test_cells_to_open(self):
+        sc, sn, s1 = CellState.CLOSED, CellState.NO_MINES_NEARBY, CellState.ONE_MINE_NEARBY
+        field = numpy.array([[sn, s1, sc],
+                             [s1, sc, sc],
+                             [sc, sc, sc]], dtype=numpy.int8)
+        prediction = numpy.array([[0.0, 0.1, 0.5],
+                                  [0.1, 0.2, 0.3],
+                                  [0.2, 0.05, 0.4]])
+        self.assertEqual(cells_below_threshold(field, prediction, 0.35).tolist(), [7, 4, 6, 5])
+        self.assertEqual(cells_below_threshold(field, prediction, 0.01).tolist(), [7])
+        self.assertEqual(cells_below_threshold(numpy.zeros((3, 3), dtype=numpy.int8), prediction, 0.5).tolist(), [])
+
+        solver = MinesweeperSolver()
+        field = numpy.full((9, 9), CellState.CLOSED, dtype=numpy.int8)
+        field[:3, :3] = CellState.NO_MINES_NEARBY
+        cells_idx, model_output = solver.cells_to_open(field, 1.)
+        self.assertEqual(sorted(cells_idx), numpy.flatnonzero(field == CellState.CLOSED).tolist())
+        self.assertTrue(numpy.all(numpy.diff(model_output.numpy().flat[cells_idx]) >= 0))
+        self.assertEqual(cells_idx[0], solver(field)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import numpy
+import torch
+import unittest
+
+from minesweeper_game.game_interface import CellState, Mode
+
+from ..augmentation import DihedralTransform
+from ..replay_buffer import ReplayBuffer
+from ..solver import MinesweeperSolver
+from ..trainer import MinesweeperSolverDataSet, MinesweeperSolverTrainer
+from ..vectorizer import MinesweeperFieldVectorizer
+
+
+class TestMinesweeperSolverTrainer(unittest.TestCase):
+    def check_samples(self, trainer, solver, fields, predictions):
+        # Every sample is the prediction of the model for the position alone with the opened cells labelled.
+        for field, prediction in zip(fields, predictions):
+            with torch.no_grad():
+                model_output = solver.predict(field)
+            cells_idx = trainer._cells_to_open(field[numpy.newaxis], model_output[numpy.newaxis])[0]
+
+            not_opened_cells = numpy.ones(field.size, dtype=bool)
+            not_opened_cells[cells_idx] = False
+            self.assertTrue(numpy.allclose(prediction.reshape(-1)[not_opened_cells],
+                                           model_output.numpy().reshape(-1)[not_opened_cells], atol=1e-6))
+
+            labels = prediction.reshape(-1)[cells_idx]
+            labelled = (labels == 0) | (labels == 1)
+            # The cells are opened in order until the mine, so the labelled cells are the prefix of the cells to open.
+            labelled_count = int(labelled.sum())
+            self.assertGreater(labelled_count, 0)
+            self.assertTrue(numpy.all(labelled[:labelled_count]))
+            self.assertTrue(numpy.all(labels[:labelled_count - 1] == 0))
+
+    def test_play_games_in_lockstep(self):
+        for threshold in (None, 0.1):
+            solver = MinesweeperSolver()
+            trainer = MinesweeperSolverTrainer(Mode.CLASSIC, solver, threshold, parallel_games=8)
+            fields, predictions, games_played, games_won, cells_revealed = trainer.play_games_in_lockstep(60)
+
+            self.assertEqual(len(fields), 60)
+            self.assertEqual(len(predictions), 60)
+            self.assertGreater(games_played, 8)
+            self.assertLessEqual(games_won, games_played)
+            self.assertTrue(all(numpy.any(field == CellState.CLOSED) for field in fields))
+            self.check_samples(trainer, solver, fields, predictions)
+
+    def test_lockstep_statistics(self):
+        # Only the boards of the model runs are counted, i.e. 5 of 64 boards.
+        trainer = MinesweeperSolverTrainer(Mode.EXPERT, MinesweeperSolver(), parallel_games=64,
+                                           rng=numpy.random.default_rng(0))
+        fields, _, games_played, games_won, cells_revealed = trainer.play_games_in_lockstep(5)
+        self.assertEqual(games_played, 5)
+        self.assertEqual(games_won, 0)
+        self.assertGreater(cells_revealed, sum(numpy.count_nonzero(field != CellState.CLOSED) for field in fields))
+        self.assertLessEqual(cells_revealed, 5 * Mode.EXPERT.width() * Mode.EXPERT.height())
+
+    def test_play_games(self):
+        solver = MinesweeperSolver()
+        trainer = MinesweeperSolverTrainer(Mode.CLASSIC, solver, 0.1)
+        fields, predictions, _, _, _ = trainer.play_games(30)
+        self.assertEqual(fields.shape, (30,) + Mode.CLASSIC.shape())
+        self.check_samples(trainer, solver, fields, predictions)
+
+        # The samples are written to the specified arrays.
+        fields = numpy.zeros((40,) + Mode.CLASSIC.shape(), dtype=numpy.int8)
+        predictions = numpy.zeros((40,) + Mode.CLASSIC.shape(), dtype=numpy.float32)
+        lockstep_trainer = MinesweeperSolverTrainer(Mode.CLASSIC, solver, parallel_games=4)
+        for play_trainer, play in ((trainer, trainer.play_games),
+                                   (lockstep_trainer, lockstep_trainer.play_games_in_lockstep)):
+            returned_fields, returned_predictions, _, _, _ = play(30, fields, predictions)
+            self.assertIs(returned_fields, fields)
+            self.assertIs(returned_predictions, predictions)
+            self.assertTrue(numpy.all(fields[30:] == 0))
+            self.check_samples(play_trainer, solver, fields[:30], predictions[:30])
+
+    def test_train(self):
+        solver = MinesweeperSolver()
+        trainer = MinesweeperSolverTrainer(Mode.CLASSIC, solver, parallel_games=4, replay_capacity=50, data_workers=1)
+        trainer._log = lambda msg: None
+        weights = [parameter.detach().clone() for parameter in solver.model().parameters()]
+
+        # The samples of the previous training iterations are kept up to the replay capacity.
+        trainer.train(trainer_loop_passes=3, epochs=1, batches=2, batch_size=10)
+        self.assertEqual(len(trainer.replay_buffer()), 50)
+        self.assertFalse(all(torch.equal(weight, parameter)
+                             for weight, parameter in zip(weights, solver.model().parameters())))
+
+    def test_augmentation(self):
+        trainer = MinesweeperSolverTrainer(Mode.CLASSIC, MinesweeperSolver(), parallel_games=4, augmentation=True)
+        trainer._log = lambda msg: None
+        self.assertEqual(trainer.samples_per_move(), 8)
+
+        # The games are played for the eighth part of the samples of the training iteration.
+        trainer.train(trainer_loop_passes=1, epochs=1, batches=2, batch_size=10)
+        self.assertEqual(len(trainer.replay_buffer()), 3)
+
+        trainer = MinesweeperSolverTrainer(Mode.EXPERT, MinesweeperSolver(), augmentation=True)
+        self.assertEqual(trainer.samples_per_move(), 4)
+
+    def test_data_set(self):
+        rng = numpy.random.default_rng(0)
+        replay_buffer = ReplayBuffer(20, Mode.CLASSIC.shape())
+        replay_buffer.add(rng.integers(CellState.MINE, CellState.EIGHT_MINES_NEARBY + 1, (12,) + Mode.CLASSIC.shape()),
+                          rng.random((12,) + Mode.CLASSIC.shape()))
+        data_set = MinesweeperSolverDataSet(replay_buffer, MinesweeperFieldVectorizer())
+        self.assertEqual(len(data_set), 12)
+
+        # The minibatch is the same as the collated samples.
+        batch_idx = numpy.array([1, 5, 6, 11])
+        fields, targets = data_set.__getitems__(batch_idx)
+        self.assertEqual(fields.shape, (4, MinesweeperFieldVectorizer.PLANES) + Mode.CLASSIC.shape())
+        self.assertEqual(targets.dtype, torch.float32)
+        for field, target, idx in zip(fields, targets, batch_idx):
+            expected_field, expected_target = data_set[idx]
+            self.assertTrue(torch.equal(field, expected_field))
+            self.assertTrue(torch.equal(target, expected_target))
+
+        # The item idx is the sample idx % 12 with the transform idx // 12.
+        transforms = DihedralTransform.transforms(Mode.CLASSIC.shape())
+        data_set = MinesweeperSolverDataSet(replay_buffer, MinesweeperFieldVectorizer(), transforms)
+        self.assertEqual(len(data_set), 12 * 8)
+        batch_idx = numpy.array([3, 13, 30, 95])
+        fields, targets = data_set.__getitems__(batch_idx)
+        for field, target, idx in zip(fields, targets, batch_idx):
+            transform = transforms[idx // 12]
+            expected_field = MinesweeperFieldVectorizer()(transform(replay_buffer.fields()[idx % 12]))
+            self.assertTrue(numpy.array_equal(field.numpy(), expected_field))
+            self.assertTrue(numpy.array_equal(target.numpy(), transform(replay_buffer.targets()[idx % 12])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,6 +36,20 @@ class TestMinesweeper(unittest.TestCase):
         for idx, state in enumerate(cell_states[1:]):
             self.assertTrue(numpy.array_equiv(vect_res[idx + 2], game_field == state))
 
+    def test_batch_vectorization(self):
+        vect = MinesweeperFieldVectorizer()
+
+        fields = numpy.random.default_rng(0).integers(CellState.MINE, CellState.EIGHT_MINES_NEARBY + 1,
+                                                      size=(5, 16, 30), dtype=numpy.int8)
+        out = numpy.full((5, 11, 16, 30), -1, dtype=numpy.float32)
+        self.assertIs(vect.vectorize_into(fields, out), out)
+
+        for field, vect_res in zip(fields, out):
+            self.assertTrue(numpy.array_equiv(vect_res[0], numpy.ones(field.shape)))
+            self.assertTrue(numpy.array_equiv(vect_res[1], field != CellState.CLOSED))
+            for idx, state in enumerate(range(CellState.NO_MINES_NEARBY, CellState.EIGHT_MINES_NEARBY + 1)):
+                self.assertTrue(numpy.array_equiv(vect_res[idx + 2], field == state))
+
 
 if __name__ == '__main__':
     unittest.main()
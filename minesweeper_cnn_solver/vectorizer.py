@@ -4,16 +4,41 @@ from minesweeper_game.game_interface import CellState
 
 
 class MinesweeperFieldVectorizer:
+    """
+    The field is represented by 11 planes: the plane of ones, the plane of revealed cells and one plane for every number
+    of mines around a cell (from 0 to 8).
+    """
+    PLANES = 11
+
+    def __init__(self):
+        # The values of the planes for every cell state. The columns correspond the cell states from CellState.MINE to
+        # CellState.EIGHT_MINES_NEARBY, so the cell state shifted by -CellState.MINE is the column index.
+        cell_states = numpy.arange(CellState.MINE, CellState.EIGHT_MINES_NEARBY + 1)
+        lookup_table = numpy.zeros((MinesweeperFieldVectorizer.PLANES, len(cell_states)), dtype=numpy.float32)
+        lookup_table[0] = 1
+        lookup_table[1] = cell_states != CellState.CLOSED
+        lookup_table[2:] = cell_states == numpy.arange(CellState.NO_MINES_NEARBY,
+                                                       CellState.EIGHT_MINES_NEARBY + 1)[:, numpy.newaxis]
+        self._lookup_tables = {lookup_table.dtype: lookup_table}
+
     def __call__(self, field, dtype=numpy.float32):
-        v = numpy.zeros((11,) + field.shape, dtype=dtype)
+        v = numpy.empty((MinesweeperFieldVectorizer.PLANES,) + field.shape, dtype=dtype)
+        self.vectorize_into(field[numpy.newaxis], v[numpy.newaxis])
+        return v
 
-        v[0] = numpy.ones(field.shape)
-        v[1] = (field != CellState.CLOSED)
+    def vectorize_batch(self, fields, dtype=numpy.float32):
+        out = numpy.empty((fields.shape[0], MinesweeperFieldVectorizer.PLANES) + fields.shape[1:], dtype=dtype)
+        return self.vectorize_into(fields, out)
 
-        cell_states = [CellState.NO_MINES_NEARBY, CellState.ONE_MINE_NEARBY, CellState.TWO_MINES_NEARBY,
-                       CellState.THREE_MINES_NEARBY, CellState.FOUR_MINES_NEARBY, CellState.FIVE_MINES_NEARBY,
-                       CellState.SIX_MINES_NEARBY, CellState.SEVEN_MINES_NEARBY, CellState.EIGHT_MINES_NEARBY]
-        for idx, state in enumerate(cell_states):
-            v[idx + 2] = (field == state)
+    def vectorize_into(self, fields, out):
+        """
+        Vectorizes the batch of fields with the shape (N, H, W) into the preallocated array with the shape
+        (N, 11, H, W). The planes of all fields are gathered from the lookup table at once.
+        """
+        lookup_table = self._lookup_tables.get(out.dtype)
+        if lookup_table is None:
+            lookup_table = self._lookup_tables[numpy.dtype(numpy.float32)].astype(out.dtype)
+            self._lookup_tables[out.dtype] = lookup_table
 
-        return v
+        numpy.take(lookup_table, fields - CellState.MINE, axis=1, out=numpy.moveaxis(out, 1, 0), mode='clip')
+        return out
@@ -0,0 +1 @@
+from .solver import MinesweeperExactSolver
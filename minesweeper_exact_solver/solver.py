@@ -0,0 +1,270 @@
+import collections
+import functools
+import math
+import numpy
+
+from minesweeper_game.field_topology import FieldTopology
+from minesweeper_game.game_interface import CellState, Mode
+
+
+class MinesweeperExactSolver:
+    """
+    This is the solver that computes the exact probability of a mine for every closed cell. The closed cells adjacent
+    to the opened ones (the frontier) are split into independent components: two cells are in the same component if
+    they are neighbours of the same opened cell. All mine placements of every component that satisfy the numbers of the
+    opened cells are counted, then the placements of all components are combined and weighted by the number of ways to
+    place the remaining mines into the closed cells outside the frontier. The counts of the components are cached, so
+    the components that are not changed by a move are not counted again.
+
+    The time of the counting grows with the size of a component, so the components larger than max_component_size
+    cells are split into parts. The constraint shared by several parts only limits the number of mines in every part,
+    so the probabilities of the cells of such components are approximate.
+    """
+    def __init__(self, mode: Mode, max_component_size=128):
+        self._mode = mode
+        self._topology = FieldTopology.of(mode)
+        self._max_component_size = max_component_size
+
+    def __call__(self, field):
+        """
+        Returns the index of the closed cell with the smallest probability of a mine and the probabilities of all
+        cells. The probabilities of the opened cells are zeros.
+        """
+        cells_idx, probabilities = self.cells_to_open(field, 0)
+        return (int(cells_idx[0]) if len(cells_idx) else None), probabilities
+
+    def cells_to_open(self, field, threshold):
+        """
+        Returns the indices of all closed cells with the probability of a mine below the threshold in the order of the
+        probability (or the cell with the smallest probability if there is no such cell) and the probabilities of all
+        cells.
+        """
+        probabilities = self.probabilities(field)
+        closed_probabilities = numpy.where(field == CellState.CLOSED, probabilities, numpy.inf).reshape(-1)
+        cells_idx = numpy.flatnonzero(closed_probabilities < threshold)
+        if len(cells_idx):
+            return cells_idx[numpy.argsort(closed_probabilities[cells_idx], kind='stable')], probabilities
+
+        cell_idx = numpy.argmin(closed_probabilities)
+        return (numpy.array([cell_idx]) if numpy.isfinite(closed_probabilities[cell_idx]) else cells_idx), probabilities
+
+    def mode(self):
+        return self._mode
+
+    def probabilities(self, field):
+        closed_cells = (field == CellState.CLOSED).reshape(-1)
+        probabilities = numpy.zeros(self._topology.size())
+
+        components = [part for cells, constraints in self._frontier_components(field)
+                      for part in self._split_component(cells, constraints)]
+        distributions = [_enumerate_component(*_canonical_component(cells, constraints))
+                         for cells, constraints in components]
+
+        outside_cells = closed_cells.copy()
+        for cells, _ in components:
+            outside_cells[cells] = False
+        outside_count = int(numpy.count_nonzero(outside_cells))
+
+        # The numbers of placements of mines into all components by the total number of mines.
+        total_counts = functools.reduce(numpy.convolve, (counts for counts, _ in distributions), numpy.ones(1))
+        mines = numpy.arange(len(total_counts))
+
+        # The weight of the placement of m mines into the components is the number of ways to place the rest of mines
+        # into the cells outside the components. The weights are huge, so they are computed exactly and scaled to the
+        # largest one.
+        weights = [math.comb(outside_count, self._mode.mines() - m) if m <= self._mode.mines() else 0 for m in mines]
+        max_weight = max(weights)
+        if max_weight == 0:
+            raise ValueError('The field does not correspond any placement of mines.')
+        weights = numpy.array([weight / max_weight for weight in weights])
+
+        total_weight = total_counts @ weights
+        if total_weight == 0:
+            raise ValueError('The field does not correspond any placement of mines.')
+
+        for component_idx, ((cells, _), (counts, cell_mines_counts)) in enumerate(zip(components, distributions)):
+            other_counts = functools.reduce(numpy.convolve, (other_counts for other_idx, (other_counts, _)
+                                                             in enumerate(distributions) if other_idx != component_idx),
+                                            numpy.ones(1))
+            # The weight of the placement of m mines into the component is the sum of the weights of the placements of
+            # all other components.
+            mines_weights = numpy.lib.stride_tricks.sliding_window_view(weights, len(other_counts)) @ other_counts
+            probabilities[cells] = mines_weights @ cell_mines_counts / total_weight
+
+        if outside_count:
+            outside_mines = (total_counts * weights) @ (self._mode.mines() - mines)
+            probabilities[outside_cells] = outside_mines / total_weight / outside_count
+
+        return probabilities.reshape(field.shape)
+
+    def _split_component(self, cells, constraints):
+        # The parts are the sequential cells in the breadth-first order, so the most of constraints are not shared.
+        if len(cells) <= self._max_component_size:
+            return [(cells, constraints)]
+
+        order = _breadth_first_order(*_canonical_component(cells, constraints))
+        parts = []
+        for part_start in range(0, len(order), self._max_component_size):
+            part_cells = sorted(cells[position] for position in order[part_start:part_start + self._max_component_size])
+            part_cells_set = set(part_cells)
+
+            part_constraints = []
+            for constraint_cells, min_mines, max_mines in constraints:
+                inner_cells = [cell_idx for cell_idx in constraint_cells if cell_idx in part_cells_set]
+                outer_cells_count = len(constraint_cells) - len(inner_cells)
+                inner_min_mines = max(0, min_mines - outer_cells_count)
+                inner_max_mines = min(max_mines, len(inner_cells))
+                if inner_cells and (inner_min_mines > 0 or inner_max_mines < len(inner_cells)):
+                    part_constraints.append((inner_cells, inner_min_mines, inner_max_mines))
+            parts.append((part_cells, part_constraints))
+        return parts
+
+    def _frontier_components(self, field):
+        # Returns the components as the pairs of the sorted flat indices of the closed cells and the constraints, every
+        # constraint is the triple of the flat indices of the closed neighbours of an opened cell and the minimum and
+        # the maximum numbers of mines in them (both are the number of the opened cell).
+        flat_field = field.reshape(-1)
+        padded_closed_cells = numpy.append(flat_field == CellState.CLOSED, False)
+        padded_neighbours = self._topology.padded_neighbours()
+
+        opened_cells = flat_field >= CellState.NO_MINES_NEARBY
+        constraint_cells = numpy.flatnonzero(opened_cells & padded_closed_cells[padded_neighbours].any(axis=1))
+
+        # The components are the connected components of the graph where the closed cells are connected through the
+        # opened cells, they are found by the union-find.
+        parents = {}
+
+        def find(cell_idx):
+            while parents[cell_idx] != cell_idx:
+                parents[cell_idx] = parents[parents[cell_idx]]
+                cell_idx = parents[cell_idx]
+            return cell_idx
+
+        constraints = []
+        for constraint_cell in constraint_cells:
+            neighbours = padded_neighbours[constraint_cell]
+            cells = [int(cell_idx) for cell_idx in neighbours[padded_closed_cells[neighbours]]]
+            constraints.append((cells, int(flat_field[constraint_cell]), int(flat_field[constraint_cell])))
+            for cell_idx in cells:
+                parents.setdefault(cell_idx, cell_idx)
+            root = find(cells[0])
+            for cell_idx in cells[1:]:
+                parents[find(cell_idx)] = root
+
+        components = {}
+        for cell_idx in parents:
+            components.setdefault(find(cell_idx), ([], []))[0].append(cell_idx)
+        for constraint in constraints:
+            components[find(constraint[0][0])][1].append(constraint)
+
+        return [(sorted(cells), component_constraints) for cells, component_constraints in components.values()]
+
+
+def _canonical_component(cells, constraints):
+    # The component is described by the number of its cells and the constraints on the positions of the cells in the
+    # sorted list, so the same component found at any place of any field (and any component that does not change after
+    # a move) has the same description and it is enumerated once.
+    cell_positions = {cell_idx: position for position, cell_idx in enumerate(cells)}
+    canonical_constraints = tuple(sorted(
+        (tuple(sorted(cell_positions[cell_idx] for cell_idx in constraint_cells)), min_mines, max_mines)
+        for constraint_cells, min_mines, max_mines in constraints))
+    return len(cells), canonical_constraints
+
+
+def _cell_constraints(cells_count, constraints):
+    cell_constraints = [[] for _ in range(cells_count)]
+    for constraint_idx, constraint in enumerate(constraints):
+        for position in constraint[0]:
+            cell_constraints[position].append(constraint_idx)
+    return cell_constraints
+
+
+def _breadth_first_order(cells_count, constraints):
+    # Returns the positions of the cells in the order of the breadth-first search through the constraints.
+    cell_constraints = _cell_constraints(cells_count, constraints)
+    order = []
+    visited = [False] * cells_count
+    for start in range(cells_count):
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = collections.deque([start])
+        while queue:
+            position = queue.popleft()
+            order.append(position)
+            for constraint_idx in cell_constraints[position]:
+                for neighbour_position in constraints[constraint_idx][0]:
+                    if not visited[neighbour_position]:
+                        visited[neighbour_position] = True
+                        queue.append(neighbour_position)
+    return order
+
+
+@functools.lru_cache(maxsize=4096)
+def _enumerate_component(cells_count, constraints):
+    """
+    Returns the array of the numbers of the placements of m mines into the component (the m-th element) and the array
+    of the numbers of these placements with a mine in every cell of the component (the m-th row). The numbers are
+    float64, because they do not fit int64 for large components.
+    """
+    cell_constraints = _cell_constraints(cells_count, constraints)
+
+    # The cells are placed in the breadth-first order, so every constraint is completed soon after its first cell is
+    # placed.
+    order = _breadth_first_order(cells_count, constraints)
+    steps = [0] * cells_count
+    for step, position in enumerate(order):
+        steps[position] = step
+    constraint_steps = [sorted(steps[position] for position in constraint[0]) for constraint in constraints]
+
+    # The placements of the cells starting from the step depend on the placed cells only through the numbers of mines
+    # in the open constraints (the constraints with the cells placed before the step and the cells placed after it), so
+    # the numbers of the placements are memoized by them.
+    open_constraints = [[constraint_idx for constraint_idx, constraint_step in enumerate(constraint_steps)
+                         if constraint_step[0] < step <= constraint_step[-1]] for step in range(cells_count + 1)]
+    memo = {}
+
+    def count(step, open_constraints_mines):
+        key = (step, open_constraints_mines)
+        if key in memo:
+            return memo[key]
+
+        if step == cells_count:
+            return numpy.ones(1), numpy.zeros((1, 0))
+
+        counts = numpy.zeros(cells_count - step + 1)
+        cell_mines_counts = numpy.zeros((cells_count - step + 1, cells_count - step))
+        for mine in (0, 1):
+            constraints_mines = dict(zip(open_constraints[step], open_constraints_mines))
+            feasible = True
+            for constraint_idx in cell_constraints[order[step]]:
+                constraint_mines = constraints_mines.get(constraint_idx, 0) + mine
+                unplaced_cells = len(constraint_steps[constraint_idx]) - \
+                    constraint_steps[constraint_idx].index(step) - 1
+                _, min_mines, max_mines = constraints[constraint_idx]
+                if constraint_mines > max_mines or constraint_mines + unplaced_cells < min_mines:
+                    feasible = False
+                    break
+                constraints_mines[constraint_idx] = constraint_mines
+
+            if not feasible:
+                continue
+
+            next_mines = tuple(constraints_mines.get(constraint_idx, 0)
+                               for constraint_idx in open_constraints[step + 1])
+            next_counts, next_cell_mines_counts = count(step + 1, next_mines)
+            counts[mine:mine + len(next_counts)] += next_counts
+            cell_mines_counts[mine:mine + len(next_counts), 0] += mine * next_counts
+            cell_mines_counts[mine:mine + len(next_counts), 1:] += next_cell_mines_counts
+
+        memo[key] = counts, cell_mines_counts
+        return counts, cell_mines_counts
+
+    counts, step_mines_counts = count(0, ())
+    cell_mines_counts = numpy.empty_like(step_mines_counts)
+    cell_mines_counts[:, order] = step_mines_counts
+
+    # The result is shared by all solvers through the cache.
+    counts.flags.writeable = False
+    cell_mines_counts.flags.writeable = False
+    return counts, cell_mines_counts
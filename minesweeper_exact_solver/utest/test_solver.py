@@ -0,0 +1,60 @@
+import itertools
+import numpy
+import unittest
+
+from minesweeper_game.field_generation import create_field_from_mines
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import CellState, GameState, Mode
+
+from ..solver import MinesweeperExactSolver
+
+
+def _brute_force_probabilities(field, mines_count):
+    # Enumerates all placements of mines into the closed cells and keeps the placements that give the opened numbers.
+    closed_cells = numpy.flatnonzero(field == CellState.CLOSED)
+    opened_cells = field != CellState.CLOSED
+    mines_counts = numpy.zeros(field.size)
+    placements_count = 0
+    for placement in itertools.combinations(closed_cells, mines_count):
+        mines = numpy.zeros(field.size, dtype=bool)
+        mines[list(placement)] = True
+        mines = mines.reshape(field.shape)
+        if numpy.array_equal(create_field_from_mines(mines)[opened_cells], field[opened_cells]):
+            mines_counts += mines.reshape(-1)
+            placements_count += 1
+    return (mines_counts / placements_count).reshape(field.shape)
+
+
+class TestMinesweeperExactSolver(unittest.TestCase):
+    def test_probabilities(self):
+        mode = Mode(5, 4, 5)
+        for seed in range(5):
+            game = MinesweeperGame(mode, rng=numpy.random.default_rng(seed))
+            game.open(0)
+            solver = MinesweeperExactSolver(mode)
+            while game.state() == GameState.IN_PROGRESS:
+                field = game.field()
+                self.assertTrue(numpy.allclose(solver.probabilities(field),
+                                               _brute_force_probabilities(field, mode.mines())))
+
+                cell_idx, probabilities = solver(field)
+                self.assertEqual(field.flat[cell_idx], CellState.CLOSED)
+                self.assertEqual(probabilities.flat[cell_idx], probabilities[field == CellState.CLOSED].min())
+                game.open(cell_idx)
+
+    def test_max_component_size(self):
+        field = numpy.full((4, 4), CellState.CLOSED, dtype=numpy.int8)
+        field[0, 0] = 0
+        field[3, 3] = 3
+
+        # The components are split into the parts of 2 cells, but the constraints still limit the number of mines in
+        # every part.
+        for max_component_size in (8, 2):
+            probabilities = MinesweeperExactSolver(Mode(4, 4, 4), max_component_size).probabilities(field)
+            self.assertTrue(numpy.allclose(probabilities[[0, 1, 1], [1, 0, 1]], 0))
+            self.assertTrue(numpy.allclose(probabilities[[2, 2, 3], [3, 2, 2]], 1))
+            self.assertTrue(numpy.allclose(probabilities[field == CellState.CLOSED].sum(), 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1 +1,4 @@
 from .game_field import MinesweeperGame
+from .batched_game_field import BatchedMinesweeperGame
+from .field_topology import FieldTopology
+from .board_corpus import MinesweeperBoardCorpus
@@ -0,0 +1,111 @@
+import numpy
+
+from minesweeper_game.field_generation import create_field_from_mines, generate_mines, sum_nearby
+from minesweeper_game.field_topology import FieldTopology
+from minesweeper_game.game_snapshot import pack_snapshots
+from minesweeper_game.game_interface import CellState, Mode, GameState
+
+
+class BatchedMinesweeperGame:
+    """
+    This is a set of games of the same mode that are played in lockstep: every call of `open` makes one move in every
+    game which is still in progress.
+    """
+    def __init__(self, mode: Mode, size, rng=None):
+        self._mode = mode
+        self._size = size
+        self._rng = rng if rng is not None else numpy.random.default_rng()
+        self._topology = FieldTopology.of(mode)
+        self._fields = numpy.zeros((size,) + mode.shape(), dtype=numpy.int8)
+        self._created = numpy.zeros(size, dtype=bool)
+        self._revealed_fields = numpy.full((size,) + mode.shape(), CellState.CLOSED, dtype=numpy.int8)
+        self._closed_cells = numpy.full(size, mode.height() * mode.width(), dtype=numpy.int32)
+        self._states = numpy.full(size, GameState.IN_PROGRESS, dtype=numpy.int8)
+
+    def _create_fields(self, boards, first_opened_cells_idx):
+        self._fields[boards] = create_field_from_mines(
+            generate_mines(self._topology, self._mode.mines(), first_opened_cells_idx, self._rng))
+        self._created[boards] = True
+
+    def size(self):
+        return self._size
+
+    def mode(self):
+        return self._mode
+
+    def fields(self):
+        return self._revealed_fields
+
+    def field(self, board_idx):
+        return self._revealed_fields[board_idx]
+
+    def snapshots(self):
+        """
+        Returns the compact representations of all games, see game_snapshot module for the details.
+        """
+        mines = (self._fields == CellState.MINE) & self._created[:, None, None]
+        return pack_snapshots(mines, self._revealed_fields != CellState.CLOSED)
+
+    def states(self):
+        return self._states
+
+    def state(self, board_idx):
+        return self._states[board_idx]
+
+    def reset(self, boards):
+        """
+        Starts new games on the specified boards. The mines are placed when the first cell of a new game is opened.
+        """
+        self._created[boards] = False
+        self._revealed_fields[boards] = CellState.CLOSED
+        self._closed_cells[boards] = self._mode.height() * self._mode.width()
+        self._states[boards] = GameState.IN_PROGRESS
+
+    def open(self, indices, boards=None):
+        """
+        Opens one cell on every board or on the specified boards only. The indices of the boards with finished games
+        (and of the boards which are not specified) are ignored.
+        """
+        indices = numpy.asarray(indices)
+        boards_in_progress = self._states == GameState.IN_PROGRESS
+        if boards is not None:
+            selected_boards = numpy.zeros(self._size, dtype=bool)
+            selected_boards[boards] = True
+            boards_in_progress &= selected_boards
+        boards = numpy.flatnonzero(boards_in_progress)
+        if boards.size == 0:
+            return self._states
+
+        indices = indices[boards]
+        new_boards = ~self._created[boards]
+        if numpy.any(new_boards):
+            self._create_fields(boards[new_boards], indices[new_boards])
+
+        fields = self._fields[boards]
+        revealed_fields = self._revealed_fields[boards]
+
+        cells_to_open = numpy.zeros(fields.shape, dtype=bool)
+        cells_to_open.reshape(len(boards), -1)[numpy.arange(len(boards)), indices] = True
+
+        # All boards are flooded at the same time: the cells around the empty cells opened at the previous step are
+        # opened at the next one until no new empty cells are opened.
+        empty_cells = fields == CellState.NO_MINES_NEARBY
+        flooded_cells = cells_to_open & empty_cells
+        while numpy.any(flooded_cells):
+            flooded_cells = (sum_nearby(flooded_cells) > 0) & ~cells_to_open
+            cells_to_open |= flooded_cells
+            flooded_cells &= empty_cells
+
+        opened_cells = cells_to_open & (revealed_fields == CellState.CLOSED)
+        revealed_fields[opened_cells] = fields[opened_cells]
+        self._revealed_fields[boards] = revealed_fields
+
+        self._closed_cells[boards] -= numpy.count_nonzero(opened_cells, axis=(1, 2)).astype(numpy.int32)
+        mine_opened = numpy.any(opened_cells & (fields == CellState.MINE), axis=(1, 2))
+
+        states = numpy.full(len(boards), GameState.IN_PROGRESS, dtype=numpy.int8)
+        states[self._closed_cells[boards] == self._mode.mines()] = GameState.WIN
+        states[mine_opened] = GameState.GAME_OVER
+        self._states[boards] = states
+
+        return self._states
@@ -0,0 +1,69 @@
+import numpy
+import os
+
+from minesweeper_game.field_generation import create_field_from_mines, generate_mines
+from minesweeper_game.field_topology import FieldTopology
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import CellState, Mode
+
+
+class MinesweeperBoardCorpus:
+    """
+    This is the set of pre-generated fields which is kept in the directory as two .npy files: the fields (int8 array
+    with the shape (number of boards, height, width)) and the cells that must be opened first (the fields are generated
+    without mines around them). The files are memory-mapped, so the corpus is loaded instantly and the pages of the
+    files are shared by all processes that use the same corpus.
+    """
+    FIELDS_FILE = 'fields.npy'
+    FIRST_CELLS_FILE = 'first_cells.npy'
+
+    def __init__(self, path):
+        self._fields = numpy.load(os.path.join(path, MinesweeperBoardCorpus.FIELDS_FILE), mmap_mode='r')
+        self._first_cells = numpy.load(os.path.join(path, MinesweeperBoardCorpus.FIRST_CELLS_FILE), mmap_mode='r')
+
+        if len(self._fields) != len(self._first_cells):
+            raise ValueError('The number of fields does not correspond the number of first cells.')
+
+        height, width = self._fields.shape[1:]
+        mines = int(numpy.count_nonzero(self._fields[0] == CellState.MINE)) if len(self._fields) else 0
+        self._mode = Mode(width, height, mines)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def mode(self):
+        return self._mode
+
+    def first_cell(self, board_idx):
+        return int(self._first_cells[board_idx])
+
+    def game(self, board_idx):
+        # The field of the game is the read-only view of the memory-mapped file.
+        return MinesweeperGame.from_field(self._mode, self._fields[board_idx])
+
+    @staticmethod
+    def generate(path, mode: Mode, size, rng=None, first_cell_idx=None, chunk_size=10000):
+        """
+        Generates the corpus of the specified size. The first opened cell is the center of the field if it is not
+        specified.
+        """
+        rng = rng if rng is not None else numpy.random.default_rng()
+        if first_cell_idx is None:
+            first_cell_idx = numpy.ravel_multi_index((mode.height() // 2, mode.width() // 2), mode.shape())
+
+        os.makedirs(path, exist_ok=True)
+        fields = numpy.lib.format.open_memmap(os.path.join(path, MinesweeperBoardCorpus.FIELDS_FILE), mode='w+',
+                                              dtype=numpy.int8, shape=(size,) + mode.shape())
+        first_cells = numpy.full(size, first_cell_idx, dtype=numpy.int32)
+
+        topology = FieldTopology.of(mode)
+        for chunk_start in range(0, size, chunk_size):
+            chunk_first_cells = first_cells[chunk_start:chunk_start + chunk_size]
+            fields[chunk_start:chunk_start + chunk_size] = create_field_from_mines(
+                generate_mines(topology, mode.mines(), chunk_first_cells, rng))
+
+        fields.flush()
+        del fields
+        numpy.save(os.path.join(path, MinesweeperBoardCorpus.FIRST_CELLS_FILE), first_cells)
+
+        return MinesweeperBoardCorpus(path)
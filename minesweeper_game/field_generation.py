@@ -0,0 +1,49 @@
+import numpy
+
+from minesweeper_game.game_interface import CellState
+
+
+def sum_nearby(cells):
+    """
+    Returns the sum over the 3x3 neighbourhood of every cell, including the cell itself, as int8. All leading
+    dimensions of the array are processed as a batch of fields.
+    """
+    # The sum is a convolution with the 3x3 kernel of ones. The kernel is separable, so the convolution is computed as
+    # a sum over rows followed by a sum over columns of the zero-padded array.
+    height, width = cells.shape[-2:]
+    padded_cells = numpy.zeros(cells.shape[:-2] + (height + 2, width + 2), dtype=numpy.int8)
+    padded_cells[..., 1:-1, 1:-1] = cells
+
+    rows_sum = padded_cells[..., :-2, :] + padded_cells[..., 1:-1, :] + padded_cells[..., 2:, :]
+    return rows_sum[..., :-2] + rows_sum[..., 1:-1] + rows_sum[..., 2:]
+
+
+def create_field_from_mines(mines):
+    """
+    Returns the field of the mines, i.e. the number of the mines nearby for every cell without a mine. All leading
+    dimensions of the array are processed as a batch of fields.
+    """
+    field = sum_nearby(mines)
+    field[mines] = CellState.MINE
+    return field
+
+
+def generate_mines(topology, mines_count, first_opened_cells_idx, rng):
+    """
+    Returns the mines of the fields with the shape of the topology, one field for every first opened cell. Neither the
+    first opened cell nor its neighbours get mines.
+    """
+    # Every cell gets a random key and the cells with the smallest keys get mines. The first opened cell and its
+    # neighbours get the keys which are greater than any random key. The missing neighbours of the cells on the edges
+    # point to the extra column which is dropped.
+    fields_count = len(first_opened_cells_idx)
+    cells_count = topology.size()
+
+    keys = rng.random((fields_count, cells_count + 1))
+    excluded_cells = numpy.column_stack((first_opened_cells_idx, topology.padded_neighbours()[first_opened_cells_idx]))
+    numpy.put_along_axis(keys, excluded_cells, 2., axis=1)
+    mines_idx = numpy.argpartition(keys[:, :cells_count], mines_count - 1, axis=1)[:, :mines_count]
+
+    mines = numpy.zeros((fields_count, cells_count), dtype=bool)
+    numpy.put_along_axis(mines, mines_idx, True, axis=1)
+    return mines.reshape((fields_count,) + topology.shape())
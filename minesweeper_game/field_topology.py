@@ -0,0 +1,73 @@
+import functools
+import numpy
+
+from minesweeper_game.game_interface import Mode
+
+
+class FieldTopology:
+    """
+    This is the immutable description of the neighbours of every cell of the field with the given shape. The neighbours
+    of the cell with the flat index idx are neighbours()[offsets()[idx]:offsets()[idx + 1]]. The same neighbours are
+    also available as the table padded_neighbours() with 8 columns, where the missing neighbours of the cells on the
+    edges are replaced with size(). The topology is built once per shape, so use FieldTopology.of to get it.
+    """
+    def __init__(self, shape):
+        self._shape = tuple(shape)
+        self._size = self._shape[0] * self._shape[1]
+
+        rows_idx, columns_idx = numpy.indices(self._shape).reshape(2, -1)
+        padded_neighbours = numpy.full((self._size, 8), self._size, dtype=numpy.int64)
+        neighbour_idx = 0
+        for row_offset in (-1, 0, 1):
+            for column_offset in (-1, 0, 1):
+                if row_offset == 0 and column_offset == 0:
+                    continue
+
+                nearby_rows_idx = rows_idx + row_offset
+                nearby_columns_idx = columns_idx + column_offset
+                valid = ((nearby_rows_idx >= 0) & (nearby_rows_idx < self._shape[0]) &
+                         (nearby_columns_idx >= 0) & (nearby_columns_idx < self._shape[1]))
+                padded_neighbours[valid, neighbour_idx] = nearby_rows_idx[valid] * self._shape[1] + \
+                    nearby_columns_idx[valid]
+                neighbour_idx += 1
+
+        valid = padded_neighbours < self._size
+        self._padded_neighbours = padded_neighbours
+        self._neighbours = padded_neighbours[valid]
+        self._offsets = numpy.concatenate(([0], numpy.cumsum(numpy.count_nonzero(valid, axis=1))))
+        self._cells = numpy.repeat(numpy.arange(self._size), numpy.diff(self._offsets))
+
+        for array in (self._padded_neighbours, self._neighbours, self._offsets, self._cells):
+            array.flags.writeable = False
+
+    @staticmethod
+    def of(mode: Mode):
+        return _field_topology(mode.shape())
+
+    def shape(self):
+        return self._shape
+
+    def size(self):
+        return self._size
+
+    def offsets(self):
+        return self._offsets
+
+    def neighbours(self, idx=None):
+        if idx is None:
+            return self._neighbours
+        return self._neighbours[self._offsets[idx]:self._offsets[idx + 1]]
+
+    def padded_neighbours(self):
+        return self._padded_neighbours
+
+    def pairs(self):
+        """
+        Returns the flat indices of all pairs of neighbours as two arrays: the cells and their neighbours.
+        """
+        return self._cells, self._neighbours
+
+
+@functools.lru_cache(maxsize=None)
+def _field_topology(shape):
+    return FieldTopology(shape)
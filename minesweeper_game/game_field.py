@@ -1,45 +1,87 @@
+import copy
 import random
 import numpy
 
-from queue import SimpleQueue
+from collections import deque
+from minesweeper_game.field_generation import create_field_from_mines
+from minesweeper_game.field_topology import FieldTopology
+from minesweeper_game.game_snapshot import pack_snapshots, snapshot_size, unpack_snapshots
 from minesweeper_game.game_interface import CellState, Mode, GameState
 
 
+def _label_empty_regions(field, topology):
+    """
+    Returns the region of every cell (-1 if the cell is not empty) and the cells opened by a click on every region
+    (the empty cells of the region and the cells around them). The cells of the region r are
+    region_cells[region_offsets[r]:region_offsets[r + 1]].
+    """
+    cells_count = field.size
+    cells, nearby_cells = topology.pairs()
+    empty_cells = field.ravel() == CellState.NO_MINES_NEARBY
+
+    # Every empty cell takes the smallest label among its empty neighbours and then the label of the cell it points to,
+    # until all cells of a region have the label of its first cell.
+    connected = empty_cells[cells] & empty_cells[nearby_cells]
+    connected_cells, connected_nearby_cells = cells[connected], nearby_cells[connected]
+    labels = numpy.arange(cells_count)
+    while True:
+        new_labels = numpy.copy(labels)
+        numpy.minimum.at(new_labels, connected_cells, labels[connected_nearby_cells])
+        new_labels = new_labels[new_labels]
+        if numpy.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    regions = numpy.full(cells_count, -1, dtype=numpy.int32)
+    regions_labels, regions[empty_cells] = numpy.unique(labels[empty_cells], return_inverse=True)
+
+    opened = empty_cells[cells]
+    opened_regions = numpy.concatenate((regions[empty_cells], regions[cells[opened]])).astype(numpy.int64)
+    opened_cells = numpy.unique(opened_regions * cells_count +
+                                numpy.concatenate((numpy.flatnonzero(empty_cells), nearby_cells[opened])))
+    region_cells = opened_cells % cells_count
+    region_offsets = numpy.searchsorted(opened_cells // cells_count, numpy.arange(len(regions_labels) + 1))
+    return regions, region_offsets, region_cells
+
+
 class MinesweeperGame:
-    def __init__(self, mode: Mode, seed=None):
+    def __init__(self, mode: Mode, seed=None, rng=None):
+        """
+        The mines are placed when the first cell is opened. If the seed is specified, the mines are placed using the
+        seeded `random` module, so the same seed always produces the same field as in the previous versions of the
+        game. Otherwise, the mines are placed using `rng` (`numpy.random.Generator`) or the new generator created for
+        this game.
+        """
+        if seed is not None and rng is not None:
+            raise ValueError('Only one of seed and rng can be specified.')
+
         self._mode = mode
         self._seed = seed
+        self._rng = rng if rng is not None or seed is not None else numpy.random.default_rng()
+        self._topology = FieldTopology.of(mode)
         self._field = None
+        self._regions = None
+        self._region_offsets = None
+        self._region_cells = None
         self._revealed_field = numpy.full(self._mode.shape(), CellState.CLOSED, dtype=numpy.int8)
+        # The flat views of the fields are indexed by the cell index faster than the flat iterators.
+        self._field_cells = None
+        self._revealed_cells = self._revealed_field.reshape(-1)
+        self._closed_cells = self._mode.height() * self._mode.width()
+        self._mine_opened = False
+        # Only the forks log the moves, see fork.
+        self._undo_log = None
         self._state = None
         self._update_state()
 
-    def _idx_to_check(self, current_idx, max_idx_value):
-        idx_to_check = [current_idx]
-        if current_idx > 0:
-            idx_to_check.append(current_idx - 1)
-        if current_idx < max_idx_value:
-            idx_to_check.append(current_idx + 1)
-        return idx_to_check
-
-    def _count_nearest_mines(self, row_idx, column_idx):
-        rows_to_check = self._idx_to_check(row_idx, self._mode.height() - 1)
-        columns_to_check = self._idx_to_check(column_idx, self._mode.width() - 1)
-
-        mines_count = 0
-        for check_row_idx in rows_to_check:
-            for check_column_idx in columns_to_check:
-                if self._field[check_row_idx, check_column_idx] == CellState.MINE:
-                    mines_count += 1
-        return mines_count
+    def _excluded_cells(self, first_opened_cell_idx):
+        excluded_cells = numpy.zeros(self._mode.shape(), dtype=bool)
+        excluded_cells.flat[first_opened_cell_idx] = True
+        excluded_cells.flat[self._topology.neighbours(first_opened_cell_idx)] = True
+        return excluded_cells
 
-    def _generate_mines(self, first_opened_cell_idx):
-        row_idx, column_idx = numpy.unravel_index(first_opened_cell_idx, self._mode.shape())
-        rows_to_exclude = self._idx_to_check(row_idx, self._mode.height() - 1)
-        columns_to_exclude = self._idx_to_check(column_idx, self._mode.width() - 1)
-
-        idx_to_exclude = {numpy.ravel_multi_index((row_idx, column_idx), self._mode.shape())
-                          for row_idx in rows_to_exclude for column_idx in columns_to_exclude}
+    def _generate_mines_with_seed(self, excluded_cells):
+        idx_to_exclude = set(numpy.flatnonzero(excluded_cells))
 
         random.seed(self._seed)
 
@@ -51,76 +93,172 @@ class MinesweeperGame:
             if mine_idx not in idx_to_exclude:
                 mines.add(mine_idx)
 
-        return mines
+        return list(mines)
 
-    def _create_field(self, first_opened_cell_idx):
-        self._field = numpy.full(self._mode.shape(), CellState.NO_MINES_NEARBY, dtype=numpy.int8)
-
-        mines = self._generate_mines(first_opened_cell_idx)
-        for mine_idx in mines:
-            self._field[numpy.unravel_index(mine_idx, self._mode.shape())] = CellState.MINE
+    def _generate_mines(self, first_opened_cell_idx):
+        excluded_cells = self._excluded_cells(first_opened_cell_idx)
+        if self._seed is not None:
+            mines_idx = self._generate_mines_with_seed(excluded_cells)
+        else:
+            mines_idx = self._rng.choice(numpy.flatnonzero(~excluded_cells), self._mode.mines(), replace=False)
+
+        mines = numpy.zeros(self._mode.shape(), dtype=bool)
+        mines.flat[mines_idx] = True
+        return mines
 
-        for row_idx, column_idx in numpy.ndindex(self._field.shape):
-            if self._field[row_idx, column_idx] == CellState.MINE:
-                continue
+    def _set_field(self, field):
+        self._field = field
+        self._field_cells = field.reshape(-1)
+        self._regions, self._region_offsets, self._region_cells = _label_empty_regions(field, self._topology)
 
-            mines_count = self._count_nearest_mines(row_idx, column_idx)
-
-            if mines_count == 1:
-                self._field[row_idx, column_idx] = CellState.ONE_MINE_NEARBY
-            elif mines_count == 2:
-                self._field[row_idx, column_idx] = CellState.TWO_MINES_NEARBY
-            elif mines_count == 3:
-                self._field[row_idx, column_idx] = CellState.THREE_MINES_NEARBY
-            elif mines_count == 4:
-                self._field[row_idx, column_idx] = CellState.FOUR_MINES_NEARBY
-            elif mines_count == 5:
-                self._field[row_idx, column_idx] = CellState.FIVE_MINES_NEARBY
-            elif mines_count == 6:
-                self._field[row_idx, column_idx] = CellState.SIX_MINES_NEARBY
-            elif mines_count == 7:
-                self._field[row_idx, column_idx] = CellState.SEVEN_MINES_NEARBY
-            elif mines_count == 8:
-                self._field[row_idx, column_idx] = CellState.EIGHT_MINES_NEARBY
+    def _create_field(self, first_opened_cell_idx):
+        self._set_field(create_field_from_mines(self._generate_mines(first_opened_cell_idx)))
 
     def field(self):
         return self._revealed_field
 
+    def snapshot(self):
+        """
+        Returns the compact representation of the game, see game_snapshot module for the details.
+        """
+        if self._field is None:
+            return numpy.zeros(snapshot_size(self._mode.shape()), dtype=numpy.uint8)
+        return pack_snapshots(self._field == CellState.MINE, self._revealed_field != CellState.CLOSED)
+
+    @staticmethod
+    def from_field(mode: Mode, field):
+        """
+        Creates the game with the specified field. The field is not copied, because the game never changes it.
+        """
+        if field.shape != mode.shape():
+            raise ValueError('The field shape does not correspond the specified game mode.')
+
+        game = MinesweeperGame(mode)
+        game._set_field(field)
+        return game
+
+    @staticmethod
+    def from_snapshot(mode: Mode, snapshot):
+        mines, opened_cells = unpack_snapshots(snapshot, mode.shape())
+        if not numpy.any(mines):
+            return MinesweeperGame(mode)
+
+        game = MinesweeperGame.from_field(mode, create_field_from_mines(mines))
+        game._revealed_field[opened_cells] = game._field[opened_cells]
+        game._closed_cells -= numpy.count_nonzero(opened_cells)
+        game._mine_opened = bool(numpy.any(mines & opened_cells))
+        game._update_state()
+
+        return game
+
     def mode(self):
         return self._mode
 
+    def fork(self):
+        """
+        Returns the copy of the game that shares the field with this game, only the opened cells are copied. If the
+        mines are not placed yet, the copy gets its own copy of the generator, so both games place the same mines when
+        the same first cell is opened.
+
+        The copy logs its moves, so they can be reverted by undo, its undo log is empty. The games which are not forked
+        do not log the moves, so the log does not grow while the games are played.
+        """
+        game = MinesweeperGame.__new__(MinesweeperGame)
+        game.__dict__.update(self.__dict__)
+        if self._field is None and self._rng is not None:
+            game._rng = copy.deepcopy(self._rng)
+        game._revealed_cells = self._revealed_cells.copy()
+        game._revealed_field = game._revealed_cells.reshape(self._revealed_field.shape)
+        game._undo_log = []
+        return game
+
     def open(self, idx):
         if self._field is None:
             self._create_field(first_opened_cell_idx=idx)
 
+        # Every call is logged (even if it does not change the game), so every call can be reverted by one call of undo.
+        # The log keeps the number of closed cells before the call, so undo does not count the reverted cells.
         if self._state != GameState.IN_PROGRESS:
+            if self._undo_log is not None:
+                self._undo_log.append((None, self._closed_cells, self._state))
             return self._state
 
-        row_idx, column_idx = numpy.unravel_index(idx, self._field.shape)
-
-        cells_to_process = SimpleQueue()
-        cells_to_process.put((row_idx, column_idx))
+        closed_cells, state = self._closed_cells, self._state
+        opened_cells = self._open_cells(idx)
+        if self._undo_log is not None:
+            self._undo_log.append((opened_cells, closed_cells, state))
+        return self._update_state()
 
-        while not cells_to_process.empty():
-            row_idx, column_idx = cells_to_process.get()
+    def open_many(self, cells_idx):
+        """
+        Opens the cells one by one until the game is finished, so the cells after the mine are not opened. Every cell
+        is a separate call of open, so undo reverts one cell.
+        """
+        for idx in cells_idx:
+            if self.open(idx) != GameState.IN_PROGRESS:
+                break
+        return self._state
 
-            self._revealed_field[row_idx, column_idx] = self._field[row_idx, column_idx]
-            if self._revealed_field[row_idx, column_idx] == CellState.NO_MINES_NEARBY:
-                rows_to_check = self._idx_to_check(row_idx, self._mode.height() - 1)
-                columns_to_check = self._idx_to_check(column_idx, self._mode.width() - 1)
+    def undo(self):
+        """
+        Reverts the last call of open of the forked game, see fork. The mines stay on their places if the first move is
+        reverted. Raises RuntimeError if there is no call to revert.
+        """
+        if not self._undo_log:
+            raise RuntimeError('Nothing to undo.')
+
+        opened_cells, self._closed_cells, self._state = self._undo_log.pop()
+        if opened_cells is not None:
+            self._revealed_cells[opened_cells] = CellState.CLOSED
+            # A mine can be opened only by the last move of the game, so no mines are opened after any move is reverted.
+            self._mine_opened = False
+        return self._state
 
-                for check_row_idx in rows_to_check:
-                    for check_column_idx in columns_to_check:
-                        if self._revealed_field[check_row_idx, check_column_idx] == CellState.CLOSED:
-                            cells_to_process.put((check_row_idx, check_column_idx))
+    def _open_cells(self, idx):
+        # The empty regions are labelled when the field is created, so a click on an empty cell opens all cells of its
+        # region at once. The regions never contain mines. Returns the cells which were closed before this call.
+        region = self._regions[idx]
+        if region < 0:
+            if self._revealed_cells[idx] != CellState.CLOSED:
+                return None
+
+            cell = self._revealed_cells[idx] = self._field_cells[idx]
+            self._closed_cells -= 1
+            if cell == CellState.MINE:
+                self._mine_opened = True
+            return idx
+        else:
+            cells = self._region_cells[self._region_offsets[region]:self._region_offsets[region + 1]]
+            cells = cells[self._revealed_cells[cells] == CellState.CLOSED]
+            self._revealed_cells[cells] = self._field_cells[cells]
+            self._closed_cells -= len(cells)
+            return cells
+
+    def _flood_open_cells(self, idx):
+        # This is the reference implementation of _open_cells that opens the cells using the breadth-first search.
+        cells_to_process = deque([idx])
+
+        while cells_to_process:
+            idx = cells_to_process.popleft()
+            if self._revealed_field.flat[idx] != CellState.CLOSED:
+                continue
 
-        return self._update_state()
+            self._revealed_field.flat[idx] = self._field.flat[idx]
+            self._closed_cells -= 1
+            if self._revealed_field.flat[idx] == CellState.MINE:
+                self._mine_opened = True
+            elif self._revealed_field.flat[idx] == CellState.NO_MINES_NEARBY:
+                for neighbour_idx in self._topology.neighbours(idx):
+                    if self._revealed_field.flat[neighbour_idx] == CellState.CLOSED:
+                        cells_to_process.append(neighbour_idx)
 
     def _update_state(self):
+        # The number of closed cells and the opened mine are tracked when the cells are opened, so the state is updated
+        # without scanning the field.
         if self._state is None or self._state == GameState.IN_PROGRESS:
-            if numpy.count_nonzero(self._revealed_field == CellState.MINE):
+            if self._mine_opened:
                 self._state = GameState.GAME_OVER
-            elif numpy.count_nonzero(self._revealed_field == CellState.CLOSED) == self._mode.mines():
+            elif self._closed_cells == self._mode.mines():
                 self._state = GameState.WIN
             else:
                 self._state = GameState.IN_PROGRESS
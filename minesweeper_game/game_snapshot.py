@@ -0,0 +1,41 @@
+import numpy
+
+from minesweeper_game.field_generation import create_field_from_mines
+from minesweeper_game.game_interface import CellState
+
+# The snapshot of a game is a uint8 array that keeps two bitmaps of the field packed in the row-major order: the cells
+# with mines and the opened cells. The numbers of mines around the cells are not stored, they are computed from the
+# mines bitmap when the snapshot is unpacked. The snapshot of a game that is not started has no mines and no opened
+# cells. All functions below accept arrays of snapshots with any number of leading dimensions.
+
+
+def snapshot_size(shape):
+    return 2 * ((shape[0] * shape[1] + 7) // 8)
+
+
+def pack_snapshots(mines, opened_cells):
+    batch_shape = mines.shape[:-2]
+    mines = numpy.packbits(mines.reshape(batch_shape + (-1,)), axis=-1)
+    opened_cells = numpy.packbits(opened_cells.reshape(batch_shape + (-1,)), axis=-1)
+    return numpy.concatenate((mines, opened_cells), axis=-1)
+
+
+def unpack_snapshots(snapshots, shape):
+    """
+    Returns the boolean arrays of the cells with mines and the opened cells.
+    """
+    batch_shape = snapshots.shape[:-1]
+    cells_count = shape[0] * shape[1]
+    bitmap_size = snapshot_size(shape) // 2
+
+    mines = numpy.unpackbits(snapshots[..., :bitmap_size], axis=-1, count=cells_count).view(bool)
+    opened_cells = numpy.unpackbits(snapshots[..., bitmap_size:], axis=-1, count=cells_count).view(bool)
+    return mines.reshape(batch_shape + tuple(shape)), opened_cells.reshape(batch_shape + tuple(shape))
+
+
+def unpack_fields(snapshots, shape):
+    """
+    Returns the fields which are seen by a player, i.e. the closed cells are CellState.CLOSED.
+    """
+    mines, opened_cells = unpack_snapshots(snapshots, shape)
+    return numpy.where(opened_cells, create_field_from_mines(mines), numpy.int8(CellState.CLOSED))
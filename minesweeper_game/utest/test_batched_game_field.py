@@ -0,0 +1,79 @@
+import numpy
+import unittest
+
+from minesweeper_game.batched_game_field import BatchedMinesweeperGame
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import Mode, CellState, GameState
+
+
+class TestBatchedMinesweeper(unittest.TestCase):
+    def test_first_open(self):
+        games = BatchedMinesweeperGame(Mode.EXPERT, 64, numpy.random.default_rng(0))
+        first_cells_idx = numpy.arange(64) * 7
+        states = games.open(first_cells_idx)
+        self.assertTrue(numpy.all(states == GameState.IN_PROGRESS))
+
+        mines = games._fields == CellState.MINE
+        self.assertTrue(numpy.all(numpy.count_nonzero(mines, axis=(1, 2)) == Mode.EXPERT.mines()))
+        for board_idx, cell_idx in enumerate(first_cells_idx):
+            row_idx, column_idx = numpy.unravel_index(cell_idx, Mode.EXPERT.shape())
+            self.assertFalse(numpy.any(mines[board_idx, max(row_idx - 1, 0):row_idx + 2,
+                                             max(column_idx - 1, 0):column_idx + 2]))
+            self.assertEqual(games.field(board_idx)[row_idx, column_idx], CellState.NO_MINES_NEARBY)
+
+    def test_same_as_single_game(self):
+        rng = numpy.random.default_rng(0)
+        games = BatchedMinesweeperGame(Mode.MEDIUM, 32, rng)
+        games.open(numpy.full(32, 0))
+
+        single_games = []
+        for board_idx in range(games.size()):
+            game = MinesweeperGame.from_field(Mode.MEDIUM, numpy.copy(games._fields[board_idx]))
+            game.open(0)
+            single_games.append(game)
+
+        while numpy.any(games.states() == GameState.IN_PROGRESS):
+            indices = numpy.array([rng.choice(numpy.flatnonzero(field == CellState.CLOSED))
+                                   for field in games.fields()])
+            games.open(indices)
+
+            for board_idx, game in enumerate(single_games):
+                if game.state() == GameState.IN_PROGRESS:
+                    game.open(indices[board_idx])
+                self.assertTrue(numpy.array_equiv(games.field(board_idx), game.field()))
+                self.assertEqual(games.state(board_idx), game.state())
+
+    def test_finished_boards_untouched(self):
+        games = BatchedMinesweeperGame(Mode.CLASSIC, 2, numpy.random.default_rng(0))
+        games.open(numpy.array([0, 0]))
+
+        mine_idx = numpy.flatnonzero(games._fields[0] == CellState.MINE)[0]
+        closed_idx = numpy.flatnonzero(games.field(1) == CellState.CLOSED)[0]
+        games.open(numpy.array([mine_idx, closed_idx]))
+        self.assertEqual(games.state(0), GameState.GAME_OVER)
+
+        finished_field = numpy.copy(games.field(0))
+        closed_idx = numpy.flatnonzero(games.field(0) == CellState.CLOSED)
+        games.open(numpy.array([closed_idx[-1], closed_idx[-1]]))
+        self.assertEqual(games.state(0), GameState.GAME_OVER)
+        self.assertTrue(numpy.array_equiv(games.field(0), finished_field))
+
+        games.reset([0])
+        self.assertEqual(games.state(0), GameState.IN_PROGRESS)
+        self.assertTrue(numpy.all(games.field(0) == CellState.CLOSED))
+
+    def test_selected_boards(self):
+        games = BatchedMinesweeperGame(Mode.CLASSIC, 3, numpy.random.default_rng(0))
+        games.open(numpy.array([0, 0, 0]), boards=[1])
+        self.assertTrue(numpy.all(games.field(0) == CellState.CLOSED))
+        self.assertEqual(games.field(1)[0, 0], CellState.NO_MINES_NEARBY)
+        self.assertTrue(numpy.all(games.field(2) == CellState.CLOSED))
+
+        games.open(numpy.array([63, 63, 63]), boards=[0, 2])
+        self.assertEqual(games.field(1)[7, 7], CellState.CLOSED)
+        self.assertEqual(games.field(0)[7, 7], CellState.NO_MINES_NEARBY)
+        self.assertEqual(games.field(2)[7, 7], CellState.NO_MINES_NEARBY)
+
+
+if __name__ == '__main__':
+    unittest.main()
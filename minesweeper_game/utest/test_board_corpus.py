@@ -0,0 +1,38 @@
+import numpy
+import tempfile
+import unittest
+
+from minesweeper_game.board_corpus import MinesweeperBoardCorpus
+from minesweeper_game.game_interface import Mode, CellState, GameState
+
+
+class TestBoardCorpus(unittest.TestCase):
+    def test_generate_and_load(self):
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            generated_corpus = MinesweeperBoardCorpus.generate(corpus_dir, Mode.EXPERT, 25,
+                                                               numpy.random.default_rng(0), chunk_size=10)
+            corpus = MinesweeperBoardCorpus(corpus_dir)
+            self.assertEqual(len(corpus), 25)
+            self.assertEqual(corpus.mode(), Mode.EXPERT)
+            self.assertEqual(generated_corpus.mode(), Mode.EXPERT)
+
+            for board_idx in range(len(corpus)):
+                game = corpus.game(board_idx)
+                self.assertFalse(game._field.flags.writeable)
+                self.assertEqual(numpy.count_nonzero(game._field == CellState.MINE), Mode.EXPERT.mines())
+
+                game.open(corpus.first_cell(board_idx))
+                self.assertEqual(game.state(), GameState.IN_PROGRESS)
+                self.assertEqual(game.field().flat[corpus.first_cell(board_idx)], CellState.NO_MINES_NEARBY)
+
+                for idx in numpy.flatnonzero(game._field != CellState.MINE):
+                    game.open(idx)
+                self.assertEqual(game.state(), GameState.WIN)
+                del game
+
+            # The memory-mapped files must be released before the directory is removed on Windows.
+            del corpus, generated_corpus
+
+
+if __name__ == '__main__':
+    unittest.main()
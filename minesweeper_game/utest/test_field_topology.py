@@ -0,0 +1,38 @@
+import numpy
+import unittest
+
+from minesweeper_game.field_topology import FieldTopology
+from minesweeper_game.game_interface import Mode
+
+
+class TestFieldTopology(unittest.TestCase):
+    def test_neighbours(self):
+        topology = FieldTopology.of(Mode.EXPERT)
+        height, width = Mode.EXPERT.shape()
+        self.assertEqual(topology.shape(), (height, width))
+        self.assertEqual(topology.size(), height * width)
+
+        for idx in range(topology.size()):
+            row_idx, column_idx = numpy.unravel_index(idx, topology.shape())
+            expected_neighbours = {neighbour_row_idx * width + neighbour_column_idx
+                                   for neighbour_row_idx in range(max(row_idx - 1, 0), min(row_idx + 2, height))
+                                   for neighbour_column_idx in range(max(column_idx - 1, 0), min(column_idx + 2, width))
+                                   if (neighbour_row_idx, neighbour_column_idx) != (row_idx, column_idx)}
+
+            self.assertEqual(set(topology.neighbours(idx)), expected_neighbours)
+            padded_neighbours = topology.padded_neighbours()[idx]
+            self.assertEqual(set(padded_neighbours[padded_neighbours < topology.size()]), expected_neighbours)
+
+        cells, neighbours = topology.pairs()
+        self.assertEqual(len(cells), 2 * (4 * height * width - 3 * height - 3 * width + 2))
+        self.assertTrue(numpy.all(topology.offsets()[cells] <= numpy.arange(len(cells))))
+
+    def test_cache(self):
+        topology = FieldTopology.of(Mode(30, 16, 10))
+        self.assertIs(topology, FieldTopology.of(Mode.EXPERT))
+        self.assertIsNot(topology, FieldTopology.of(Mode.MEDIUM))
+        self.assertFalse(topology.neighbours().flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -123,6 +123,120 @@ class TestMinesweeper(unittest.TestCase):
         game = MinesweeperGame(Mode.CLASSIC, 0)
         self.assertEqual(game.state(), GameState.IN_PROGRESS)
 
+    def test_generator_field(self):
+        first_cell_idx = 0
+        game = MinesweeperGame(Mode.EXPERT, rng=numpy.random.default_rng(0))
+        game.open(first_cell_idx)
+
+        same_game = MinesweeperGame(Mode.EXPERT, rng=numpy.random.default_rng(0))
+        same_game.open(first_cell_idx)
+        self.assertTrue(numpy.array_equiv(game._field, same_game._field))
+
+        mines = game._field == CellState.MINE
+        self.assertEqual(numpy.count_nonzero(mines), Mode.EXPERT.mines())
+        self.assertFalse(numpy.any(mines[:2, :2]))
+
+        height, width = Mode.EXPERT.shape()
+        for row_idx, column_idx in numpy.ndindex(height, width):
+            if not mines[row_idx, column_idx]:
+                expected_count = numpy.count_nonzero(mines[max(row_idx - 1, 0):row_idx + 2,
+                                                           max(column_idx - 1, 0):column_idx + 2])
+                self.assertEqual(game._field[row_idx, column_idx], expected_count)
+
+    def test_region_open(self):
+        rng = numpy.random.default_rng(0)
+        for mode in (Mode.CLASSIC, Mode.MEDIUM, Mode.EXPERT, Mode(40, 30, 100)):
+            game = MinesweeperGame(mode, rng=rng)
+            game.open(0)
+
+            flood_game = MinesweeperGame.from_field(mode, game._field)
+            flood_game._flood_open_cells(0)
+            self.assertTrue(numpy.array_equiv(game.field(), flood_game.field()))
+
+            for idx in rng.permutation(numpy.flatnonzero(game._field != CellState.MINE)):
+                game.open(idx)
+                flood_game._flood_open_cells(idx)
+                self.assertTrue(numpy.array_equiv(game.field(), flood_game.field()))
+                self.assertEqual(game._closed_cells, numpy.count_nonzero(game.field() == CellState.CLOSED))
+                self.assertEqual(flood_game._closed_cells, game._closed_cells)
+
+            self.assertEqual(game.state(), GameState.WIN)
+
+    def test_fork(self):
+        game = MinesweeperGame(Mode.CLASSIC, 0)
+        game.open(0)
+
+        forked_game = game.fork()
+        self.assertIs(forked_game._field, game._field)
+        self.assertTrue(numpy.array_equiv(forked_game.field(), game.field()))
+
+        cell_with_mine_idx = 5
+        forked_game.open(cell_with_mine_idx)
+        self.assertEqual(forked_game.state(), GameState.GAME_OVER)
+        self.assertEqual(game.state(), GameState.IN_PROGRESS)
+        self.assertEqual(game.field()[0, 5], CellState.CLOSED)
+
+    def test_fork_not_started(self):
+        for seed, rng in ((0, None), (None, numpy.random.default_rng(0))):
+            game = MinesweeperGame(Mode.EXPERT, seed, rng)
+            forked_game = game.fork()
+
+            forked_game.open(0)
+            game.open(0)
+            self.assertTrue(numpy.array_equal(forked_game._field, game._field))
+            self.assertTrue(numpy.array_equal(forked_game.field(), game.field()))
+
+    def test_undo(self):
+        game = MinesweeperGame(Mode.CLASSIC, 0)
+        game.open(0)
+
+        # Only the forks log the moves.
+        with self.assertRaises(RuntimeError):
+            game.undo()
+
+        game = game.fork()
+        fields = [numpy.copy(game.field())]
+        states = [game.state()]
+
+        cells_to_open = [24, 25, 63, 25, 5, 26]
+        for idx in cells_to_open:
+            game.open(idx)
+            fields.append(numpy.copy(game.field()))
+            states.append(game.state())
+        self.assertEqual(game.state(), GameState.GAME_OVER)
+
+        for field, state in reversed(list(zip(fields[:-1], states[:-1]))):
+            game.undo()
+            self.assertTrue(numpy.array_equiv(game.field(), field))
+            self.assertEqual(game.state(), state)
+            self.assertEqual(game._closed_cells, numpy.count_nonzero(field == CellState.CLOSED))
+
+        with self.assertRaises(RuntimeError):
+            game.undo()
+
+        game.open(5)
+        self.assertEqual(game.state(), GameState.GAME_OVER)
+
+    def test_open_many(self):
+        game = MinesweeperGame(Mode.CLASSIC, 0)
+        game.open(0)
+        game = game.fork()
+
+        self.assertEqual(game.open_many([24, 25, 63]), GameState.IN_PROGRESS)
+        field = numpy.copy(game.field())
+
+        # The cells after the mine are not opened.
+        self.assertEqual(game.open_many([25, 5, 32]), GameState.GAME_OVER)
+        self.assertEqual(game.field()[0, 5], CellState.MINE)
+        self.assertEqual(game.field()[4, 0], CellState.CLOSED)
+
+        game.undo()
+        self.assertTrue(numpy.array_equiv(game.field(), field))
+
+    def test_seed_and_generator(self):
+        with self.assertRaises(ValueError):
+            MinesweeperGame(Mode.CLASSIC, 0, numpy.random.default_rng(0))
+
 
 if __name__ == '__main__':
     unittest.main()
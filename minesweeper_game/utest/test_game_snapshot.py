@@ -0,0 +1,55 @@
+import numpy
+import unittest
+
+from minesweeper_game.batched_game_field import BatchedMinesweeperGame
+from minesweeper_game.game_field import MinesweeperGame
+from minesweeper_game.game_interface import Mode, CellState, GameState
+from minesweeper_game.game_snapshot import snapshot_size, unpack_fields
+
+
+class TestGameSnapshot(unittest.TestCase):
+    def test_snapshot_size(self):
+        game = MinesweeperGame(Mode.EXPERT)
+        game.open(0)
+        self.assertEqual(game.snapshot().shape, (snapshot_size(Mode.EXPERT.shape()),))
+        self.assertLess(game.snapshot().nbytes, 150)
+
+    def test_restore_game(self):
+        game = MinesweeperGame(Mode.CLASSIC, 0)
+        restored_game = MinesweeperGame.from_snapshot(game.mode(), game.snapshot())
+        self.assertEqual(restored_game.state(), GameState.IN_PROGRESS)
+        self.assertTrue(numpy.all(restored_game.field() == CellState.CLOSED))
+
+        game.open(0)
+        restored_game = MinesweeperGame.from_snapshot(game.mode(), game.snapshot())
+        self.assertTrue(numpy.array_equiv(restored_game.field(), game.field()))
+        self.assertEqual(restored_game.state(), GameState.IN_PROGRESS)
+
+        cell_idx = 24
+        game.open(cell_idx)
+        restored_game.open(cell_idx)
+        self.assertTrue(numpy.array_equiv(restored_game.field(), game.field()))
+
+        cell_with_mine_idx = 5
+        game.open(cell_with_mine_idx)
+        restored_game = MinesweeperGame.from_snapshot(game.mode(), game.snapshot())
+        self.assertTrue(numpy.array_equiv(restored_game.field(), game.field()))
+        self.assertEqual(restored_game.state(), GameState.GAME_OVER)
+
+    def test_unpack_fields(self):
+        games = BatchedMinesweeperGame(Mode.EXPERT, 16, numpy.random.default_rng(0))
+        games.open(numpy.arange(16))
+        games.open(numpy.arange(16) + 100)
+
+        snapshots = games.snapshots()
+        self.assertEqual(snapshots.shape, (16, snapshot_size(Mode.EXPERT.shape())))
+        self.assertTrue(numpy.array_equiv(unpack_fields(snapshots, Mode.EXPERT.shape()), games.fields()))
+
+        for board_idx in range(games.size()):
+            game = MinesweeperGame.from_snapshot(Mode.EXPERT, snapshots[board_idx])
+            self.assertTrue(numpy.array_equiv(game.field(), games.field(board_idx)))
+            self.assertEqual(game.state(), games.state(board_idx))
+
+
+if __name__ == '__main__':
+    unittest.main()
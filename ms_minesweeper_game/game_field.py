@@ -66,6 +66,8 @@ class MsMinesweeperClassicField:
         self._min_distance_between_lines = 20
         self._field_header_height = 68
         self._mode = mode
+        self._closed_cells = None
+        self._mine_opened = False
         self._state = None
 
         self._create_field()
@@ -171,6 +173,7 @@ class MsMinesweeperClassicField:
         self._dump_detected_lines(img)
 
         self._field = numpy.full((len(self._horizontal_lines) - 1, len(self._vertical_lines) - 1), CellState.CLOSED)
+        self._closed_cells = self._field.size
         self._update_game_mode()
         self._update_state()
 
@@ -204,14 +207,26 @@ class MsMinesweeperClassicField:
                 right = self._vertical_lines[vertical_line_idx + 1]
 
                 cell_img = img[top:bottom, left:right]
-                self._field[horizontal_line_idx, vertical_line_idx] = self._pattern_library.match(cell_img)
+                cell_state = self._pattern_library.match(cell_img)
+                self._update_counters(self._field[horizontal_line_idx, vertical_line_idx], cell_state)
+                self._field[horizontal_line_idx, vertical_line_idx] = cell_state
         self._update_state()
 
+    def _update_counters(self, previous_cell_state, cell_state):
+        if previous_cell_state == CellState.CLOSED and cell_state != CellState.CLOSED:
+            self._closed_cells -= 1
+        elif previous_cell_state != CellState.CLOSED and cell_state == CellState.CLOSED:
+            self._closed_cells += 1
+
+        if cell_state == CellState.MINE:
+            self._mine_opened = True
+
     def _update_state(self):
+        # The counters are updated together with the field, so the state is updated without scanning the field.
         if self._state is None or self._state == GameState.IN_PROGRESS:
-            if numpy.count_nonzero(self._field == CellState.MINE):
+            if self._mine_opened:
                 self._state = GameState.GAME_OVER
-            elif numpy.count_nonzero(self._field == CellState.CLOSED) == self._mode.mines():
+            elif self._closed_cells == self._mode.mines():
                 self._state = GameState.WIN
             else:
                 self._state = GameState.IN_PROGRESS
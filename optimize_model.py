@@ -0,0 +1,75 @@
+import argparse
+import torch
+
+from minesweeper_game.game_interface import Mode
+
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperSolverModel, MinesweeperInferenceEngine, \
+    InferenceBackend, InferencePrecision
+from minesweeper_cnn_solver.evaluation import compare_win_rates, self_play_fields
+
+parser = argparse.ArgumentParser(description='Save the pretrained model as the pre-optimized TorchScript module that '
+                                             'can be loaded by the play scripts.')
+parser.add_argument('-i', '--input', help='The path to pretrained model.',
+                    required=True)
+parser.add_argument('-o', '--output', help='The path to keep the pre-optimized module.',
+                    required=True)
+parser.add_argument('--channels-last', help='Use channels last memory format for the model weights.',
+                    action='store_true')
+parser.add_argument('-p', '--precision', help='The precision of the pre-optimized module.',
+                    default=InferencePrecision.FLOAT32,
+                    choices=[InferencePrecision.FLOAT32, InferencePrecision.BFLOAT16, InferencePrecision.INT8])
+parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode to calibrate and check the module.',
+                    default='classic', choices=['classic', 'easy', 'medium', 'expert', 'custom'])
+parser.add_argument('-c', '--custom-mode', help='The configuration of the custom game mode in the following format:'
+                                                ' {field width}x{field height}x{number of mines}, e.g.: 8x8x8.',
+                    default=None)
+parser.add_argument('--calibration-positions', help='The number of self-play positions to calibrate int8 module.',
+                    default=1024, type=int)
+parser.add_argument('--gate-games', help='The number of games to compare the win rates of the pre-optimized module '
+                                         'and the float model, 0 to skip the comparison.',
+                    default=500, type=int)
+parser.add_argument('--max-win-rate-drop', help='The module is not saved if its win rate is lower than the win rate '
+                                                'of the float model by more than this value.',
+                    default=0.01, type=float)
+
+args = parser.parse_args()
+
+if args.game_mode == 'classic':
+    selected_game_mode = Mode.CLASSIC
+elif args.game_mode == 'easy':
+    selected_game_mode = Mode.EASY
+elif args.game_mode == 'medium':
+    selected_game_mode = Mode.MEDIUM
+elif args.game_mode == 'expert':
+    selected_game_mode = Mode.EXPERT
+else:
+    if not args.custom_mode:
+        raise ValueError('--custom-mode option must be specified.')
+
+    mode_options = [int(x) for x in args.custom_mode.split('x')]
+    selected_game_mode = Mode(*mode_options)
+
+model = MinesweeperSolverModel.fromfile(args.input)
+reference_solver = MinesweeperSolver(model)
+
+calibration_inputs = None
+if args.precision == InferencePrecision.INT8:
+    # The calibration positions are played with the seed that differs from the seeds of the comparison games.
+    calibration_fields = self_play_fields(reference_solver, selected_game_mode, args.calibration_positions,
+                                          seed=args.gate_games)
+    calibration_inputs = torch.from_numpy(reference_solver.vectorizer().vectorize_batch(calibration_fields))
+
+engine = MinesweeperInferenceEngine(model, InferenceBackend.TORCHSCRIPT, args.channels_last,
+                                    precision=args.precision, calibration_inputs=calibration_inputs)
+
+if args.gate_games > 0:
+    # The reference solver runs the float model in eager mode, so the comparison checks the saved module as is.
+    reference_win_rate, win_rate, passed = compare_win_rates(reference_solver, MinesweeperSolver(engine=engine),
+                                                             selected_game_mode, range(args.gate_games),
+                                                             args.max_win_rate_drop)
+    print(f'Win rate of the float model: {reference_win_rate}')
+    print(f'Win rate of the {args.precision} module: {win_rate}')
+    if not passed:
+        raise SystemExit(f'The win rate drop exceeds {args.max_win_rate_drop}, the module is not saved.')
+
+engine.save(args.output)
@@ -5,8 +5,11 @@ import time
 
 from minesweeper_game.game_interface import GameState, Mode
 from minesweeper_game.game_field import MinesweeperGame, MinesweeperFieldPseudoGraphicsVisualizer
+from minesweeper_game.board_corpus import MinesweeperBoardCorpus
 
-from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperSolverModel
+from minesweeper_cnn_solver import InferenceBackend, InferencePrecision
+from minesweeper_cnn_solver.evaluation import self_play_fields
+from minesweeper_exact_solver import MinesweeperExactSolver
 
 
 class ConsoleVisualizerMode:
@@ -32,14 +35,91 @@ class ConsoleVisualizer:
             time.sleep(self._frame_presenting_time)
 
 
+def create_engine(args, game_mode):
+    # The engine imports torch, so it is imported only if the model is run, i.e. neither by --help nor by the exact
+    # solver.
+    import torch
+    from minesweeper_cnn_solver import IncrementalInference, MinesweeperInferenceEngine, MinesweeperSolver, \
+        ModelRegistry
+
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    if args.model and MinesweeperInferenceEngine.is_torchscript_file(args.model):
+        engine = MinesweeperInferenceEngine.fromfile(args.model, channels_last=args.channels_last)
+    else:
+        # The model is loaded by the registry, so its weights are memory-mapped from the checkpoint.
+        registry = ModelRegistry()
+        if args.model:
+            registry.register(game_mode, args.model)
+        model = registry.model(game_mode)
+
+        calibration_inputs = None
+        if args.precision == InferencePrecision.INT8:
+            # The int8 model is calibrated on the positions that the float model sees while it plays.
+            float_solver = MinesweeperSolver(model)
+            calibration_fields = self_play_fields(float_solver, game_mode, args.calibration_positions)
+            calibration_inputs = torch.from_numpy(float_solver.vectorizer().vectorize_batch(calibration_fields))
+
+        engine = MinesweeperInferenceEngine(model, args.inference_backend, args.channels_last, args.precision,
+                                            calibration_inputs)
+    if not args.incremental:
+        return engine
+
+    if engine.model() is None or engine.precision() != InferencePrecision.FLOAT32:
+        raise ValueError('The incremental inference requires the float32 model weights.')
+    return IncrementalInference(engine.model(), args.tile_size)
+
+
+def create_solver(args, game_mode):
+    if args.solver == 'exact':
+        return MinesweeperExactSolver(game_mode, args.max_component_size)
+
+    from minesweeper_cnn_solver import HybridSolver, MinesweeperSolver
+    if args.solver == 'hybrid':
+        return HybridSolver(MinesweeperSolver(engine=create_engine(args, game_mode)))
+    return MinesweeperSolver(engine=create_engine(args, game_mode))
+
+
 parser = argparse.ArgumentParser(description='Play Minesweeper game simulation using pretrained model.')
 parser.add_argument('-g', '--game-mode', help='The Minesweeper game mode to play.',
                     default='classic', choices=['classic', 'easy', 'medium', 'expert', 'custom'])
 parser.add_argument('-c', '--custom-mode', help='The configuration of the custom game mode in the following format:'
                                                 ' {field width}x{field height}x{number of mines}, e.g.: 8x8x8.',
                     default=None)
-parser.add_argument('-m', '--model', help='The path to pretrained model.',
+parser.add_argument('-b', '--board-corpus', help='The path to the corpus of pre-generated fields to play. The game '
+                                                 'mode is defined by the corpus.',
+                    default=None)
+parser.add_argument('-m', '--model', help='The path to pretrained model or pre-optimized TorchScript module.',
                     default=None)
+parser.add_argument('-s', '--solver', help='The solver: the model only, the model that is run only if there is no '
+                                           'cell which is safe for sure or the exact computation of the probabilities '
+                                           'of mines without the model.',
+                    default='cnn', choices=['cnn', 'hybrid', 'exact'])
+parser.add_argument('--max-component-size', help='The maximum number of cells in the component of the frontier that '
+                                                 'is enumerated by the exact solver.',
+                    default=128, type=int)
+parser.add_argument('--threshold', help='Open all cells with the probability of a mine below the threshold after every '
+                                     'solver call instead of one cell.',
+                    default=None, type=float)
+parser.add_argument('-i', '--inference-backend', help='The backend to run the model.',
+                    default=InferenceBackend.EAGER,
+                    choices=[InferenceBackend.EAGER, InferenceBackend.TORCHSCRIPT, InferenceBackend.COMPILE])
+parser.add_argument('--channels-last', help='Use channels last memory format to run the model.',
+                    action='store_true')
+parser.add_argument('-p', '--precision', help='The precision to run the model. It is ignored for pre-optimized '
+                                              'module.',
+                    default=InferencePrecision.FLOAT32,
+                    choices=[InferencePrecision.FLOAT32, InferencePrecision.BFLOAT16, InferencePrecision.INT8])
+parser.add_argument('--calibration-positions', help='The number of self-play positions to calibrate int8 model.',
+                    default=1024, type=int)
+parser.add_argument('--incremental', help='Recompute only the activations of the model around the cells changed by '
+                                          'the previous move.',
+                    action='store_true')
+parser.add_argument('--tile-size', help='The size of the tiles recomputed by the incremental inference.',
+                    default=8, type=int)
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
 parser.add_argument('-n', '--number-of-games', help='The number of time the games is played.',
                     default=1, type=int)
 parser.add_argument('-o', '--output-mode', help='The output mode.',
@@ -47,7 +127,14 @@ parser.add_argument('-o', '--output-mode', help='The output mode.',
 
 args = parser.parse_args()
 
-if args.game_mode == 'classic':
+board_corpus = MinesweeperBoardCorpus(args.board_corpus) if args.board_corpus else None
+
+if board_corpus is not None:
+    if args.number_of_games > len(board_corpus):
+        raise ValueError('The number of games exceeds the number of fields in the corpus.')
+
+    game_mode = board_corpus.mode()
+elif args.game_mode == 'classic':
     game_mode = Mode.CLASSIC
 elif args.game_mode == 'easy':
     game_mode = Mode.EASY
@@ -71,31 +158,30 @@ elif args.output_mode == 'statistics-only':
 else:
     raise ValueError('Unexpected output mode is specified.')
 
-if args.model:
-    model = MinesweeperSolverModel.fromfile(args.model)
-elif game_mode == Mode.CLASSIC:
-    model = MinesweeperSolverModel.fromfile('trained_models/classic_minesweeper_model.pt')
-elif game_mode == Mode.EASY:
-    model = MinesweeperSolverModel.fromfile('trained_models/easy_minesweeper_model.pt')
-elif game_mode == Mode.MEDIUM:
-    model = MinesweeperSolverModel.fromfile('trained_models/medium_minesweeper_model.pt')
-elif game_mode == Mode.EXPERT:
-    model = MinesweeperSolverModel.fromfile('trained_models/expert_minesweeper_model.pt')
-else:
-    raise ValueError('The model cannot be selected.')
-
-solver = MinesweeperSolver(model)
+solver = create_solver(args, game_mode)
 
 games_won = 0
+solver_calls = 0
 
 for game_idx in range(args.number_of_games):
-    game = MinesweeperGame(game_mode)
-    console_visualizer.draw(game.field())
+    if board_corpus is not None:
+        game = board_corpus.game(game_idx)
+        cell_idx = board_corpus.first_cell(game_idx)
+    else:
+        game = MinesweeperGame(game_mode)
+        cell_idx = numpy.ravel_multi_index((game.field().shape[0] // 2, game.field().shape[1] // 2),
+                                           game.field().shape)
 
-    cell_idx = numpy.ravel_multi_index((game.field().shape[0] // 2, game.field().shape[1] // 2), game.field().shape)
+    console_visualizer.draw(game.field())
 
-    while game.open(cell_idx) == GameState.IN_PROGRESS:
-        cell_idx, _ = solver(game.field())
+    cells_idx = [cell_idx]
+    while game.open_many(cells_idx) == GameState.IN_PROGRESS:
+        if args.threshold is None:
+            cell_idx, _ = solver(game.field())
+            cells_idx = [cell_idx]
+        else:
+            cells_idx, _ = solver.cells_to_open(game.field(), args.threshold)
+        solver_calls += 1
         console_visualizer.draw(game.field())
 
     console_visualizer.draw(game.field())
@@ -110,3 +196,6 @@ print('Statistics:')
 print(f' Games played: {args.number_of_games}')
 print(f' Games won: {games_won}')
 print(f' Win percentage: {games_won/args.number_of_games}')
+print(f' Solver calls per game: {solver_calls/args.number_of_games}')
+if args.solver == 'hybrid':
+    print(f' Model runs per game: {solver.forward_passes()/args.number_of_games}')
@@ -1,26 +1,34 @@
+import argparse
 import numpy
 
-from minesweeper_game.game_interface import GameState, Mode
+from minesweeper_game.game_interface import GameState
 
 from ms_minesweeper_game import MsMinesweeperClassicField, MsMinesweeperWindowManager
-from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperSolverModel
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperInferenceEngine, InferenceBackend, ModelRegistry
 
 
+parser = argparse.ArgumentParser(description='Play Microsoft Minesweeper game using pretrained model.')
+parser.add_argument('-m', '--model', help='The path to pretrained model or pre-optimized TorchScript module.',
+                    default=None)
+parser.add_argument('-i', '--inference-backend', help='The backend to run the model.',
+                    default=InferenceBackend.EAGER,
+                    choices=[InferenceBackend.EAGER, InferenceBackend.TORCHSCRIPT, InferenceBackend.COMPILE])
+
+args = parser.parse_args()
+
 window_manager = MsMinesweeperWindowManager()
 game = MsMinesweeperClassicField(window_manager)
 
-if game.mode() == Mode.CLASSIC:
-    model = MinesweeperSolverModel.fromfile('trained_models/classic_minesweeper_model.pt')
-elif game.mode() == Mode.EASY:
-    model = MinesweeperSolverModel.fromfile('trained_models/easy_minesweeper_model.pt')
-elif game.mode() == Mode.MEDIUM:
-    model = MinesweeperSolverModel.fromfile('trained_models/medium_minesweeper_model.pt')
-elif game.mode() == Mode.EXPERT:
-    model = MinesweeperSolverModel.fromfile('trained_models/expert_minesweeper_model.pt')
+if args.model and MinesweeperInferenceEngine.is_torchscript_file(args.model):
+    engine = MinesweeperInferenceEngine.fromfile(args.model)
 else:
-    raise NotImplementedError('Only standard modes are supported right now.')
+    # The model is loaded by the registry, so its weights are memory-mapped from the checkpoint.
+    registry = ModelRegistry()
+    if args.model:
+        registry.register(game.mode(), args.model)
+    engine = MinesweeperInferenceEngine(registry.model(game.mode()), args.inference_backend)
 
-solver = MinesweeperSolver(model)
+solver = MinesweeperSolver(engine=engine)
 
 cell_idx = numpy.ravel_multi_index((game.field().shape[0] // 2, game.field().shape[1] // 2), game.field().shape)
 
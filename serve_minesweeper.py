@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import torch
+
+from minesweeper_cnn_solver import MinesweeperSolver, MinesweeperInferenceEngine, InferenceServer
+
+parser = argparse.ArgumentParser(description='Run the inference server which collects the requests of concurrent games '
+                                             'into batches. Every request is the line with the JSON object '
+                                             '{"field": [[...], ...]} and every response is the line with the JSON '
+                                             'object {"cell_idx": ...}.')
+parser.add_argument('-m', '--model', help='The path to pretrained model or pre-optimized TorchScript module. The '
+                                          'model accepts the fields of any shape.',
+                    default='trained_models/expert_minesweeper_model.pt')
+parser.add_argument('--host', help='The host to listen.',
+                    default='127.0.0.1')
+parser.add_argument('--port', help='The port to listen.',
+                    default=8765, type=int)
+parser.add_argument('--max-batch-size', help='The maximum number of fields in one model run.',
+                    default=32, type=int)
+parser.add_argument('--max-wait-time', help='The maximum time in milliseconds that a request waits for the batch to '
+                                            'be filled.',
+                    default=2.0, type=float)
+parser.add_argument('--mixed-shapes', help='Pad the fields of different shapes into one batch instead of keeping a '
+                                           'queue for every shape.',
+                    action='store_true')
+parser.add_argument('-t', '--threads', help='The number of threads to run the model.',
+                    default=None, type=int)
+
+args = parser.parse_args()
+
+
+async def serve():
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    solver = MinesweeperSolver(engine=MinesweeperInferenceEngine.fromfile(args.model))
+    server = InferenceServer(solver, args.max_batch_size, args.max_wait_time / 1000, args.mixed_shapes)
+    tcp_server = await server.start_server(args.host, args.port)
+    print(f'Serving on {args.host}:{args.port}')
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+
+asyncio.run(serve())